@@ -51,8 +51,8 @@ from cms.admin.forms import (
     MovePageForm,
 )
 from cms.admin.permissionadmin import PERMISSION_ADMIN_INLINES
-from cms.cache.permissions import clear_permission_cache
-from cms.constants import MODAL_HTML_REDIRECT
+from cms.cache.permissions import clear_permission_cache, clear_user_permission_cache
+from cms.constants import GRANT_ALL_PERMISSIONS, MODAL_HTML_REDIRECT
 from cms.models import (
     CMSPlugin,
     GlobalPagePermission,
@@ -63,7 +63,6 @@ from cms.models import (
     Placeholder,
 )
 from cms.models.pagemodel import AdminCacheDict
-from cms.models.permissionmodels import PermissionTuple
 from cms.operations.helpers import (
     send_post_page_operation,
     send_pre_page_operation,
@@ -608,14 +607,13 @@ class PageAdmin(PageDeleteMessageMixin, admin.ModelAdmin):
         _page_permissions = PagePermission.objects.for_page(page).select_related("page")
 
         if not can_change_global_permissions:
-            allowed_pages = page_permissions.get_change_perm_tuples(user, site, check_global=False)
+            allowed_pages = page_permissions.get_page_permission_index(user, site, "change_page", check_global=False)
 
         for permission in _page_permissions.iterator():
             if can_change_global_permissions:
                 can_change = True
             else:
-                page_path = permission.page.path
-                can_change = any(PermissionTuple(perm_tuple).contains(page_path) for perm_tuple in allowed_pages)
+                can_change = allowed_pages == GRANT_ALL_PERMISSIONS or allowed_pages.contains(permission.page.path)
 
             row = PermissionRow(
                 is_global=False,
@@ -943,11 +941,7 @@ class PageContentAdmin(PageDeleteMessageMixin, admin.ModelAdmin):
     def response_add(self, request, obj):
         redirect = request.POST.get("edit", False)
         if redirect == "1":
-            from django.core.cache import cache
-
-            from cms.cache.permissions import get_cache_key, get_cache_permission_version
-
-            cache.delete(get_cache_key(request.user, "change_page"), version=get_cache_permission_version())
+            clear_user_permission_cache(request.user)
 
             # redirect to the edit view if added from the toolbar
             url = get_object_edit_url(obj)  # Redirects to preview if necessary
@@ -1359,16 +1353,13 @@ class PageContentAdmin(PageDeleteMessageMixin, admin.ModelAdmin):
         template = get_template(self.page_tree_row_template)
         is_popup = IS_POPUP_VAR in request.POST or IS_POPUP_VAR in request.GET
         languages = get_language_list(site.pk)
-        user_can_add = page_permissions.user_can_add_subpage
-        user_can_change = page_permissions.user_can_change_page
-        user_can_change_advanced = page_permissions.user_can_change_page_advanced_settings
-        user_can_change_permissions = page_permissions.user_can_change_page_permissions
 
         def render_page_row(page):
             page.admin_content_cache = AdminCacheDict(
                 (trans.language, trans) for trans in page.filtered_translations
             )
-            has_move_page_permission = page_permissions.user_can_move_page(request.user, page, site=site)
+            actions = page_actions[page.pk]
+            has_move_page_permission = "move_page" in actions
 
             if permissions_on and not has_move_page_permission:
                 # TODO: check if this is really needed
@@ -1393,11 +1384,10 @@ class PageContentAdmin(PageDeleteMessageMixin, admin.ModelAdmin):
                 "follow_descendants": follow_descendants,
                 "site_languages": languages,
                 "is_popup": is_popup,
-                "has_add_page_permission": user_can_add(request.user, target=page),
-                "has_change_permission": user_can_change(request.user, page, site),
+                "has_add_page_permission": "add_page" in actions,
+                "has_change_permission": "change_page" in actions,
                 "has_change_advanced_settings_permission": (
-                    user_can_change_advanced(request.user, page, site)
-                    or user_can_change_permissions(request.user, page, site)
+                    "change_page_advanced_settings" in actions or "change_page_permissions" in actions
                 ),
                 "has_move_page_permission": has_move_page_permission,
                 "can_change": page_content.is_editable(request),
@@ -1406,10 +1396,18 @@ class PageContentAdmin(PageDeleteMessageMixin, admin.ModelAdmin):
             return template.render(context)
 
         if follow_descendants:
-            root_pages = (page for page in pages if page.depth == depth)
+            root_pages = [page for page in pages if page.depth == depth]
         else:
             # When the tree is filtered, it's displayed as a flat structure
-            root_pages = pages
+            root_pages = list(pages)
+
+        # The permissions of all rows are checked at once
+        page_actions = page_permissions.get_allowed_page_actions(
+            request.user,
+            site,
+            root_pages,
+            actions=("add_page", "change_page", "change_page_advanced_settings", "change_page_permissions", "move_page"),
+        )
 
         if depth == 1:
             for page in root_pages:
@@ -50,6 +50,7 @@ from django.template.loader import get_template
 from cms import constants
 from cms.app_base import CMSApp
 from cms.apphook_pool import apphook_pool
+from cms.cache.menu import update_menu_index
 from cms.constants import TEMPLATE_INHERITANCE_MAGIC
 from cms.models import PageContent
 from cms.models.pagemodel import Page
@@ -426,6 +427,8 @@ def create_page_content(
                 ),
             )
         page._clear_internal_cache()
+        # Adds the new translation to the menus
+        update_menu_index(page)
 
         return page_content
     finally:
@@ -1,5 +1,6 @@
 from collections import OrderedDict
 from importlib import import_module
+from operator import itemgetter
 
 from django.contrib.sites.models import Site
 from django.core.exceptions import ImproperlyConfigured
@@ -11,14 +12,64 @@ from django.utils.translation import get_language, override
 from cms.apphook_pool import apphook_pool
 from cms.models.pagemodel import Page
 from cms.utils import get_current_site
+from cms.utils.conf import get_cms_setting
 from cms.utils.i18n import get_language_list
 
 APP_RESOLVERS = []
 
+# Per language, a trie of the paths apphooks are mounted on. Each node is a
+# (children, entries) tuple where children maps the next path segment to its
+# node and entries holds (position in APP_RESOLVERS, resolver, path) of the
+# resolvers mounted on the node's path.
+APP_RESOLVER_INDEX = {}
+
 
 def clear_app_resolvers():
-    global APP_RESOLVERS
+    global APP_RESOLVERS, APP_RESOLVER_INDEX
     APP_RESOLVERS = []
+    APP_RESOLVER_INDEX = {}
+
+
+def _index_app_resolver(resolver, language, path):
+    node = APP_RESOLVER_INDEX.setdefault(language, ({}, []))
+
+    for segment in filter(None, path.split("/")):
+        node = node[0].setdefault(segment, ({}, []))
+    node[1].append((len(APP_RESOLVERS), resolver, path))
+
+
+def get_app_resolvers_for_path(path, language):
+    """
+    Returns the ``(resolver, path)`` pairs of the apphooks mounted on a prefix
+    of «path» in the given language, in the order of APP_RESOLVERS.
+    Apphook patterns only match below the path of their page, so these are
+    the only resolvers that can resolve «path».
+    """
+    node = APP_RESOLVER_INDEX.get(language)
+    segments = iter(path.split("/"))
+    entries = []
+
+    while node is not None:
+        entries.extend(node[1])
+        node = node[0].get(next(segments, None))
+    return [(resolver, mount_path) for _, resolver, mount_path in sorted(entries, key=itemgetter(0))]
+
+
+def _get_apphook_page(site, page_id, path):
+    if get_cms_setting("PAGE_URL_CACHE"):
+        from cms.utils.page import _get_cached_page_urls
+
+        # The page the apphook is mounted on is known by its path, which is
+        # what the page url cache is keyed by.
+        page_urls = _get_cached_page_urls(site, path.rstrip("/"))
+
+        if page_urls and page_urls[0].page_id == page_id:
+            return page_urls[0].page
+
+    try:
+        return Page.objects.get(id=page_id)
+    except Page.DoesNotExist:
+        return None
 
 
 def applications_page_check(request):
@@ -38,15 +89,16 @@ def applications_page_check(request):
         if path.startswith(lang + "/"):
             path = path[len(lang + "/"):]
 
-    for resolver in APP_RESOLVERS:
+    for resolver, mount_path in get_app_resolvers_for_path(path, get_language()):
         try:
             page_id = resolver.resolve_page_id(path)
-            return Page.objects.get(id=page_id)
         except Resolver404:
             # Raised if the page is not managed by an apphook
-            pass
-        except Page.DoesNotExist:
-            pass
+            continue
+        page = _get_apphook_page(site, page_id, mount_path)
+
+        if page is not None:
+            return page
     return None
 
 
@@ -268,13 +320,13 @@ def _get_app_patterns(site: Site | None) -> list[URLPattern]:
         app_ns = app.app_name, page_url.page.application_namespace
         with override(page_url.language):
             hooked_applications[page_url.page][page_url.language] = (
-                app_ns, get_patterns_for_page_url(page_url), app)
+                app_ns, get_patterns_for_page_url(page_url), app, page_url.path)
         included.append(mix_id)
         # Build the app patterns to be included in the cms urlconfs
     app_patterns = []
     for page, languages in hooked_applications.items():
         resolver = None
-        for lang, ((app_ns, inst_ns), current_patterns, app) in languages.items():
+        for lang, ((app_ns, inst_ns), current_patterns, app, path) in languages.items():
             if not resolver:
                 regex_pattern = RegexPattern(r'')
                 resolver = AppRegexURLResolver(
@@ -285,6 +337,7 @@ def _get_app_patterns(site: Site | None) -> list[URLPattern]:
             if site is None:
                 _set_site_filter(current_patterns, page.site_id)
             resolver.url_patterns_dict[lang] = current_patterns
+            _index_app_resolver(resolver, lang, path)
         app_patterns.append(resolver)
         APP_RESOLVERS.append(resolver)
     return app_patterns
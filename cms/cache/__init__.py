@@ -1,4 +1,5 @@
 import re
+import time
 
 from cms.utils.conf import get_cms_setting
 
@@ -70,6 +71,53 @@ def invalidate_cms_page_cache():
     _set_cache_version(version + 1)
 
 
+def _get_page_cache_tag_key(tag):
+    return f"{get_cms_setting('CACHE_PREFIX')}_PAGE_CACHE_TAG:{_clean_key(tag)}"
+
+
+def get_page_cache_tag_versions(tags, initialize=False):
+    """
+    Returns a dictionary mapping each of the given page cache tags to its
+    current version. Tags without a version are left out, unless «initialize»
+    is set, in which case a new version is stored for them.
+    """
+    from django.core.cache import cache
+
+    keys = {_get_page_cache_tag_key(tag): tag for tag in tags}
+    versions = {keys[key]: version for key, version in cache.get_many(keys.keys()).items()}
+
+    if initialize:
+        missing = {tag: int(time.time() * 1000000) for tag in keys.values() if tag not in versions}
+        if missing:
+            cache.set_many({_get_page_cache_tag_key(tag): version for tag, version in missing.items()}, timeout=None)
+            versions.update(missing)
+    return versions
+
+
+def invalidate_cms_page_cache_tags(tags):
+    """
+    Invalidates the cached pages depending on any of the given tags.
+
+    Cached pages record the tags of the objects they were rendered from
+    (``page:<pk>``, ``placeholder:<pk>`` and ``site:<pk>`` for the menu) along
+    with the tags' versions at render time. Bumping a tag's version makes
+    all pages recorded with the old version stale.
+
+    Falls back to invalidating the whole page cache (see
+    invalidate_cms_page_cache) unless CMS_PAGE_CACHE_TAGS is enabled.
+    """
+    from django.core.cache import cache
+
+    if not get_cms_setting('PAGE_CACHE_TAGS'):
+        invalidate_cms_page_cache()
+        return
+
+    # Like the placeholder cache, use a timestamp so a tag that got evicted
+    # from the cache never comes back with a version that was used before.
+    version = int(time.time() * 1000000)
+    cache.set_many({_get_page_cache_tag_key(tag): version for tag in tags}, timeout=None)
+
+
 CLEAN_KEY_PATTERN = re.compile(r'[^a-zA-Z0-9_-]')
 
 
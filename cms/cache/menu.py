@@ -0,0 +1,207 @@
+"""
+The menu index holds the page contents (and, for the public menu, the page
+urls) :class:`cms.cms_menus.CMSMenu` builds a site's navigation nodes from.
+
+It is language independent and shared by all users, which makes it the
+expensive part of building a menu. Instead of dropping it when a page
+changes, :func:`update_menu_index` patches it with the page's current state.
+"""
+from collections import defaultdict
+
+from cms.utils.conf import get_cms_setting, get_menu_cache
+from menus.menu_pool import (
+    _get_menu_cache_version_keys,
+    _get_menu_index_version_keys,
+    _new_menu_cache_version,
+)
+
+cache = get_menu_cache()
+
+MENU_INDEX_MODES = ("public", "edit")
+
+PAGE_CONTENT_FIELDS = (
+    "page_id",
+    "language",
+    "menu_title",
+    "title",
+    "limit_visibility_in_menu",
+    "soft_root",
+    "in_navigation",
+    "redirect",
+    "page__site_id",
+    "page__parent_id",
+    "page__path",  # needed by the view-restriction check in get_visible_page_contents
+    "page__is_home",
+    "page__login_required",
+    "page__reverse_id",
+    "page__navigation_extenders",
+    "page__application_urls",
+)
+
+
+def _get_menu_index_key(site_id, mode, versions):
+    return "{}menu_index_{}_{}_{}".format(
+        get_cms_setting("CACHE_PREFIX"),
+        site_id,
+        mode,
+        ".".join(str(version) for version in versions),
+    )
+
+
+def _get_menu_index_versions(site_id):
+    """
+    Returns the global and the per-site menu cache version, followed by the
+    global and the per-site menu index version. The index is dropped by any
+    MenuPool.clear() call that affects the site's menus in any language, but
+    patched by update_menu_index().
+    """
+    keys = _get_menu_cache_version_keys(site_id)[:2] + _get_menu_index_version_keys(site_id)
+    versions = cache.get_many(keys)
+    missing = {key: _new_menu_cache_version() for key in keys if key not in versions}
+
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def _get_page_contents_queryset(site_id, mode):
+    from cms.models import PageContent
+
+    if mode == "edit":
+        # All translations visible in the admin
+        queryset = PageContent.admin_manager.current_content()
+    else:
+        # Only public translations
+        queryset = PageContent.objects
+    return queryset.filter(page__site_id=site_id).select_related("page").only(*PAGE_CONTENT_FIELDS)
+
+
+def _get_page_urls(queryset):
+    page_urls = defaultdict(dict)
+
+    for page_url in queryset:
+        page_urls[page_url.page_id][page_url.language] = page_url
+    return page_urls
+
+
+def _build_menu_index(queryset, page_urls=None):
+    """
+    Returns a dict of page pk: list of page content objects. If «page_urls»
+    is given, the url cache of the pages is filled from it.
+    """
+    index = defaultdict(list)
+
+    for page_content in queryset:
+        if page_urls is not None:
+            # Access the cache directly to not lead to a db hit when
+            # accessing non-existing languages
+            page_content.page.urls_cache = page_urls.get(page_content.page_id)
+        index[page_content.page_id].append(page_content)
+    return dict(index)
+
+
+def get_menu_index(site_id, edit=False):
+    """
+    Returns the menu index for the given site: a dict of page pk: list of
+    page content objects in all languages. «edit» selects the page contents
+    visible in the admin instead of the public ones.
+    """
+    from cms.models import PageUrl
+
+    mode = "edit" if edit else "public"
+    key = _get_menu_index_key(site_id, mode, _get_menu_index_versions(site_id))
+    index = cache.get(key)
+
+    if index is None:
+        queryset = _get_page_contents_queryset(site_id, mode)
+
+        if edit:
+            index = _build_menu_index(queryset)
+        else:
+            index = _build_menu_index(queryset, _get_page_urls(PageUrl.objects.filter(page__site_id=site_id)))
+        # Use add() to not overwrite an index update_menu_index() has
+        # patched in the meantime.
+        cache.add(key, index, get_cms_setting("CACHE_DURATIONS")["menus"])
+    return index
+
+
+def update_menu_index(page):
+    """
+    Invalidates the menus of «page»'s site and patches the site's menu
+    indexes with the current state of «page», which has been saved, moved
+    or deleted.
+
+    The per-site menu cache version is incremented instead of replaced (see
+    MenuPool.clear) so each patch is applied to the index of the version
+    directly preceding it. If that index is not cached, e.g., because a
+    concurrent update did not store its patch yet, the index is rebuilt on
+    the next request.
+    """
+    from cms.models import Page, PageUrl
+
+    global_key, site_key = _get_menu_cache_version_keys(page.site_id)[:2]
+    index_keys = _get_menu_index_version_keys(page.site_id)
+
+    try:
+        version = cache.incr(site_key)
+    except ValueError:
+        # No menu has been built for the site (or the counter has been
+        # evicted), so there's no index to update either.
+        cache.set(site_key, _new_menu_cache_version(), timeout=None)
+        return
+
+    other_versions = cache.get_many([global_key, *index_keys])
+
+    if len(other_versions) < 1 + len(index_keys):
+        return
+
+    global_version = other_versions[global_key]
+    index_versions = [other_versions[key] for key in index_keys]
+    indexes = {
+        mode: cache.get(_get_menu_index_key(page.site_id, mode, [global_version, version - 1, *index_versions]))
+        for mode in MENU_INDEX_MODES
+    }
+    indexes = {mode: index for mode, index in indexes.items() if index is not None}
+
+    if not indexes:
+        return
+
+    # Moving or deleting a page changes the tree paths of its descendants
+    # and possibly its siblings. Loading the tree structure of the site is
+    # cheap compared to loading all page contents and urls.
+    tree = {
+        pk: (path, parent_id)
+        for pk, path, parent_id in Page.objects.filter(site_id=page.site_id).values_list("pk", "path", "parent_id")
+    }
+    # The page's url path is part of its descendants' url paths.
+    path = tree[page.pk][0] if page.pk in tree else page.path
+    page_urls = None
+
+    for mode, index in indexes.items():
+        if mode == "public" and page_urls is None:
+            page_urls = _get_page_urls(PageUrl.objects.filter(page__site_id=page.site_id, page__path__startswith=path))
+
+        queryset = _get_page_contents_queryset(page.site_id, mode).filter(page_id=page.pk)
+        index.pop(page.pk, None)
+        index.update(_build_menu_index(queryset, page_urls if mode == "public" else None))
+
+        for page_id, page_contents in list(index.items()):
+            if page_id not in tree:
+                # Deleted along with the page
+                del index[page_id]
+                continue
+
+            page_path, parent_id = tree[page_id]
+
+            for page_content in page_contents:
+                page_content.page.path = page_path
+                page_content.page.parent_id = parent_id
+
+                if mode == "public" and page_path.startswith(path):
+                    page_content.page.urls_cache = page_urls.get(page_id)
+        cache.set(
+            _get_menu_index_key(page.site_id, mode, [global_version, version, *index_versions]),
+            index,
+            get_cms_setting("CACHE_DURATIONS")["menus"],
+        )
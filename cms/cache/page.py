@@ -2,20 +2,28 @@ from __future__ import annotations
 
 import datetime
 import hashlib
+import time
 from collections.abc import Mapping
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
 from django.conf import settings
+from django.http import HttpResponse
 from django.utils.cache import (
     add_never_cache_headers,
+    patch_cache_control,
     patch_response_headers,
     patch_vary_headers,
 )
 from django.utils.encoding import iri_to_uri
 from django.utils.timezone import now
 
-from cms.cache import _get_cache_key, _get_cache_version, _set_cache_version
+from cms.cache import (
+    _get_cache_key,
+    _get_cache_version,
+    _set_cache_version,
+    get_page_cache_tag_versions,
+)
 from cms.constants import EXPIRE_NOW, MAX_EXPIRATION_TTL
 from cms.toolbar.utils import get_toolbar_from_request
 from cms.utils import get_current_site
@@ -27,9 +35,9 @@ from cms.utils.i18n import get_default_language_for_site
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
-    from django.http import HttpRequest, HttpResponse
+    from django.http import HttpRequest
 
-    from cms.models import Page
+    from cms.models import Page, Placeholder
 
 
 def _page_cache_key(request: HttpRequest, vary_on: Iterable[str] | None = None) -> str:
@@ -82,6 +90,20 @@ def _page_vary_headers_cache_key(request: HttpRequest) -> str:
     return _page_cache_key(request) + ".vary-on"
 
 
+def _page_cacheable_cache_key(request: HttpRequest) -> str:
+    """Key of the marker recording that the requested page has been cached.
+
+    The marker outlives page cache versions, so in stale-while-revalidate mode
+    (see :func:`_get_page_cache_or_lock`) requests for a page that has been
+    cached before wait for the render lock even if no previous entry is left.
+    """
+    return _page_cache_key(request) + ".cacheable"
+
+
+# How long the cacheable marker of a page is kept after it was last cached.
+PAGE_CACHE_CACHEABLE_MARKER_TIMEOUT = 60 * 60 * 24
+
+
 def set_page_cache(response: HttpResponse) -> HttpResponse:
     """Store a rendered page response in the CMS page cache.
 
@@ -95,7 +117,9 @@ def set_page_cache(response: HttpResponse) -> HttpResponse:
     onto it and two entries are written: the list of plugin-declared vary
     headers (see :func:`_page_vary_headers_cache_key`) and the response payload
     (content, headers and absolute expiry timestamp) under the header-aware
-    content key. Otherwise ``never cache`` headers are added.
+    content key. Otherwise ``never cache`` headers are added. With
+    ``CMS_PAGE_CACHE_TAGS`` enabled, the payload also records the versions of
+    the tags the page depends on (see :func:`_get_page_cache_tags`).
 
     Returns the (possibly header-patched) ``response``.
     """
@@ -154,6 +178,12 @@ def set_page_cache(response: HttpResponse) -> HttpResponse:
             # decision -- unconditionally exempting a cached response would drop
             # X-Frame-Options from every inherit-default page (clickjacking).
             xframe_options_exempt = getattr(response, "xframe_options_exempt", False)
+
+            if get_cms_setting("PAGE_CACHE_TAGS"):
+                tags = _get_page_cache_tags(request, placeholders)
+                tag_versions = get_page_cache_tag_versions(tags, initialize=True)
+            else:
+                tag_versions = None
             # Persist the list of plugin-declared vary headers so the read path
             # can rebuild the same (header-value aware) content key.
             cache.set(
@@ -169,10 +199,13 @@ def set_page_cache(response: HttpResponse) -> HttpResponse:
                     response_headers,
                     expires_datetime,
                     xframe_options_exempt,
+                    tag_versions,
                 ),
                 ttl,
                 version=version,
             )
+            if get_cms_setting("PAGE_CACHE_STALE_WHILE_REVALIDATE"):
+                cache.set(_page_cacheable_cache_key(request), True, PAGE_CACHE_CACHEABLE_MARKER_TIMEOUT)
             # See note in invalidate_cms_page_cache()
             _set_cache_version(version)
     return response
@@ -187,13 +220,171 @@ def get_page_cache(request: HttpRequest) -> tuple[bytes, Mapping[str, str], date
     returned. The cached value is the ``(content, headers, expires_datetime)``
     tuple stored by :func:`set_page_cache`, or ``None`` on a cache miss.
     """
+    cache_content, is_fresh = _get_page_cache_entry(request, _get_cache_version())
+    return cache_content if is_fresh else None
+
+
+def _get_page_cache_tags(request: HttpRequest, placeholders: Iterable[Placeholder]) -> set[str]:
+    """Tags of the objects a rendered page depends on.
+
+    These are the current site (which stands for its menu), the current page,
+    every rendered placeholder and the page each of these belongs to (e.g.
+    for placeholders inherited from ancestor pages).
+    """
+    tags = {"site:%s" % get_current_site(request).pk}
+    page = getattr(request, "current_page", None)
+
+    if page:
+        tags.add("page:%s" % page.pk)
+
+    for placeholder in placeholders:
+        tags.add("placeholder:%s" % placeholder.pk)
+        # Only use the page if it's known already, don't query for it.
+        placeholder_page = placeholder.__dict__.get("_page")
+        if placeholder_page:
+            tags.add("page:%s" % placeholder_page.pk)
+    return tags
+
+
+def _get_page_cache_entry(
+    request: HttpRequest, version: int
+) -> tuple[tuple[bytes, Mapping[str, str], datetime] | None, bool]:
+    """Return the page cache entry stored under ``version`` and whether it is fresh.
+
+    An entry is stale if any of the tags recorded with it has been invalidated
+    since it was written (see :func:`cms.cache.invalidate_cms_page_cache_tags`).
+    """
     from django.core.cache import cache
 
-    version = _get_cache_version()
     # First resolve which headers (if any) the cached page varies on, then
     # build the content key from this request's values for those headers.
     vary_on = cache.get(_page_vary_headers_cache_key(request), version=version)
-    return cache.get(_page_cache_key(request, vary_on), version=version)
+    cache_content = cache.get(_page_cache_key(request, vary_on), version=version)
+
+    if cache_content is None:
+        return None, False
+
+    # Entries written before tags were recorded have no fifth element.
+    tag_versions = cache_content[4] if len(cache_content) > 4 else None
+    cache_content = cache_content[:4]
+
+    if tag_versions and get_page_cache_tag_versions(tag_versions) != tag_versions:
+        return cache_content, False
+    return cache_content, True
+
+
+# How often requests waiting for another worker to render a page poll the cache.
+PAGE_CACHE_LOCK_POLL_INTERVAL = 0.05
+
+
+def _get_page_cache_or_lock(request: HttpRequest) -> tuple[bytes, Mapping[str, str], datetime] | None:
+    """Stale-while-revalidate variant of :func:`get_page_cache`.
+
+    On a miss, the first request acquires a short-lived, cache-backed render
+    lock for the page and gets ``None`` so it re-renders the page. All other
+    requests are served the stale entry, if there is one, while the lock is
+    held. That is either the entry whose tags have been invalidated or the
+    entry cached under the previous page cache version (see
+    :func:`cms.cache.invalidate_cms_page_cache`). If there is no such entry
+    but the page has been cached before, they wait up to
+    ``CMS_PAGE_CACHE_LOCK_WAIT`` seconds for the lock holder to fill the cache
+    before rendering the page themselves.
+
+    Requests with nothing to serve for a page that has never been cached,
+    e.g. non-CMS urls, 404s or pages that can't be cached, neither take the
+    lock nor wait.
+    """
+    from django.core.cache import cache
+
+    version = _get_cache_version()
+    cache_content, is_fresh = _get_page_cache_entry(request, version)
+
+    if is_fresh:
+        return cache_content
+
+    if cache_content is None and version > 1:
+        cache_content, _ = _get_page_cache_entry(request, version - 1)
+
+    if cache_content is None and not cache.get(_page_cacheable_cache_key(request)):
+        return None
+
+    lock_key = "%s.lock.%s" % (_page_cache_key(request), version)
+
+    if cache.add(lock_key, True, get_cms_setting("PAGE_CACHE_LOCK_TIMEOUT")):
+        # This request renders the page, see release_page_cache_lock()
+        request._cms_page_cache_lock = lock_key
+        return None
+
+    if cache_content is not None:
+        return cache_content
+
+    deadline = time.monotonic() + get_cms_setting("PAGE_CACHE_LOCK_WAIT")
+    while time.monotonic() < deadline:
+        time.sleep(PAGE_CACHE_LOCK_POLL_INTERVAL)
+        cache_content, is_fresh = _get_page_cache_entry(request, version)
+        if is_fresh:
+            return cache_content
+        if not cache.get(lock_key):
+            # The lock holder is done without caching the page,
+            # e.g. because the page can't be cached.
+            break
+    return None
+
+
+def release_page_cache_lock(request: HttpRequest) -> None:
+    """Release the page render lock held by ``request``, if any."""
+    from django.core.cache import cache
+
+    lock_key = getattr(request, "_cms_page_cache_lock", None)
+
+    if lock_key:
+        cache.delete(lock_key)
+        request._cms_page_cache_lock = None
+
+
+def get_page_cache_response(request: HttpRequest, timestamp: datetime.datetime | None = None) -> HttpResponse | None:
+    """Return an ``HttpResponse`` built from the cached page for ``request``.
+
+    Returns ``None`` on a cache miss. The stored headers are restored, the
+    page's clickjacking decision is replayed through ``xframe_options_exempt``
+    and the ``max-age`` is recalculated relative to ``timestamp`` (defaults to
+    now).
+
+    With ``CMS_PAGE_CACHE_STALE_WHILE_REVALIDATE`` enabled, a miss may be
+    answered with the previous version of the page while another request
+    re-renders it (see :func:`_get_page_cache_or_lock`). A request that gets
+    ``None`` may then hold the page's render lock, which must be released with
+    :func:`release_page_cache_lock` once the response is rendered.
+    """
+    if getattr(request, "_cms_page_cache_miss", False):
+        # The cache has already been checked for this request,
+        # e.g. by the PageCacheMiddleware.
+        return None
+
+    if get_cms_setting("PAGE_CACHE_STALE_WHILE_REVALIDATE"):
+        cache_content = _get_page_cache_or_lock(request)
+    else:
+        cache_content = get_page_cache(request)
+
+    if cache_content is None:
+        request._cms_page_cache_miss = True
+        return None
+
+    # ``xframe_options_exempt`` is absent on cache entries written before
+    # this field was added; default to True to preserve their behaviour
+    # until they expire.
+    content, headers, expires_datetime, *rest = cache_content
+    xframe_options_exempt = rest[0] if rest else True
+    response = HttpResponse(content)
+    # Replay the page's clickjacking decision. For "Inherit" pages this
+    # is False, so Django's XFrameOptionsMiddleware still adds the site
+    # default X-Frame-Options header to the cached response.
+    response.xframe_options_exempt = xframe_options_exempt
+    response.headers = headers
+    # Recalculate the max-age header for this cached response
+    max_age = int((expires_datetime - (timestamp or now())).total_seconds() + 0.5)
+    patch_cache_control(response, max_age=max_age)
+    return response
 
 
 def get_xframe_cache(page: Page) -> int | None:
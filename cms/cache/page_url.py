@@ -0,0 +1,94 @@
+"""
+Resolving the page of a request (see :func:`cms.utils.page.get_page_from_request`)
+costs a query on every request. With ``CMS_PAGE_URL_CACHE`` enabled, the
+result is looked up in two tiers first: a small least-recently-used cache in
+each process and then the shared Django cache.
+
+Entries of both tiers hold the page and its urls in all languages, and are
+stored against a per-site version. Any change to the urls or pages of a site
+(see :func:`invalidate_page_url_cache`) bumps the version, which makes all
+entries of the site stale in every process. A process-local hit costs a
+single cache lookup for the version and no query.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+from cms.utils.conf import get_cms_setting
+
+_local_cache = OrderedDict()
+_local_cache_lock = threading.Lock()
+
+
+def _get_version_key(site_id):
+    return f"{get_cms_setting('CACHE_PREFIX')}_PAGE_URL_CACHE_VERSION:{site_id}"
+
+
+def _get_entry_key(site_id, path, version):
+    path_hash = hashlib.sha1(path.encode("utf-8")).hexdigest()
+    return f"{get_cms_setting('CACHE_PREFIX')}_PAGE_URL_CACHE:{site_id}:{version}:{path_hash}"
+
+
+def _get_version(site_id):
+    key = _get_version_key(site_id)
+    version = cache.get(key)
+
+    if version is None:
+        # Like the page cache tags, use a timestamp so an evicted version
+        # never comes back with a value that was used before.
+        version = int(time.time() * 1000000)
+        cache.set(key, version, timeout=None)
+    return version
+
+
+def invalidate_page_url_cache(site_id):
+    """
+    Makes all cached page lookups of the given site stale, in all processes.
+    Called whenever the urls of a page, or a page itself, change.
+    """
+    if not get_cms_setting("PAGE_URL_CACHE"):
+        return
+    cache.set(_get_version_key(site_id), int(time.time() * 1000000), timeout=None)
+
+
+def clear_local_page_url_cache():
+    """
+    Empties the page url cache of the current process.
+    """
+    with _local_cache_lock:
+        _local_cache.clear()
+
+
+def get_cached_page_urls(site_id, path, loader):
+    """
+    Returns the ``(page, urls)`` rows cached for «path» on the given site.
+    On a miss in both tiers, ``loader()`` is called to get them from the
+    database; a result of ``None`` (no page) is not cached.
+    """
+    local_key = (site_id, path)
+    version = _get_version(site_id)
+
+    with _local_cache_lock:
+        entry = _local_cache.get(local_key)
+        if entry is not None and entry[0] == version:
+            _local_cache.move_to_end(local_key)
+            return entry[1]
+
+    entry_key = _get_entry_key(site_id, path, version)
+    rows = cache.get(entry_key)
+
+    if rows is None:
+        rows = loader()
+        if rows is None:
+            return None
+        cache.set(entry_key, rows, get_cms_setting("CACHE_DURATIONS")["content"])
+
+    with _local_cache_lock:
+        _local_cache[local_key] = (version, rows)
+        _local_cache.move_to_end(local_key)
+        while len(_local_cache) > get_cms_setting("PAGE_URL_CACHE_SIZE"):
+            _local_cache.popitem(last=False)
+    return rows
@@ -1,4 +1,22 @@
-from cms.utils.conf import get_cms_setting
+"""
+The page permissions of a user are cached as a single snapshot per user and
+site: a dictionary mapping each action (see PERMISSION_KEYS) to the
+permission tuples of the pages the user may perform it on.
+
+A snapshot is stored with the global and the user's permission version it
+was computed for. Reading it and both versions takes a single cache round
+trip; clearing the cache of a user or of all users only replaces the
+respective version.
+
+With CMS_PERMISSION_LOCAL_CACHE_DURATION set, snapshots are also kept in
+each process for that many seconds, which saves the round trip but delays
+permission changes made in other processes by up to that long.
+"""
+import time
+import warnings
+
+from cms.utils.compat.warnings import RemovedInDjangoCMS60Warning
+from cms.utils.conf import get_cms_setting, get_site_id
 
 PERMISSION_KEYS = [
     'add_page', 'change_page', 'change_page_advanced_settings',
@@ -6,45 +24,188 @@ PERMISSION_KEYS = [
     'publish_page', 'view_page',
 ]
 
+_local_cache = {}
+
+
+def _get_snapshot_cache_key(user, site_id):
+    return "%s:permission:%d:%d" % (
+        get_cms_setting('CACHE_PREFIX'), user.pk or 0, get_site_id(site_id))
+
 
 def get_cache_key(user, key):
+    warnings.warn(
+        "Page permissions are no longer cached per action. get_cache_key() is deprecated "
+        "and will be removed in django CMS 6.0.",
+        RemovedInDjangoCMS60Warning,
+        stacklevel=2,
+    )
     return "%s:permission:%d:%s" % (
         get_cms_setting('CACHE_PREFIX'), user.pk or 0, key)
 
 
-def get_cache_permission_version_key():
-    return "{}:permission:version".format(get_cms_setting('CACHE_PREFIX'))
+def get_cache_permission_version_key(user=None):
+    if user is None:
+        return "{}:permission:version".format(get_cms_setting('CACHE_PREFIX'))
+    return "%s:permission:version:%d" % (get_cms_setting('CACHE_PREFIX'), user.pk or 0)
 
 
 def get_cache_permission_version():
+    warnings.warn(
+        "get_cache_permission_version() is deprecated and will be removed in django CMS 6.0.",
+        RemovedInDjangoCMS60Warning,
+        stacklevel=2,
+    )
+    key = get_cache_permission_version_key()
+    return _get_versions([key], [None])[0]
+
+
+def _new_version():
+    # Versions are only compared for equality. A timestamp never repeats a
+    # version a snapshot might have been stored with, even if the version
+    # got evicted from the cache in between.
+    return time.time_ns()
+
+
+def _get_versions(version_keys, versions):
+    """
+    Initialises the versions missing from the cache. A snapshot stored
+    against a missing version would otherwise match again whenever the
+    version set by a later clear gets evicted. If another process added the
+    version first, its value is used.
+    """
     from django.core.cache import cache
+
+    versions = list(versions)
+
+    for index, version_key in enumerate(version_keys):
+        if versions[index] is None:
+            version = _new_version()
+
+            if not cache.add(version_key, version, get_cms_setting('CACHE_DURATIONS')['permissions']):
+                version = cache.get(version_key, version)
+            versions[index] = version
+    return versions
+
+
+def _get_local_cache_duration():
+    return get_cms_setting('PERMISSION_LOCAL_CACHE_DURATION')
+
+
+def _get_versioned_snapshot(user, site_id):
+    from django.core.cache import cache
+
+    key = _get_snapshot_cache_key(user, site_id)
+    version_keys = [get_cache_permission_version_key(), get_cache_permission_version_key(user)]
+    values = cache.get_many([key, *version_keys])
+    versions = [values.get(version_key) for version_key in version_keys]
+
+    if None in versions:
+        versions = _get_versions(version_keys, versions)
+
     try:
-        version = int(cache.get(get_cache_permission_version_key()))
-    except Exception:
-        version = 1
-    return int(version)
+        snapshot_versions, snapshot = values[key]
+    except KeyError:
+        snapshot = None
+    else:
+        if snapshot_versions != versions:
+            snapshot = None
+    return key, versions, snapshot
+
+
+def _store_snapshot(key, versions, snapshot):
+    from django.core.cache import cache
+
+    cache.set(key, (versions, snapshot), get_cms_setting('CACHE_DURATIONS')['permissions'])
+    _set_local_cache(key, snapshot)
+
+
+def _get_local_snapshot(key):
+    if not _get_local_cache_duration():
+        return None
+
+    cached = _local_cache.get(key)
+
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    return None
 
 
-def get_permission_cache(user, key):
+def get_permission_snapshot(user, site_id=None):
     """
-    Helper for reading values from cache
+    Returns the cached permission snapshot of the user on the given site, or
+    None if there is none or it is outdated.
     """
-    from django.core.cache import cache
-    return cache.get(get_cache_key(user, key), version=get_cache_permission_version())
+    key = _get_snapshot_cache_key(user, site_id)
+    snapshot = _get_local_snapshot(key)
+
+    if snapshot is None:
+        key, versions, snapshot = _get_versioned_snapshot(user, site_id)
 
+        if snapshot is not None:
+            _set_local_cache(key, snapshot)
+    return snapshot
 
-def set_permission_cache(user, key, value):
+
+def get_or_set_permission_snapshot(user, compute, site_id=None):
     """
-    Helper method for storing values in cache. Stores used keys so
-    all of them can be cleaned when clean_permission_cache gets called.
+    Returns the cached permission snapshot of the user on the given site.
+    If there is none, «compute» is called to build it and the result is
+    stored against the versions just read, so a hit costs one cache round
+    trip and a miss two.
     """
-    from django.core.cache import cache
+    key = _get_snapshot_cache_key(user, site_id)
+    snapshot = _get_local_snapshot(key)
+
+    if snapshot is not None:
+        return snapshot
+
+    key, versions, snapshot = _get_versioned_snapshot(user, site_id)
+
+    if snapshot is None:
+        snapshot = compute()
+        _store_snapshot(key, versions, snapshot)
+    else:
+        _set_local_cache(key, snapshot)
+    return snapshot
+
+
+def set_permission_snapshot(user, snapshot, site_id=None):
+    """
+    Stores the permission snapshot of the user on the given site.
+    """
+    key, versions, _ = _get_versioned_snapshot(user, site_id)
+    _store_snapshot(key, versions, snapshot)
+
+
+def _set_local_cache(key, snapshot):
+    duration = _get_local_cache_duration()
 
-    # store this key, so we can clean it when required
-    cache_key = get_cache_key(user, key)
-    cache.set(cache_key, value,
-              get_cms_setting('CACHE_DURATIONS')['permissions'],
-              version=get_cache_permission_version())
+    if not duration:
+        return
+
+    now = time.monotonic()
+
+    for expired_key in [key for key, (expires, _) in _local_cache.items() if expires <= now]:
+        _local_cache.pop(expired_key, None)
+    _local_cache[key] = (now + duration, snapshot)
+
+
+def get_permission_cache(user, key, site_id=None):
+    """
+    Helper for reading the cached permissions of the user for a single action
+    """
+    snapshot = get_permission_snapshot(user, site_id)
+    return None if snapshot is None else snapshot.get(key)
+
+
+def set_permission_cache(user, key, value, site_id=None):
+    """
+    Helper for caching the permissions of the user for a single action
+    """
+    cache_key, versions, snapshot = _get_versioned_snapshot(user, site_id)
+    snapshot = dict(snapshot or {})
+    snapshot[key] = value
+    _store_snapshot(cache_key, versions, snapshot)
 
 
 def clear_user_permission_cache(user):
@@ -52,15 +213,24 @@ def clear_user_permission_cache(user):
     Cleans permission cache for given user.
     """
     from django.core.cache import cache
-    for key in PERMISSION_KEYS:
-        cache.delete(get_cache_key(user, key), version=get_cache_permission_version())
+
+    prefix = "%s:permission:%d:" % (get_cms_setting('CACHE_PREFIX'), user.pk or 0)
+
+    for key in [key for key in _local_cache if key.startswith(prefix)]:
+        _local_cache.pop(key, None)
+    cache.set(
+        get_cache_permission_version_key(user),
+        _new_version(),
+        get_cms_setting('CACHE_DURATIONS')['permissions'],
+    )
 
 
 def clear_permission_cache():
     from django.core.cache import cache
-    version = get_cache_permission_version()
-    if version > 1:
-        cache.incr(get_cache_permission_version_key())
-    else:
-        cache.set(get_cache_permission_version_key(), 2,
-                  get_cms_setting('CACHE_DURATIONS')['permissions'])
+
+    _local_cache.clear()
+    cache.set(
+        get_cache_permission_version_key(),
+        _new_version(),
+        get_cms_setting('CACHE_DURATIONS')['permissions'],
+    )
@@ -94,10 +94,7 @@ def _get_placeholder_cache_key(placeholder, lang, site_id, request, soft=False):
     read from the cache. If instead the key retrieval is to support a cache
     write, let «soft» be False.
     """
-    prefix = get_cms_setting("CACHE_PREFIX")
     version, vary_on_list = _get_placeholder_cache_version(placeholder, lang, site_id)
-    tz = get_timezone_name()
-    main_key = f"{prefix}|render_placeholder|id:{placeholder.pk}|lang:{lang}|site:{site_id}|tz:{tz}|v:{version}"
 
     if not soft:
         # We are about to write to the cache, so we want to get the latest
@@ -110,6 +107,18 @@ def _get_placeholder_cache_key(placeholder, lang, site_id, request, soft=False):
         # Update the main placeholder cache version
         _set_placeholder_cache_version(placeholder, lang, site_id, version, vary_on_list, duration)
 
+    return _build_placeholder_cache_key(placeholder, lang, site_id, request, version, vary_on_list)
+
+
+def _build_placeholder_cache_key(placeholder, lang, site_id, request, version, vary_on_list):
+    """
+    Builds the fully-addressed cache key for the given placeholder from an
+    already known «version» and «vary_on_list», without touching the cache.
+    """
+    prefix = get_cms_setting("CACHE_PREFIX")
+    tz = get_timezone_name()
+    main_key = f"{prefix}|render_placeholder|id:{placeholder.pk}|lang:{lang}|site:{site_id}|tz:{tz}|v:{version}"
+
     sub_key_list = []
     for key in vary_on_list:
         value = request.META.get(get_header_name(key)) or "_"
@@ -161,6 +170,48 @@ def get_placeholder_cache(placeholder, lang, site_id, request):
     return content
 
 
+def get_placeholder_caches(placeholders, lang, site_id, request):
+    """
+    Returns a dictionary mapping placeholder pks to their cached content for
+    all given «placeholders», respecting each placeholder's VARY headers.
+
+    Placeholders without a cache entry are left out of the result. All
+    version keys and all content keys are fetched with one ``get_many`` call
+    each, so the lookup costs two cache round trips regardless of the number
+    of placeholders.
+    """
+    from django.core.cache import cache
+
+    placeholders = list(placeholders)
+    if not placeholders:
+        return {}
+
+    version_keys = {
+        _get_placeholder_cache_version_key(placeholder, lang, site_id): placeholder
+        for placeholder in placeholders
+    }
+    versions = cache.get_many(version_keys.keys())
+
+    content_keys = {}
+    for version_key, cached in versions.items():
+        if not cached:
+            continue
+        # A missing version means there can't be any content cached for the
+        # placeholder. Unlike _get_placeholder_cache_version() we don't store
+        # a new version here, the next write through set_placeholder_cache()
+        # takes care of that.
+        version, vary_on_list = cached
+        placeholder = version_keys[version_key]
+        key = _build_placeholder_cache_key(placeholder, lang, site_id, request, version, vary_on_list)
+        content_keys[key] = placeholder.pk
+
+    if not content_keys:
+        return {}
+
+    contents = cache.get_many(content_keys.keys())
+    return {content_keys[key]: content for key, content in contents.items() if content is not None}
+
+
 def clear_placeholder_cache(placeholder, lang, site_id):
     """
     Invalidates all existing cache entries for (placeholder x lang x site_id).
@@ -0,0 +1,142 @@
+"""
+This module manages the fragment cache of plugins that opt in via
+:attr:`cms.plugin_base.CMSPluginBase.cache_fragment`.
+
+Unlike the placeholder cache, fragments are not versioned. Instead, the cache
+key is derived from everything the rendered fragment depends on: the pk and
+``changed_date`` of the plugin and of all its descendants, the language, the
+site, the timezone and the values of the request headers the plugins vary on.
+Editing, adding or removing any plugin of the subtree results in a new key, so
+fragments never need to be invalidated explicitly. Outdated entries simply
+expire.
+"""
+import hashlib
+from datetime import datetime, timedelta
+
+from django.utils.timezone import now
+
+from cms.constants import EXPIRE_NOW
+from cms.utils.conf import get_cms_setting
+from cms.utils.helpers import get_header_name, get_timezone_name
+
+
+def _get_plugin_subtree(instance):
+    """
+    Returns the (downcasted) plugin instances the fragment of «instance» is
+    rendered from, or None if its children are unknown.
+    """
+    if instance.child_plugin_instances is None:
+        return None
+
+    plugins = []
+    stack = [instance]
+
+    while stack:
+        plugin = stack.pop()
+        children = plugin.child_plugin_instances
+
+        if children is None:
+            return None
+        plugins.append(plugin)
+        stack.extend(reversed(children))
+    return plugins
+
+
+def _get_plugin_ttl(request, instance, plugin, placeholder, response_timestamp):
+    """
+    Returns the number of seconds the output of a single plugin can be cached,
+    following the rules of Placeholder.get_cache_expiration().
+    """
+    if not plugin.cache:
+        return EXPIRE_NOW
+
+    expiration = plugin.get_cache_expiration(request, instance, placeholder)
+
+    if expiration is None:
+        return get_cms_setting("CACHE_DURATIONS")["content"]
+    if isinstance(expiration, datetime):
+        try:
+            expiration = expiration - response_timestamp
+        except TypeError:
+            # Naive datetime, see Placeholder.get_cache_expiration()
+            return EXPIRE_NOW
+    if isinstance(expiration, timedelta):
+        return int(expiration.total_seconds() + 0.5)
+    try:
+        return int(expiration)
+    except (TypeError, ValueError):
+        return EXPIRE_NOW
+
+
+def _get_vary_on_list(request, plugins, placeholder):
+    vary_on_list = set()
+
+    for instance in plugins:
+        vary_on = instance.get_plugin_class_instance().get_vary_cache_on(request, instance, placeholder)
+
+        if not vary_on:
+            continue
+        if isinstance(vary_on, str):
+            vary_on = [vary_on]
+        vary_on_list.update(item.lower() for item in vary_on)
+    return sorted(vary_on_list)
+
+
+def get_plugin_fragment_cache_params(instance, placeholder, lang, site_id, request):
+    """
+    Returns a tuple of (cache key, duration) for the fragment of «instance»
+    or None if it can't be cached.
+    """
+    if not get_cms_setting("PLUGIN_CACHE"):
+        return None
+
+    plugins = _get_plugin_subtree(instance)
+
+    if plugins is None:
+        return None
+
+    timestamp = now()
+    duration = get_cms_setting("CACHE_DURATIONS")["content"]
+
+    for plugin in plugins:
+        plugin_class = plugin.get_plugin_class_instance()
+        duration = min(duration, _get_plugin_ttl(request, plugin, plugin_class, placeholder, timestamp))
+
+        if duration <= 0:
+            return None
+
+    dependencies = "|".join(f"{plugin.pk}:{plugin.changed_date.isoformat()}" for plugin in plugins)
+    prefix = get_cms_setting("CACHE_PREFIX")
+    tz = get_timezone_name()
+    cache_key = (
+        f"{prefix}|render_plugin|id:{instance.pk}|lang:{lang}|site:{site_id}|tz:{tz}"
+        f"|deps:{hashlib.sha1(dependencies.encode('utf-8')).hexdigest()}"
+    )
+
+    for key in _get_vary_on_list(request, plugins, placeholder):
+        value = request.META.get(get_header_name(key)) or "_"
+        cache_key += f"|{key}:{value}"
+
+    # See _build_placeholder_cache_key()
+    if len(cache_key) > 200:
+        cache_key = "{prefix}|{hash}".format(
+            prefix=prefix,
+            hash=hashlib.sha1(cache_key.encode("utf-8")).hexdigest(),
+        )
+    return cache_key, duration
+
+
+def get_plugin_fragment_cache(cache_key):
+    """
+    Returns the cached fragment, a dict with the rendered "content" and the
+    "sekizai" data it added, or None.
+    """
+    from django.core.cache import cache
+
+    return cache.get(cache_key)
+
+
+def set_plugin_fragment_cache(cache_key, duration, content, sekizai):
+    from django.core.cache import cache
+
+    cache.set(cache_key, {"content": content, "sekizai": sekizai}, duration)
@@ -1,12 +1,12 @@
 import re
-from collections import defaultdict
 from collections.abc import Generator, Iterable
 
 from django.utils.functional import SimpleLazyObject
 
 from cms import constants
 from cms.apphook_pool import apphook_pool
-from cms.models import Page, PageContent, PagePermission, PageUrl
+from cms.cache.menu import get_menu_index
+from cms.models import Page, PageContent, PagePermission, PermissionTupleIndex
 from cms.toolbar.utils import get_object_edit_url, get_object_preview_url, get_toolbar_from_request
 from cms.utils.conf import get_cms_setting
 from cms.utils.i18n import (
@@ -46,29 +46,32 @@ def get_visible_page_contents(request, page_contents: Iterable[PageContent], sit
         # only if he can see unrestricted, otherwise return no pages.
         return page_contents if can_see_unrestricted else []
 
+    pages = {page_content.page.pk: page_content.page for page_content in page_contents}
     restrictions = PagePermission.objects.filter(
-        page_id__in={page_content.page.pk for page_content in page_contents},
+        page_id__in=pages.keys(),
         can_view=True,
     )
-    restriction_map = {perm.page_id: perm for perm in restrictions}
+    # Index the restrictions by path, so each page is only checked against
+    # the restrictions on itself and its ancestors.
+    restriction_index = PermissionTupleIndex()
+
+    for perm in restrictions:
+        # set internal fk cache to our page with loaded ancestors and descendants
+        PagePermission.page.field.set_cached_value(perm, pages[perm.page_id])
+        restriction_index.add(perm.get_page_permission_tuple(), perm)
 
     user_id = request.user.pk
     user_groups = SimpleLazyObject(lambda: frozenset(request.user.groups.values_list("pk", flat=True)))
     is_auth_user = request.user.is_authenticated
 
     def user_can_see_page(page: Page) -> bool:
-        if page.pk in restriction_map:
-            # set internal fk cache to our page with loaded ancestors and descendants
-            PagePermission.page.field.set_cached_value(restriction_map[page.pk], page)
-
         restricted = False
-        for perm in restrictions:
-            if perm.get_page_permission_tuple().contains(page.path):
-                if not is_auth_user:
-                    return False
-                if perm.user_id == user_id or perm.group_id in user_groups:
-                    return True
-                restricted = True
+        for perm in restriction_index.get_values(page.path):
+            if not is_auth_user:
+                return False
+            if perm.user_id == user_id or perm.group_id in user_groups:
+                return True
+            restricted = True
 
         # Page has no view restrictions, fallback to the project's
         # CMS_PUBLIC_FOR setting.
@@ -104,6 +107,16 @@ class CMSNavigationNode(NavigationNode):
         except AttributeError:
             return False
 
+    def get_selection_key(self):
+        return self.id
+
+    @classmethod
+    def get_request_selection_key(cls, request):
+        try:
+            return request.current_page.pk
+        except AttributeError:
+            return None
+
 
 class CMSMenu(Menu):
     """Subclass of :class:`menus.base.Menu`. Its :meth:`~menus.base.Menu.get_nodes()` creates a list of NavigationNodes
@@ -246,7 +259,8 @@ class CMSMenu(Menu):
 
         ..   note::
 
-            * The method retrieves the necessary data from the database to build the navigation nodes for the menu.
+            * The method retrieves the necessary data from the site's menu index (see :mod:`cms.cache.menu`),
+              which is only built from the database if it is not cached.
             * The behavior of the method depends on whether the edit mode or preview mode is active in the toolbar.
             * If either edit mode or preview mode is active, the method retrieves all current page content objects
               visible in the admin for the current page.
@@ -256,73 +270,38 @@ class CMSMenu(Menu):
             * Only specific fields of the page content objects are selected to optimize performance.
             * If either edit mode or preview mode is active, a preview URL is constructed for a "virtual" non-existing
               page content with id=0 to avoid too many calls to ``revert`` the admin URL.
-            * The method includes a nested function for prefetching URLs and filling the URL cache.
+            * The URL cache of the pages in the public menu index is filled when the index is built.
             * The visibility of the page contents is further filtered based on authentication and permissions.
             * The homepage is determined based on the page contents and marked for cutting if necessary.
             * The menu node for each page content is created using the get_menu_node_for_page_content method of the
               instance.
-            * The prefetch_urls function is called for each page content to fill the URL cache and provide necessary
-              data for creating the menu node.
             * The select_lang method is used to filter the page contents based on the specified language preferences.
         """
         site = self.renderer.site
         toolbar = get_toolbar_from_request(request)
-
-        if toolbar.edit_mode_active or toolbar.preview_mode_active:
-            # Get all translations visible in the admin for the current page
-            translations_qs = PageContent.admin_manager.current_content()
-        else:
-            # Only get public translations
-            translations_qs = PageContent.objects
-
-        page_contents = (
-            translations_qs.filter(language__in=self.languages)
-            .order_by("page__path")
-            .filter(page__site=site)
-            .select_related("page")
-            .only(
-                "page_id",
-                "language",
-                "menu_title",
-                "title",
-                "limit_visibility_in_menu",
-                "soft_root",
-                "in_navigation",
-                "redirect",
-                "page__site_id",
-                "page__parent_id",
-                "page__path",  # needed by the view-restriction check in get_visible_page_contents
-                "page__is_home",
-                "page__login_required",
-                "page__reverse_id",
-                "page__navigation_extenders",
-                "page__application_urls",
-            )
+        edit_or_preview = toolbar.edit_mode_active or toolbar.preview_mode_active
+
+        # The menu index holds the page contents of all languages of the site.
+        # It is patched instead of rebuilt when a page changes, see
+        # cms.cache.menu.update_menu_index.
+        page_contents = sorted(
+            (
+                page_content
+                for translations in get_menu_index(site.pk, edit=edit_or_preview).values()
+                for page_content in translations
+                if page_content.language in self.languages
+            ),
+            key=lambda page_content: page_content.page.path,
         )
-        if toolbar.edit_mode_active or toolbar.preview_mode_active:
+
+        if edit_or_preview:
             # Edit URL for a "virtual" non-existing page content with id=0. This is used to quickly build many
             # edit urls by replacing "/0/" by the page content pk in the edit url
             view_url = get_object_edit_url(PageContent(id=0)) if toolbar.edit_mode_active else get_object_preview_url(PageContent(id=0))
-
-            def prefetch_urls(page_content: PageContent) -> PageContent:
-                return page_content
         else:
-            view_url = None  # No short-cut here
-            prefetched_urls = PageUrl.objects.filter(
-                language__in=(page_content.language for page_content in page_contents),
-                page_id__in=(page_content.page.pk for page_content in page_contents),
-            )  # Fetch the PageUrl objects
-            # Prepare for filling urls_cache
-            filtered_urls = defaultdict(dict)
-            for page_url in prefetched_urls:
-                filtered_urls[page_url.page_id][page_url.language] = page_url
-
-            def prefetch_urls(page_content: PageContent) -> PageContent:
-                # Fill url cache for existing urls and page contents into the cache
-                # Access the cache directly to not lead to a db hit when accessing
-                # non-existing languages
-                page_content.page.urls_cache = filtered_urls.get(page_content.page_id)
-                return page_content
+            # No short-cut here, the url cache of the pages in the public
+            # menu index is already filled.
+            view_url = None
 
         page_contents = get_visible_page_contents(request, page_contents, site)
         home = next((page_content for page_content in page_contents if page_content.page.is_home), None)
@@ -333,7 +312,7 @@ class CMSMenu(Menu):
 
         return [
             self.get_menu_node_for_page_content(
-                prefetch_urls(page_content),
+                page_content,
                 view_url=view_url,
                 cut=page_content.page.parent_id == homepage_pk and cut_homepage,
             )
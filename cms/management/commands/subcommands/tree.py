@@ -22,6 +22,21 @@ def get_descendants(root):
         yield from get_descendants(child)
 
 
+class RebuildTreeCommand(SubcommandsCommand):
+    help_string = 'Recomputing Materialized Path Tree for Pages from parent relations'
+    command_name = 'rebuild-tree'
+
+    def handle(self, *args, **options):
+        """
+        Recomputes the paths of all pages from their parents, keeping the
+        sibling order. Under the fractional tree backend, this converts paths
+        written by another backend and shortens grown order keys.
+        """
+        self.stdout.write('rebuilding page tree')
+        Page.fix_tree()
+        self.stdout.write('all done')
+
+
 class FixTreeCommand(SubcommandsCommand):
     help_string = 'Repairing Materialized Path Tree for Pages'
     command_name = 'fix-tree'
@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.middleware.clickjacking import XFrameOptionsMiddleware
+
+from cms.cache.page import get_page_cache_response, release_page_cache_lock
+from cms.utils.conf import get_cms_setting
+
+
+class PageCacheMiddleware:
+    """
+    Serves responses from the CMS page cache before URL resolution.
+
+    Anonymous requests for a cached page are answered straight from the cache
+    written by :func:`cms.cache.page.set_page_cache`, skipping URL resolution,
+    the remaining middleware and the ``details`` view. Place it after the
+    session, authentication and locale middleware (the page cache key depends
+    on ``request.LANGUAGE_CODE``) but before the CMS middleware::
+
+        MIDDLEWARE = [
+            ...
+            'django.contrib.sessions.middleware.SessionMiddleware',
+            'django.contrib.auth.middleware.AuthenticationMiddleware',
+            'django.middleware.locale.LocaleMiddleware',
+            'cms.middleware.cache.PageCacheMiddleware',
+            ...
+            'cms.middleware.toolbar.ToolbarMiddleware',
+        ]
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # The response bypasses all middleware listed after this one. Apply the
+        # site's clickjacking defaults ourselves, if they are configured, so
+        # cached "Inherit" pages still get their X-Frame-Options header.
+        if "django.middleware.clickjacking.XFrameOptionsMiddleware" in settings.MIDDLEWARE:
+            self.xframe_options = XFrameOptionsMiddleware(get_response)
+        else:
+            self.xframe_options = None
+
+    def can_use_cache(self, request):
+        if request.method not in ("GET", "HEAD") or not get_cms_setting("PAGE_CACHE"):
+            return False
+
+        if request.user.is_authenticated:
+            return False
+        # Anonymous users can explicitly ask for the toolbar, see
+        # CMSToolbar.init_toolbar(). The details view never serves those
+        # requests from the cache either.
+        anonymous_on = get_cms_setting("TOOLBAR_ANONYMOUS_ON")
+        return not (anonymous_on and get_cms_setting("CMS_TOOLBAR_URL__ENABLE") in request.GET)
+
+    def process_request(self, request):
+        if not self.can_use_cache(request):
+            return None
+
+        response = get_page_cache_response(request)
+
+        if response is not None and self.xframe_options:
+            response = self.xframe_options.process_response(request, response)
+        return response
+
+    def __call__(self, request):
+        response = self.process_request(request)
+        if response is None:
+            try:
+                response = self.get_response(request)
+            finally:
+                # The request might have acquired the page's render lock
+                # on a cache miss (stale-while-revalidate mode).
+                release_page_cache_lock(request)
+        return response
+
+    async def __acall__(self, request):
+        response = self.process_request(request)
+        if response is None:
+            try:
+                response = await self.get_response(request)
+            finally:
+                release_page_cache_lock(request)
+        return response
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+
+def _rebuild_tree(apps, schema_editor, driver):
+    from cms.utils.mptree import get_tree_backend
+
+    if get_tree_backend() != "fractional":
+        return
+    Page = apps.get_model("cms", "Page")
+    driver(Page, using=schema_editor.connection.alias).rebuild()
+
+
+def _to_fractional_paths(apps, schema_editor):
+    """Rewrite the page paths for the fractional tree backend, if it is active.
+
+    Otherwise, the paths are left alone and ``manage.py cms rebuild-tree``
+    converts them once the backend is switched. See cms.utils.fractree.
+    """
+    from cms.utils.fractree import FractionalPath
+
+    _rebuild_tree(apps, schema_editor, FractionalPath)
+
+
+def _to_fixed_width_paths(apps, schema_editor):
+    """Rewrite the page paths in the treebeard-compatible encoding."""
+    from cms.utils.mptree import MaterializedPath
+
+    _rebuild_tree(apps, schema_editor, MaterializedPath)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cms", "0045_pageurl_site_unique_path"),
+    ]
+
+    operations = [
+        migrations.RunPython(_to_fractional_paths, _to_fixed_width_paths, elidable=False),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cms", "0046_fractional_page_tree_paths"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cmsplugin",
+            name="render_payload",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
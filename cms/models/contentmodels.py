@@ -184,6 +184,14 @@ class PageContent(models.Model):
             delattr(self, "_template_cache")
         super().save(**kwargs)
 
+    def delete(self, *args, **kwargs):
+        from cms.cache.menu import update_menu_index
+
+        deleted = super().delete(*args, **kwargs)
+        # The translation no longer shows up in the menus
+        update_menu_index(self.page)
+        return deleted
+
     def toggle_in_navigation(self, set_to=None):
         """
         Toggles (or sets) in_navigation and invalidates the cms page cache
@@ -197,9 +205,10 @@ class PageContent(models.Model):
 
         self.update(in_navigation=new)
 
-        # If there was a change, invalidate the cms page cache
+        # If there was a change, invalidate the cms page cache. The menu
+        # shows on every page, so all pages of the site are affected.
         if new != old:
-            self.page.clear_cache()
+            self.page.clear_cache(menu=True)
         return new
 
     def has_placeholder_change_permission(self, user):
@@ -29,6 +29,9 @@ class PageManager(models.Manager):
     def get_home(self, site=None):
         return self.get_queryset().get_home(site)
 
+    def with_hierarchy(self):
+        return self.get_queryset().with_hierarchy()
+
     def search(self, q, language=None, current_site_only=True, site=None):
         """Simple search function
 
@@ -177,6 +180,14 @@ class PlaceholderManager(models.Manager):
         """
         Get all placeholders for given object
         """
+        prefetched = getattr(obj, "_prefetched_objects_cache", {}).get("placeholders")
+
+        if prefetched is not None and prefetched.model is self.model:
+            # See cms.utils.page.prefetch_page_contents()
+            for placeholder in prefetched:
+                placeholder._state.fields_cache["source"] = obj
+            return prefetched
+
         content_type = ContentType.objects.get_for_model(obj)
         return (PlaceholderForObjQS(source_object=obj, model=self.model, using=self._db, hints=self._hints)
                 .filter(content_type=content_type, object_id=obj.pk))
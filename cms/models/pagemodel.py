@@ -5,7 +5,6 @@ from os.path import join
 from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
 from django.db import IntegrityError, connection, models, router
-from django.db.models import Prefetch
 from django.db.models.base import ModelState
 from django.db.models.constraints import UniqueConstraint
 from django.db.models.functions import Concat
@@ -16,14 +15,14 @@ from django.utils.timezone import now
 from django.utils.translation import get_language, gettext_lazy as _, override as force_language
 
 from cms import constants
+from cms.cache.page_url import invalidate_page_url_cache
 from cms.models.managers import PageManager, PageUrlManager
 from cms.utils import i18n
 from cms.utils.compat.warnings import RemovedInDjangoCMS60Warning
 from cms.utils.conf import get_cms_setting
 from cms.utils.i18n import get_current_language
-from cms.utils.mptree import get_tree_base
+from cms.utils.mptree import get_path_prefixes, get_tree_base
 from cms.utils.page import get_clean_username
-from menus.menu_pool import menu_pool
 
 logger = getLogger(__name__)
 
@@ -183,7 +182,7 @@ class Page(MP_Node):
         return bool(self.numchild)
 
     def get_ancestor_paths(self):
-        paths = frozenset(self.path[0:pos] for pos in range(0, len(self.path), self.steplen)[1:])
+        paths = frozenset(get_path_prefixes(self.path, self.steplen)[:-1])
         return paths
 
     def add_child(self, **kwargs):
@@ -201,7 +200,7 @@ class Page(MP_Node):
         return super().add_sibling(*args, **kwargs)
 
     def get_cached_ancestors(self):
-        if self._has_cached_hierarchy():
+        if hasattr(self, "_ancestors"):
             return self._ancestors
         return []
 
@@ -309,6 +308,7 @@ class Page(MP_Node):
         (
             PageUrl.objects.filter(language=language, page=self).exclude(managed=False).update(path=new_path)
         )  # TODO: Update or create?
+        invalidate_page_url_cache(self.site_id)
 
     def _update_url_path_recursive(self, language):
         """Rebuild the managed URL paths of all descendant pages for
@@ -346,6 +346,7 @@ class Page(MP_Node):
                     next_base_paths[page_id] = path
             if changed:
                 PageUrl.objects.bulk_update(changed, ["path"])
+                invalidate_page_url_cache(self.site_id)
             base_paths = next_base_paths
 
     def _set_title_root_path(self):
@@ -357,6 +358,7 @@ class Page(MP_Node):
             # to include this page's slug as its path prefix
             (page_urls.filter(language=language).update(path=Concat(models.Value(slug), models.Value("/"), "path")))
             self.update_urls(language, path=slug)
+        invalidate_page_url_cache(self.site_id)
         return page_tree
 
     def _remove_title_root_path(self):
@@ -373,6 +375,7 @@ class Page(MP_Node):
                 function="substr",
             )
             (page_urls.filter(language=language, path__startswith=slug).update(path=sql_func))
+        invalidate_page_url_cache(self.site_id)
         return page_tree
 
     def is_potential_home(self):
@@ -573,8 +576,11 @@ class Page(MP_Node):
     ):
         """
         Copy a page [ and all its descendants to a new location ]
+
+        The descendants are copied level by level with bulk inserts, see
+        :class:`cms.utils.page.PageTreeCopy`.
         """
-        from cms.models import PageContent
+        from cms.utils.page import PageTreeCopy
 
         if target_node is not None:
             warnings.warn(
@@ -594,14 +600,6 @@ class Page(MP_Node):
         if target_site is None:
             target_site = parent_page.site if parent_page else self.site
 
-        # Evaluate the descendants queryset BEFORE copying the page.
-        # Otherwise, if the page is copied and pasted on itself, it will duplicate.
-        descendants = list(
-            self.get_descendant_pages().prefetch_related(
-                "urls",
-                Prefetch("pagecontent_set", queryset=PageContent.admin_manager.all()),
-            )
-        )
         new_root_page = self.copy(target_site, parent_page=parent_page, user=user)
 
         if target_page and position in ("first-child"):
@@ -615,12 +613,9 @@ class Page(MP_Node):
             new_root_page.move(target_page, position)
             new_root_page.refresh_from_db(fields=("path", "depth"))
 
-        pages_by_id = {self.id: new_root_page}
-        for page in descendants:
-            parent = pages_by_id[page.parent_id]
-            pages_by_id[page.id] = page.copy(
-                target_site, parent_page=parent, translations=True, permissions=copy_permissions, user=user
-            )
+        if self.is_branch:
+            PageTreeCopy(self, new_root_page, user, copy_permissions=copy_permissions, site=target_site).run()
+            new_root_page.refresh_from_db(fields=("numchild",))
         return new_root_page
 
     def delete(self, *args, **kwargs):
@@ -655,10 +650,12 @@ class Page(MP_Node):
             self.created_by = self.changed_by
 
         super().save(**kwargs)
+        invalidate_page_url_cache(self.site_id)
 
     def update(self, refresh=False, **data):
         cls = self.__class__
         cls.objects.filter(pk=self.pk).update(**data)
+        invalidate_page_url_cache(self.site_id)
 
         if refresh:
             return self.reload()
@@ -678,11 +675,20 @@ class Page(MP_Node):
         return self.pagecontent_set.filter(language=language).exists()
 
     def clear_cache(self, language=None, menu=False, placeholder=False):
-        from cms.cache import invalidate_cms_page_cache
+        from cms.cache import invalidate_cms_page_cache_tags
+        from cms.cache.menu import update_menu_index
+
+        # Cached page lookups hold the page, see CMS_PAGE_URL_CACHE.
+        invalidate_page_url_cache(self.site_id)
 
         if get_cms_setting("PAGE_CACHE"):
-            # Clears all the page caches
-            invalidate_cms_page_cache()
+            # Clears the cached pages depending on this page. If the menu
+            # changes, this is every page on the site.
+            # Falls back to clearing all the page caches, see CMS_PAGE_CACHE_TAGS.
+            if menu:
+                invalidate_cms_page_cache_tags([f"site:{self.site_id}"])
+            else:
+                invalidate_cms_page_cache_tags([f"page:{self.pk}"])
 
         if placeholder and get_cms_setting("PLACEHOLDER_CACHE"):
             assert language, "language is required when clearing placeholder cache"
@@ -693,8 +699,9 @@ class Page(MP_Node):
                 placeholder_instance.clear_cache(language, site_id=self.site_id)
 
         if menu:
-            # Clears all menu caches for this page's site
-            menu_pool.clear(site_id=self.site_id)
+            # Clears all menu caches for this page's site and patches the
+            # menu index they are built from with this page's changes.
+            update_menu_index(self)
 
     def get_child_pages(self):
         return self.get_children().order_by("path")
@@ -707,7 +714,7 @@ class Page(MP_Node):
 
     def get_root(self):
         return self.__class__.objects.using(self._state.db).get(
-            path=self.path[0 : self.steplen]
+            path=get_path_prefixes(self.path, self.steplen)[0]
         )
 
     def get_parent_page(self):
@@ -865,7 +872,9 @@ class Page(MP_Node):
                     )
 
         # If no collision detected, proceed with the update
-        return page_urls_qs.update(**data)
+        updated = page_urls_qs.update(**data)
+        invalidate_page_url_cache(self.site_id)
+        return updated
 
     def update_urls_from_content(self, language):
         """Derive this page's :class:`~cms.models.pagemodel.PageUrl` for ``language``
@@ -893,6 +902,7 @@ class Page(MP_Node):
             if url is None or url.path is None:
                 return
             self.urls.filter(language=language).update(path=None)
+            invalidate_page_url_cache(self.site_id)
         else:
             data = self.get_url_data(content.slug, content.overwrite_url, language)
             path = data["path"]
@@ -1241,6 +1251,12 @@ class PageUrl(models.Model):
         if self.site_id is None:
             self.site_id = self.page.site_id
         super().save(*args, **kwargs)
+        invalidate_page_url_cache(self.site_id)
+
+    def delete(self, *args, **kwargs):
+        deleted = super().delete(*args, **kwargs)
+        invalidate_page_url_cache(self.site_id)
+        return deleted
 
     def get_absolute_url(self, language=None, fallback=True):
         if not language:
@@ -13,6 +13,7 @@ from cms.models.managers import (
     GlobalPagePermissionManager,
     PagePermissionManager,
 )
+from cms.utils.mptree import get_path_depth, get_path_prefixes
 
 # Cannot use contrib.auth.get_user_model() at compile time.
 user_app_name, user_model_name = settings.AUTH_USER_MODEL.rsplit('.', 1)
@@ -246,7 +247,8 @@ class PermissionTuple(tuple):
 
         :param path: The page path to check
         :type path: str
-        :param steplen: The step length used for path hierarchy (default: Page.steplen)
+        :param steplen: The step length used for path hierarchy (default: Page.steplen),
+            ``None`` for the fractional tree backend
         :type steplen: int
         :return: True if the path is contained within this permission's scope
         :rtype: bool
@@ -255,13 +257,13 @@ class PermissionTuple(tuple):
         if grant_on == ACCESS_PAGE:
             return path == perm_path
         elif grant_on == ACCESS_CHILDREN:
-            return path.startswith(perm_path) and len(path) == len(perm_path) + steplen
+            return path.startswith(perm_path) and get_path_depth(path, steplen) == get_path_depth(perm_path, steplen) + 1
         elif grant_on == ACCESS_DESCENDANTS:
             return path.startswith(perm_path) and len(path) > len(perm_path)
         elif grant_on == ACCESS_PAGE_AND_DESCENDANTS:
             return path.startswith(perm_path)
         elif grant_on == ACCESS_PAGE_AND_CHILDREN:
-            return path.startswith(perm_path) and len(path) <= len(perm_path) + steplen
+            return path.startswith(perm_path) and get_path_depth(path, steplen) <= get_path_depth(perm_path, steplen) + 1
         return False
 
     def allow_list(self, filter: str = "", steplen: int = Page.steplen) -> Q:
@@ -269,7 +271,8 @@ class PermissionTuple(tuple):
 
         :param filter: The field name prefix for the query filter (default: "")
         :type filter: str
-        :param steplen: The step length used for path hierarchy (default: Page.steplen)
+        :param steplen: The step length used for path hierarchy (default: Page.steplen),
+            ``None`` for the fractional tree backend
         :type steplen: int
         :return: A Q object representing the page filter for this permission's scope
         :rtype: Q
@@ -277,7 +280,7 @@ class PermissionTuple(tuple):
         if filter != "":
             filter = f"{filter}__"
         grant_on, path = self
-        depth = len(path) // steplen
+        depth = get_path_depth(path, steplen)
         if grant_on == ACCESS_PAGE:
             return Q(**{f"{filter}path": path})
         elif grant_on == ACCESS_CHILDREN:
@@ -291,6 +294,72 @@ class PermissionTuple(tuple):
         return Q()
 
 
+class PermissionTupleIndex:
+    """Index of permission tuples by their page path.
+
+    Finding the permission tuples containing a page path with
+    :meth:`PermissionTuple.contains` means checking every single tuple. The
+    index only looks up the tuples stored for the path itself and each of its
+    ancestors' paths, so a lookup is proportional to the depth of the page
+    instead of the number of tuples.
+
+    Each tuple can carry a value, e.g. the permission object it belongs to.
+    """
+    def __init__(self, permission_tuples=(), steplen: int = Page.steplen):
+        self.steplen = steplen
+        self._grants_by_path = {}
+
+        for permission_tuple in permission_tuples:
+            self.add(permission_tuple)
+
+    def __bool__(self):
+        return bool(self._grants_by_path)
+
+    def add(self, permission_tuple, value=None):
+        """Add a ``(grant_on, path)`` tuple with an optional value to the index."""
+        grant_on, path = permission_tuple
+        self._grants_by_path.setdefault(path, []).append((grant_on, value))
+
+    def _grant_contains(self, grant_on: int, levels: int) -> bool:
+        # «levels» is the depth of the checked page relative to the page
+        # the permission is granted on: 0 for the page itself, 1 for its
+        # children and so on. Mirrors PermissionTuple.contains().
+        if grant_on == ACCESS_PAGE:
+            return levels == 0
+        elif grant_on == ACCESS_CHILDREN:
+            return levels == 1
+        elif grant_on == ACCESS_DESCENDANTS:
+            return levels > 0
+        elif grant_on == ACCESS_PAGE_AND_DESCENDANTS:
+            return True
+        elif grant_on == ACCESS_PAGE_AND_CHILDREN:
+            return levels <= 1
+        return False
+
+    def get_values(self, path: str) -> list:
+        """Return the values of all permission tuples containing ``path``."""
+        values = []
+        prefixes = get_path_prefixes(path, self.steplen)
+        depth = len(prefixes)
+
+        for level, prefix in enumerate(prefixes, start=1):
+            grants = self._grants_by_path.get(prefix)
+            if grants:
+                values.extend(value for grant_on, value in grants if self._grant_contains(grant_on, depth - level))
+        return values
+
+    def contains(self, path: str) -> bool:
+        """Check if any of the permission tuples contains ``path``."""
+        prefixes = get_path_prefixes(path, self.steplen)
+        depth = len(prefixes)
+
+        for level, prefix in enumerate(prefixes, start=1):
+            grants = self._grants_by_path.get(prefix)
+            if grants and any(self._grant_contains(grant_on, depth - level) for grant_on, _ in grants):
+                return True
+        return False
+
+
 class PagePermission(AbstractPagePermission):
     """Page permissions for a single page
     """
@@ -11,7 +11,7 @@ from django.utils.encoding import force_str
 from django.utils.functional import lazy
 from django.utils.translation import gettext_lazy as _
 
-from cms.cache import invalidate_cms_page_cache
+from cms.cache import invalidate_cms_page_cache_tags
 from cms.cache.placeholder import clear_placeholder_cache
 from cms.constants import EXPIRE_NOW, MAX_EXPIRATION_TTL
 from cms.exceptions import LanguageError
@@ -370,8 +370,9 @@ class Placeholder(models.Model):
 
     def clear_cache(self, language, site_id=None):
         if get_cms_setting("PAGE_CACHE"):
-            # Clears all the page caches
-            invalidate_cms_page_cache()
+            # Clears the cached pages this placeholder has been rendered on.
+            # Falls back to clearing all the page caches, see CMS_PAGE_CACHE_TAGS.
+            invalidate_cms_page_cache_tags([f"placeholder:{self.pk}"])
 
         if not site_id and self.page:
             site_id = self.page.site_id
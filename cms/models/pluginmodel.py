@@ -179,6 +179,9 @@ class CMSPlugin(models.Model, metaclass=PluginModelBase):
     creation_date = models.DateTimeField(_("creation date"), editable=False, default=timezone.now)
     #: `django:django.db.models.DateTimeField`: Datetime the plugin was last changed
     changed_date = models.DateTimeField(auto_now=True)
+    #: Field values of the plugin model, used to render the plugin without
+    #: querying its table, see :setting:`CMS_PLUGIN_RENDER_PAYLOAD`
+    render_payload = models.JSONField(editable=False, null=True, blank=True)
     #: Request-scoped list of direct child plugin instances when rendering
     child_plugin_instances = None
     #: Request-scoped list of the plugin classes that may be added as children of this instance
@@ -202,6 +205,15 @@ class CMSPlugin(models.Model, metaclass=PluginModelBase):
     def __str__(self):
         return force_str(self.pk)
 
+    def save(self, *args, **kwargs):
+        if self.__class__._meta.concrete_model is not CMSPlugin:
+            self.render_payload = get_render_payload(self)
+            update_fields = kwargs.get("update_fields")
+
+            if update_fields is not None and "render_payload" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "render_payload"]
+        super().save(*args, **kwargs)
+
     def __repr__(self):
         display = f"<{self.__module__}.{self.__class__.__name__} id={self.pk} plugin_type='{self.plugin_type}' object at {hex(id(self))}>"
         return display
@@ -421,6 +433,19 @@ class CMSPlugin(models.Model, metaclass=PluginModelBase):
         """
         pass
 
+    @classmethod
+    def bulk_copy_relations(cls, plugin_pairs):
+        """
+        Called once per plugin model when plugins are copied, see
+        :func:`cms.utils.plugins.copy_plugins_to_placeholder`. By default, it calls
+        :meth:`copy_relations` for each pair. Override it to copy the relations of
+        all plugins with a few queries instead.
+
+        :param plugin_pairs: List of (new plugin, source plugin) tuples of this model
+        """
+        for new_plugin, old_plugin in plugin_pairs:
+            new_plugin.copy_relations(old_plugin)
+
     @classmethod
     def _get_related_objects(cls):
         fields = cls._meta._get_fields(
@@ -500,3 +525,72 @@ def get_plugin_media_path(instance, filename):
     and it invokes the bounded method on the given instance at runtime
     """
     return instance.get_media_path(filename)
+
+
+@cache
+def _get_render_payload_fields(plugin_model):
+    """
+    Returns the fields of «plugin_model» the render payload holds: those not
+    stored in the CMSPlugin table, except for the links between the tables,
+    which all hold the plugin's primary key. Returns None if the model has
+    fields whose value is only set while saving.
+    """
+    fields = [
+        field for field in plugin_model._meta.concrete_fields
+        if field.model is not CMSPlugin and not (field.remote_field and field.remote_field.parent_link)
+    ]
+    if any(getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False) for field in fields):
+        return None
+    return fields
+
+
+def get_render_payload(plugin):
+    """
+    Returns the render payload of the (downcasted) «plugin», or None if
+    CMS_PLUGIN_RENDER_PAYLOAD is disabled or the plugin model does not support it.
+    """
+    fields = _get_render_payload_fields(plugin.__class__._meta.concrete_model)
+
+    if fields is None or not get_cms_setting("PLUGIN_RENDER_PAYLOAD"):
+        return None
+
+    payload = {}
+    for field in fields:
+        value = field.value_from_object(plugin)
+        if value is None or isinstance(value, (bool, int, float, str)):
+            payload[field.attname] = value
+        else:
+            payload[field.attname] = field.value_to_string(plugin)
+    return payload
+
+
+def get_plugin_from_render_payload(plugin, plugin_model):
+    """
+    Returns an instance of «plugin_model» built from the CMSPlugin «plugin» and
+    its render payload, or None if the payload is missing or does not match the
+    model's fields (e.g., because the model changed since it was written).
+    """
+    payload = plugin.render_payload
+    fields = _get_render_payload_fields(plugin_model._meta.concrete_model)
+
+    if not payload or fields is None or payload.keys() != {field.attname for field in fields}:
+        return None
+
+    values = []
+    for field in plugin_model._meta.concrete_fields:
+        if field.model is CMSPlugin:
+            values.append(getattr(plugin, field.attname))
+        elif field.remote_field and field.remote_field.parent_link:
+            values.append(plugin.pk)
+        else:
+            value = payload[field.attname]
+            values.append(None if value is None else field.to_python(value))
+
+    instance = plugin_model.from_db(
+        plugin._state.db,
+        [field.attname for field in plugin_model._meta.concrete_fields],
+        values,
+    )
+    if "placeholder" in plugin._state.fields_cache:
+        instance._state.fields_cache["placeholder"] = plugin._state.fields_cache["placeholder"]
+    return instance
@@ -3,6 +3,7 @@ from collections import Counter
 
 from django.db import models
 from django.db.models import Case, F, When
+from django.db.models.query import ModelIterable
 
 from cms.exceptions import NoHomeFound
 from cms.utils.compat.warnings import RemovedInDjangoCMS60Warning
@@ -18,6 +19,58 @@ class PageQuerySet(get_queryset_base()):
     node_warning = ("As of django CMS 5.0 the Page model does not have a node property anymore. "
                     "Use the related fields directly.")
 
+    _with_hierarchy = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._with_hierarchy = self._with_hierarchy
+        return clone
+
+    def _fetch_all(self):
+        fetch_hierarchy = self._result_cache is None and self._with_hierarchy
+        super()._fetch_all()
+
+        if fetch_hierarchy and issubclass(self._iterable_class, ModelIterable):
+            self._set_ancestors(self._result_cache)
+
+    def _set_ancestors(self, pages):
+        pages_by_path = {page.path: page for page in pages}
+        paths = set().union(*(page.get_ancestor_paths() for page in pages))
+        missing = paths.difference(pages_by_path)
+
+        if missing:
+            # Ancestors are fetched in a single query, however deep the tree is
+            ancestors = self.model._base_manager.using(self.db).filter(path__in=missing)
+            pages_by_path.update((ancestor.path, ancestor) for ancestor in ancestors)
+
+        parent_field = self.model._meta.get_field("parent")
+
+        for page in pages_by_path.values():
+            # Nearest ancestor first, same as Page._set_hierarchy()
+            ancestor_paths = sorted(page.get_ancestor_paths(), key=len, reverse=True)
+            ancestors = [pages_by_path[path] for path in ancestor_paths if path in pages_by_path]
+
+            if len(ancestors) != len(ancestor_paths):
+                continue
+            page._ancestors = ancestors
+
+            if ancestors and ancestors[0].pk == page.parent_id:
+                parent_field.set_cached_value(page, ancestors[0])
+
+    def with_hierarchy(self):
+        """
+        Returns a queryset that loads the ancestors of its pages along with
+        them, in a single additional query however deep the pages are.
+
+        The parent of every page (and of every ancestor) is then available as
+        ``page.parent`` and the ancestors, nearest first, as
+        ``page.get_cached_ancestors()``, both without further queries. This
+        lets templates walk up the tree, for instance to render breadcrumbs.
+        """
+        clone = self._chain()
+        clone._with_hierarchy = True
+        return clone
+
     def delete(self, *args, **kwargs):
         if _USING_TREEBEARD:
             # treebeard's MP_NodeQuerySet.delete removes whole subtrees by path
@@ -315,6 +315,17 @@ class CMSPluginBase(admin.ModelAdmin, metaclass=CMSPluginBaseMetaclass):
         If you disable a plugin cache be sure to restart the server and clear the cache afterwards.
     """
 
+    cache_fragment = False
+    """Set to ``True`` to cache the rendered output of each instance of this plugin, including its children,
+    on its own. The fragment is reused even if the placeholder cannot be cached as a whole, e.g., because
+    one of the other plugins in the placeholder has ``cache = False``.
+
+    The cache key is derived from the pk and ``changed_date`` of the plugin and its descendants, the
+    language and the request headers returned by :meth:`get_vary_cache_on`. The fragment expires according
+    to :meth:`get_cache_expiration`. It is not cached if the plugin or one of its descendants is not
+    cacheable. Only enable it for plugins whose output solely depends on these values.
+    """
+
     #: This flag is used to determine whether a plugin is considered a “system” (internal) plugin — meaning,
     #: it is used by the cms itself to structure content or placeholders,
     #: not meant to be added, edited, or deleted directly by end users in the admin or frontend editor.
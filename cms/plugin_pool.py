@@ -10,13 +10,14 @@ from django.template.defaultfilters import slugify
 from django.urls import URLResolver, include, re_path
 from django.utils.encoding import force_str
 from django.utils.functional import cached_property, lazy
-from django.utils.module_loading import autodiscover_modules
+from django.utils.module_loading import autodiscover_modules, import_string
 from django.utils.translation import activate, deactivate_all, get_language
 
 from cms.exceptions import PluginAlreadyRegistered, PluginNotRegistered
 from cms.models import Page
 from cms.models.placeholdermodel import Placeholder
 from cms.plugin_base import CMSPluginBase
+from cms.utils.conf import get_cms_setting
 from cms.utils.helpers import normalize_name
 
 _GLOB_CHARS = ("*", "?", "[")
@@ -48,6 +49,7 @@ class PluginPool:
         self.global_restrictions_cache = defaultdict(dict)
         self.get_all_plugins_for_model.cache_clear()
         self.expand_plugin_patterns.cache_clear()
+        self._get_processors.cache_clear()
         if "registered_plugins" in self.__dict__:
             del self.__dict__["registered_plugins"]
         if "plugins_with_extra_menu" in self.__dict__:
@@ -319,6 +321,36 @@ class PluginPool:
 
         return url_patterns
 
+    @lru_cache  # noqa: B019
+    def _get_processors(self, paths: tuple[str, ...], plugin_type: str) -> tuple:
+        processors = []
+        for path in paths:
+            processor = import_string(path)
+            plugin_types = getattr(processor, "plugin_types", None)
+            if plugin_types is None or plugin_type in self.expand_plugin_patterns(tuple(plugin_types)):
+                processors.append(processor)
+        return tuple(processors)
+
+    def get_plugin_processors(self, plugin_type: str) -> tuple:
+        """
+        Return the plugin processors of :setting:`CMS_PLUGIN_PROCESSORS` that apply to
+        plugins of the given type.
+
+        A processor applies to all plugins, unless it has a ``plugin_types`` attribute
+        listing the names of the plugins it applies to (glob patterns allowed).
+
+        The processors are imported once per plugin type and list of processors, so a
+        change of the setting takes effect right away.
+        """
+        return self._get_processors(tuple(get_cms_setting("PLUGIN_PROCESSORS")), plugin_type)
+
+    def get_plugin_context_processors(self, plugin_type: str) -> tuple:
+        """
+        Return the plugin context processors of :setting:`CMS_PLUGIN_CONTEXT_PROCESSORS`
+        that apply to plugins of the given type, see :meth:`get_plugin_processors`.
+        """
+        return self._get_processors(tuple(get_cms_setting("PLUGIN_CONTEXT_PROCESSORS")), plugin_type)
+
     def get_system_plugins(self) -> list[str]:
         return [plugin.__name__ for plugin in self.plugins.values() if plugin.system]
 
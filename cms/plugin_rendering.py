@@ -14,12 +14,20 @@ from django.http import HttpRequest
 from django.template import Context
 from django.utils.functional import cached_property
 from django.utils.html import format_html
-from django.utils.module_loading import import_string
 from django.utils.safestring import SafeText, mark_safe
 from django.utils.translation import get_language, override
 from django.views.debug import ExceptionReporter
 
-from cms.cache.placeholder import get_placeholder_cache, set_placeholder_cache
+from cms.cache.placeholder import (
+    get_placeholder_cache,
+    get_placeholder_caches,
+    set_placeholder_cache,
+)
+from cms.cache.plugin import (
+    get_plugin_fragment_cache,
+    get_plugin_fragment_cache_params,
+    set_plugin_fragment_cache,
+)
 from cms.exceptions import PlaceholderNotFound
 from cms.models import CMSPlugin, Page, PageContent, Placeholder
 from cms.plugin_pool import PluginPool
@@ -493,6 +501,28 @@ class ContentRenderer(BaseRenderer):
         if not instance or not plugin.render_plugin:
             return ""
 
+        if not editable and plugin.cache_fragment and self.placeholder_cache_is_enabled():
+            cache_params = get_plugin_fragment_cache_params(
+                instance,
+                placeholder,
+                lang=instance.language,
+                site_id=self.current_site.pk,
+                request=self.request,
+            )
+        else:
+            cache_params = None
+
+        if cache_params:
+            cached_value = get_plugin_fragment_cache(cache_params[0])
+
+            if cached_value is not None:
+                restore_sekizai_context(context, cached_value["sekizai"])
+                return mark_safe(cached_value["content"])
+
+            from sekizai.helpers import Watcher
+
+            watcher = Watcher(context)
+
         # we'd better pass a flat dict to template.render
         # as plugin.render can return pretty much any kind of context / dictionary
         # we'd better flatten it and force to a Context object
@@ -506,10 +536,12 @@ class ContentRenderer(BaseRenderer):
         template = self.templates.get_cached_template(template_name)
         content = template.render(context)
 
-        for path in get_cms_setting("PLUGIN_PROCESSORS"):
-            processor = import_string(path)
+        for processor in self.plugin_pool.get_plugin_processors(instance.plugin_type):
             content = processor(instance, placeholder, content, context)
 
+        if cache_params:
+            set_plugin_fragment_cache(*cache_params, content=content, sekizai=watcher.get_changes())
+
         if editable:
             is_slot = getattr(plugin, "is_slot", False)
             content = self.plugin_edit_template.format(
@@ -607,6 +639,25 @@ class ContentRenderer(BaseRenderer):
                 language_cache[placeholder.pk] = cached_value
         return language_cache.get(placeholder.pk)
 
+    def _preload_cached_placeholder_content(self, placeholders, language):
+        """
+        Fetches the cached content of all given placeholders in one batch
+        and stores it in the per-renderer placeholder content cache.
+        """
+        site_id = self.current_site.pk
+        language_cache = self._placeholders_content_cache.setdefault(site_id, {}).setdefault(language, {})
+        placeholders_to_fetch = [placeholder for placeholder in placeholders if placeholder.pk not in language_cache]
+
+        if placeholders_to_fetch:
+            language_cache.update(
+                get_placeholder_caches(
+                    placeholders_to_fetch,
+                    lang=language,
+                    site_id=site_id,
+                    request=self.request,
+                )
+            )
+
     def _get_content_object(self, page, slots=None):
         toolbar_obj = self.toolbar.get_object()
         if isinstance(toolbar_obj, PageContent) and toolbar_obj.page == page:
@@ -654,13 +705,17 @@ class ContentRenderer(BaseRenderer):
             slots_w_inheritance = []
 
         if self.placeholder_cache_is_enabled():
-            _cached_content = self._get_cached_placeholder_content
+            placeholders = list(placeholders)
+            # Look up the cached content of all placeholders at once
+            # instead of hitting the cache backend per placeholder.
+            self._preload_cached_placeholder_content(placeholders, language)
+            _cached_content = self._placeholders_content_cache[self.current_site.pk][language]
             # Only prefetch plugins if the placeholder
             # has not been cached.
             placeholders_to_fetch = [
                 placeholder
                 for placeholder in placeholders
-                if _cached_content(placeholder, language) is None
+                if _cached_content.get(placeholder.pk) is None
             ]
         else:
             # cache is disabled, prefetch plugins for all
@@ -791,8 +846,9 @@ class PluginContext(Context):
         if not processors:
             processors = []
 
-        for path in get_cms_setting("PLUGIN_CONTEXT_PROCESSORS"):
-            processor = import_string(path)
+        import cms.plugin_pool
+
+        for processor in cms.plugin_pool.plugin_pool.get_plugin_context_processors(instance.plugin_type):
             self.update(processor(instance, placeholder, self))
         for processor in processors:
             self.update(processor(instance, placeholder, self))
@@ -106,3 +106,15 @@ class SekizaiPlugin(CMSPluginBase):
     def render(self, context, instance, placeholder):
         context['now'] = datetime.now().microsecond
         return context
+
+
+class FragmentCachePlugin(CMSPluginBase):
+    name = 'FragmentCache'
+    module = 'Test'
+    render_plugin = True
+    cache_fragment = True
+    render_template = "plugins/sekizai.html"
+
+    def render(self, context, instance, placeholder):
+        context['now'] = datetime.now().microsecond
+        return context
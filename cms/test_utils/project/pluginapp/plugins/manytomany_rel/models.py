@@ -28,6 +28,15 @@ class ArticlePluginModel(CMSPlugin):
     def copy_relations(self, oldinstance):
         self.sections.set(oldinstance.sections.all())
 
+    @classmethod
+    def bulk_copy_relations(cls, plugin_pairs):
+        new_plugin_ids = {old_plugin.pk: new_plugin.pk for new_plugin, old_plugin in plugin_pairs}
+        through = cls.sections.through
+        through.objects.bulk_create(
+            through(articlepluginmodel_id=new_plugin_ids[relation.articlepluginmodel_id], section_id=relation.section_id)
+            for relation in through.objects.filter(articlepluginmodel_id__in=new_plugin_ids)
+        )
+
 
 class FKModel(models.Model):
     fk_field = models.ForeignKey('PluginModelWithFKFromModel', on_delete=models.CASCADE)
@@ -0,0 +1,322 @@
+"""
+Benchmarks the page tree operations of every tree backend.
+
+Synthetic page trees of a few shapes are built for each ``CMS_TREE_BACKEND``
+and the tree operations are timed on them:
+
+* ``add``: :meth:`Page.add_to_tree` as first and last child
+* ``move``: :meth:`Page.move_page` in every position
+* ``copy``: :meth:`Page.copy_with_descendants`
+* ``delete``: :meth:`Page.delete`
+* ``rebuild``: :meth:`Page.fix_tree`
+
+The pages have no content, so the timings are those of the tree itself. Every
+run is rolled back, so each one starts from the same tree. The backend of the
+``Page`` model is chosen when it is imported, so every backend is benchmarked
+in its own process against a fresh test database.
+
+Run it from the repository root::
+
+    python -m cms.test_utils.tree_benchmark --output tree-benchmark.json
+
+Set ``DATABASE_URL`` (or pass ``--database-url``) to benchmark another
+database, for instance a local PostgreSQL::
+
+    python -m cms.test_utils.tree_benchmark --database-url postgres://localhost/cms
+
+The results are written as JSON, together with the versions of django CMS,
+Django and Python. There is an entry per backend, shape, operation and
+position with the time of every run in seconds and the number of queries, so
+they can be compared across releases.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+BACKENDS = ("treebeard", "mptree", "fractional")
+
+SHAPES = ("wide", "deep", "mixed")
+
+ADD_POSITIONS = ("first-child", "last-child")
+
+MOVE_POSITIONS = ("first-child", "last-child", "left", "right")
+
+# Length of the page chains of the "deep" shape. Deep enough to make paths
+# long, shallow enough for the path column of every backend.
+DEEP_CHAIN_LENGTH = 40
+
+# Children per page of the "mixed" shape
+MIXED_FANOUT = 5
+
+
+def _get_wide_shape(size):
+    """A single root with all other pages as its children."""
+    parents = [None] + [0] * (size - 1)
+    return parents, size // 3, 2 * size // 3
+
+
+def _get_deep_shape(size):
+    """Chains of DEEP_CHAIN_LENGTH pages, each under its own root."""
+    size = max(size, 2 * DEEP_CHAIN_LENGTH)
+    parents = [None if index % DEEP_CHAIN_LENGTH == 0 else index - 1 for index in range(size)]
+    last_chain = (size // DEEP_CHAIN_LENGTH - 1) * DEEP_CHAIN_LENGTH
+    return parents, DEEP_CHAIN_LENGTH // 2, last_chain + DEEP_CHAIN_LENGTH // 4
+
+
+def _get_mixed_shape(size):
+    """A balanced tree, MIXED_FANOUT children per page."""
+    parents = [None] + [(index - 1) // MIXED_FANOUT for index in range(1, size)]
+    return parents, 1, MIXED_FANOUT
+
+
+def get_shape(name, size):
+    """
+    Returns a tuple of (parents, subject, target) for the named shape:
+    ``parents[index]`` is the index of the parent of the page at «index», or
+    None for a root. Parents always precede their children. «subject» is the
+    page that gets moved, copied and deleted, «target» the page it is moved or
+    copied to. They are in different branches of the tree.
+    """
+    return {
+        "wide": _get_wide_shape,
+        "deep": _get_deep_shape,
+        "mixed": _get_mixed_shape,
+    }[name](size)
+
+
+def build_tree(parents, site):
+    """
+    Bulk creates the pages of a tree and returns them in the order of
+    «parents». The paths are encoded the way treebeard does, which the mptree
+    backend shares; the fractional backend rewrites them with a rebuild.
+    """
+    from cms.models import Page
+    from cms.utils.mptree import MaterializedPath, get_tree_backend
+
+    encoder = MaterializedPath(Page)
+    pages = [None] * len(parents)
+    numchild = [0] * len(parents)
+    roots = 0
+    levels = []
+
+    for index, parent in enumerate(parents):
+        if parent is None:
+            roots += 1
+            path, depth = encoder.segment(roots), 1
+        else:
+            numchild[parent] += 1
+            path, depth = pages[parent].path + encoder.segment(numchild[parent]), pages[parent].depth + 1
+
+        if depth > len(levels):
+            levels.append([])
+        pages[index] = Page(site=site, path=path, depth=depth, created_by="benchmark", changed_by="benchmark")
+        levels[depth - 1].append(index)
+
+    for level in levels:
+        for index in level:
+            pages[index].numchild = numchild[index]
+
+            if parents[index] is not None:
+                pages[index].parent = pages[parents[index]]
+        Page.objects.bulk_create([pages[index] for index in level], batch_size=500)
+
+    if get_tree_backend() == "fractional":
+        Page.fix_tree()
+    return pages
+
+
+def _time(operation, repeat):
+    """
+    Runs «operation» «repeat» times, each in a transaction that is rolled
+    back, and returns the time of every run and the queries of the last one.
+    «operation» is called with no arguments and returns the callable to time,
+    so it can fetch what it needs without being timed.
+    """
+    from django.db import connection, transaction
+    from django.test.utils import CaptureQueriesContext
+
+    seconds = []
+    queries = 0
+
+    for _ in range(repeat):
+        with transaction.atomic():
+            timed = operation()
+
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                timed()
+                seconds.append(time.perf_counter() - start)
+            queries = len(captured)
+            transaction.set_rollback(True)
+    return seconds, queries
+
+
+def benchmark_shape(shape, size, repeat, user):
+    """
+    Returns the results of all operations on a tree of the given «shape».
+    """
+    from django.contrib.sites.models import Site
+
+    from cms.models import Page
+
+    parents, subject_index, target_index = get_shape(shape, size)
+    pages = build_tree(parents, Site.objects.get_current())
+    subject_pk, target_pk = pages[subject_index].pk, pages[target_index].pk
+    results = []
+
+    def add(position):
+        def operation():
+            target = Page.objects.get(pk=target_pk)
+            page = Page(site=target.site, parent=target, created_by="benchmark", changed_by="benchmark")
+            return lambda: page.add_to_tree(position=position)
+        return operation
+
+    def move(position):
+        def operation():
+            subject, target = Page.objects.get(pk=subject_pk), Page.objects.get(pk=target_pk)
+            return lambda: subject.move_page(target, position=position)
+        return operation
+
+    def copy():
+        subject, target = Page.objects.get(pk=subject_pk), Page.objects.get(pk=target_pk)
+        return lambda: subject.copy_with_descendants(target_page=target, position="last-child", user=user)
+
+    def delete():
+        subject = Page.objects.get(pk=subject_pk)
+        return subject.delete
+
+    def rebuild():
+        return Page.fix_tree
+
+    operations = [("add", position, add(position)) for position in ADD_POSITIONS]
+    operations += [("move", position, move(position)) for position in MOVE_POSITIONS]
+    operations += [("copy", "last-child", copy), ("delete", None, delete), ("rebuild", None, rebuild)]
+    subtree_size = Page.objects.get(pk=subject_pk).get_descendants().count() + 1
+
+    for name, position, operation in operations:
+        seconds, queries = _time(operation, repeat)
+        results.append({
+            "shape": shape,
+            "pages": len(parents),
+            "subtree": subtree_size,
+            "operation": name,
+            "position": position,
+            "seconds": seconds,
+            "min": min(seconds),
+            "median": statistics.median(seconds),
+            "queries": queries,
+        })
+        print(
+            f"{shape:>6} {name:>8} {position or '':>11}  {min(seconds) * 1000:9.1f} ms  {queries:5} queries",
+            file=sys.stderr,
+        )
+    Page.objects.all().delete()
+    return results
+
+
+def run_backend(shapes, size, repeat):
+    """
+    Benchmarks the backend of this process and returns the results.
+    """
+    import django
+
+    django.setup()
+
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test.utils import setup_databases, teardown_databases
+
+    from cms.utils.mptree import get_tree_backend
+
+    backend = get_tree_backend()
+    print(f"Benchmarking the {backend} backend on {connection.vendor}", file=sys.stderr)
+    old_config = setup_databases(verbosity=0, interactive=False)
+
+    try:
+        user = get_user_model().objects.create_superuser("benchmark", "benchmark@example.com", "benchmark")
+        results = []
+
+        for shape in shapes:
+            results.extend(benchmark_shape(shape, size, repeat, user))
+        vendor = connection.vendor
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+    for result in results:
+        result.update(backend=backend, database=vendor)
+    return results
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description="Benchmarks the page tree operations of every tree backend.")
+    parser.add_argument("--backend", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--shape", nargs="+", choices=SHAPES, default=SHAPES)
+    parser.add_argument("--size", type=int, default=2000, help="number of pages per tree (default: 2000)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs per operation (default: 3)")
+    parser.add_argument("--database-url", help="dj-database-url compatible database, overrides DATABASE_URL")
+    parser.add_argument("--output", help="file to write the results to (default: standard output)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    options = get_parser().parse_args(argv)
+
+    if options.worker:
+        results = run_backend(options.shape, options.size, options.repeat)
+        json.dump(results, sys.stdout)
+        return
+
+    env = dict(os.environ)
+    env.setdefault("DJANGO_SETTINGS_MODULE", "cms.tests.settings")
+
+    if options.database_url:
+        env["DATABASE_URL"] = options.database_url
+
+    results = []
+
+    for backend in options.backend:
+        command = [
+            sys.executable, "-m", __spec__.name, "--worker",
+            "--shape", *options.shape,
+            "--size", str(options.size),
+            "--repeat", str(options.repeat),
+        ]
+        output = subprocess.run(
+            command,
+            env=dict(env, CMS_TREE_BACKEND=backend),
+            stdout=subprocess.PIPE,
+            check=True,
+            text=True,
+        ).stdout
+        results.extend(json.loads(output))
+
+    import django
+
+    import cms
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "cms": cms.__version__,
+        "django": django.get_version(),
+        "python": platform.python_version(),
+        "size": options.size,
+        "repeat": options.repeat,
+        "results": results,
+    }
+
+    if options.output:
+        with open(options.output, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
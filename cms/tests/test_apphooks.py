@@ -25,7 +25,13 @@ from cms.admin.forms import AdvancedSettingsForm
 from cms.api import create_page, create_page_content
 from cms.app_base import CMSApp
 from cms.apphook_pool import apphook_pool
-from cms.appresolver import applications_page_check, clear_app_resolvers, get_app_patterns
+from cms.appresolver import (
+    applications_page_check,
+    clear_app_resolvers,
+    get_app_patterns,
+    get_app_resolvers_for_path,
+)
+from cms.cache.page_url import clear_local_page_url_cache
 from cms.middleware.page import get_page
 from cms.models import PageContent
 from cms.test_utils.project.placeholderapp.models import Example1
@@ -328,6 +334,32 @@ class ApphooksTestCase(BaseApphooksTestCase):
         self.assertContains(response, de_title.title)
         self.apphook_clear()
 
+    @override_settings(
+        ROOT_URLCONF='cms.test_utils.project.second_urls_for_apphook_tests',
+        CMS_PAGE_URL_CACHE=True,
+    )
+    def test_get_page_for_apphook_from_index(self):
+        en_title, de_title = self.create_base_structure(APP_NAME, ['en', 'de'])
+        page = en_title.page
+        page_path = page.get_path("en")
+        self.addCleanup(clear_local_page_url_cache)
+
+        with force_language("en"):
+            path = reverse('sample-settings')
+            request = self.get_request(path)
+            # Build the resolvers and warm up the page url cache
+            applications_page_check(request)
+            resolvers = get_app_resolvers_for_path(f"{page_path}/settings/", "en")
+
+            with self.assertNumQueries(0):
+                attached_to_page = applications_page_check(request)
+        self.assertEqual(attached_to_page.pk, page.pk)
+        self.assertEqual([mount_path for _, mount_path in resolvers], [page_path])
+        self.assertEqual(resolvers[0][0].page_id, page.pk)
+        self.assertEqual(get_app_resolvers_for_path("other/settings/", "en"), [])
+        self.assertEqual(get_app_resolvers_for_path(f"{page_path}/settings/", "fr"), [])
+        self.apphook_clear()
+
     @override_settings(ROOT_URLCONF='cms.test_utils.project.second_urls_for_apphook_tests')
     def test_apphook_permissions(self):
         en_title, de_title = self.create_base_structure(APP_NAME, ['en', 'de'])
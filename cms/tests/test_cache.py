@@ -1,8 +1,10 @@
 import time
+from unittest.mock import patch
 
 from django.conf import settings
 from django.template import Context
 from sekizai.context import SekizaiContext
+from sekizai.helpers import get_varname
 
 from cms.api import add_plugin, create_page, create_page_content
 from cms.cache import invalidate_cms_page_cache
@@ -12,8 +14,10 @@ from cms.cache.page import (
     _page_vary_headers_cache_key,
     _vary_on_hash,
     get_page_cache,
+    get_page_cache_response,
     get_page_url_cache,
     get_xframe_cache,
+    release_page_cache_lock,
     set_page_url_cache,
     set_xframe_cache,
 )
@@ -24,14 +28,16 @@ from cms.cache.placeholder import (
     _set_placeholder_cache_version,
     clear_placeholder_cache,
     get_placeholder_cache,
+    get_placeholder_caches,
     set_placeholder_cache,
 )
 from cms.exceptions import PluginAlreadyRegistered
-from cms.models import Page
+from cms.models import Page, Placeholder
 from cms.plugin_pool import plugin_pool
 from cms.test_utils.project.placeholderapp.models import Example1
 from cms.test_utils.project.pluginapp.plugins.caching.cms_plugins import (
     DateTimeCacheExpirationPlugin,
+    FragmentCachePlugin,
     LegacyCachePlugin,
     NoCachePlugin,
     SekizaiPlugin,
@@ -667,6 +673,49 @@ class CacheTestCase(CMSTestCase):
         text = content_renderer.render_placeholder(ph1, context)
         self.assertEqual(text, "Other text")
 
+    def test_plugin_fragment_cache(self):
+        """
+        A plugin with cache_fragment = True is served from its own cache even
+        if the placeholder can't be cached because of another plugin.
+        """
+        ex = Example1(char_1="one", char_2="two", char_3="tree", char_4="four")
+        ex.save()
+        placeholder = ex.placeholder
+        plugin_pool.register_plugin(NoCachePlugin)
+        plugin_pool.register_plugin(FragmentCachePlugin)
+        self.addCleanup(plugin_pool.unregister_plugin, NoCachePlugin)
+        self.addCleanup(plugin_pool.unregister_plugin, FragmentCachePlugin)
+        fragment_plugin = add_plugin(placeholder, "FragmentCachePlugin", "en")
+        add_plugin(placeholder, "NoCachePlugin", "en")
+
+        def render():
+            context = SekizaiContext()
+            context["request"] = self.get_request()
+            renderer = self.get_content_renderer(context["request"])
+            content = renderer.render_placeholder(Placeholder.objects.get(pk=placeholder.pk), context)
+            # $$$<fragment>$$$ ... $$$<no cache>$$$
+            parts = content.split("$$$")
+            return parts[1], parts[3], list(context[get_varname()]["js"])
+
+        fragment1, no_cache1, js1 = render()
+        time.sleep(0.001)
+        fragment2, no_cache2, js2 = render()
+        self.assertNotEqual(no_cache1, no_cache2)
+        self.assertEqual(fragment1, fragment2)
+        # The sekizai data of the fragment is restored from the cache
+        self.assertEqual(js1, js2)
+        self.assertIn(f"alert('{fragment1}')", "".join(js2))
+
+        # Saving the plugin changes its cache key
+        time.sleep(0.001)
+        fragment_plugin.save()
+        fragment3, _, _ = render()
+        self.assertNotEqual(fragment1, fragment3)
+
+        with self.settings(CMS_PLUGIN_CACHE=False):
+            fragment4, _, _ = render()
+        self.assertNotEqual(fragment3, fragment4)
+
 
 class PlaceholderCacheTestCase(CMSTestCase):
     def setUp(self):
@@ -846,6 +895,49 @@ class PlaceholderCacheTestCase(CMSTestCase):
         )
         self.assertNotEqual(cached_en_us_content, cached_en_uk_content)
 
+    def test_get_placeholder_caches(self):
+        from django.core.cache import cache
+
+        placeholder_en_2 = self.page.get_placeholders("en").get(slot="right-column")
+        set_placeholder_cache(self.placeholder_en, "en", 1, {"content": "English"}, self.en_request)
+
+        with patch.object(cache, "get_many", wraps=cache.get_many) as cache_get_many:
+            cached = get_placeholder_caches([self.placeholder_en, placeholder_en_2], "en", 1, self.en_request)
+
+        # One round trip for the versions, one for the content
+        self.assertEqual(cache_get_many.call_count, 2)
+        self.assertEqual(cached, {self.placeholder_en.pk: {"content": "English"}})
+        self.assertEqual(
+            cached[self.placeholder_en.pk],
+            get_placeholder_cache(self.placeholder_en, "en", 1, self.en_request),
+        )
+
+        # Varying headers are respected
+        cached = get_placeholder_caches([self.placeholder_en], "en", 1, self.en_us_request)
+        self.assertEqual(cached, {})
+
+    def test_preload_placeholders_batches_cache_lookups(self):
+        from django.core.cache import cache
+
+        request = self.get_request("/en/")
+        request.current_page = self.page
+        renderer = self.get_content_renderer(request)
+        placeholders = list(self.page.get_placeholders("en"))
+
+        for placeholder in placeholders:
+            set_placeholder_cache(placeholder, "en", 1, {"content": placeholder.slot}, request)
+
+        with patch("cms.plugin_rendering.get_placeholder_cache") as get_placeholder_cache_mock, \
+                patch.object(cache, "get_many", wraps=cache.get_many) as cache_get_many:
+            renderer._preload_placeholders_for_page(self.page, language="en")
+
+        self.assertEqual(cache_get_many.call_count, 2)
+        get_placeholder_cache_mock.assert_not_called()
+        self.assertEqual(
+            renderer._placeholders_content_cache[1]["en"],
+            {placeholder.pk: {"content": placeholder.slot} for placeholder in placeholders},
+        )
+
     def test_set_get_placeholder_cache_with_long_prefix(self):
         """
         This is for testing that everything continues to work even when the
@@ -1025,6 +1117,279 @@ class PageCacheRoundTripTestCase(CMSTestCase):
             self.assertIsNotNone(expires_datetime)
 
 
+class PageCacheMiddlewareTestCase(CMSTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        super().setUp()
+        cache.clear()
+        exclude = [
+            "django.middleware.cache.UpdateCacheMiddleware",
+            "django.middleware.cache.FetchFromCacheMiddleware",
+        ]
+        middleware = [mw for mw in settings.MIDDLEWARE if mw not in exclude]
+        middleware.insert(
+            middleware.index("django.middleware.locale.LocaleMiddleware") + 1,
+            "cms.middleware.cache.PageCacheMiddleware",
+        )
+        middleware.append("django.middleware.clickjacking.XFrameOptionsMiddleware")
+        self.middleware = middleware
+
+    def tearDown(self):
+        from django.core.cache import cache
+
+        super().tearDown()
+        cache.clear()
+
+    def test_cached_page_is_served_before_url_resolution(self):
+        with self.settings(MIDDLEWARE=self.middleware):
+            page = create_page("cached page", "nav_playground.html", "en")
+            placeholder = page.get_placeholders("en").get(slot="body")
+            add_plugin(placeholder, "TextPlugin", "en", body="Cached body")
+            page_url = page.get_absolute_url()
+
+            # Prime the cache
+            response = self.client.get(page_url)
+            self.assertEqual(response.status_code, 200)
+
+            with patch("cms.middleware.toolbar.ToolbarMiddleware.process_request") as process_request, \
+                    patch("django.urls.resolvers.URLResolver.resolve") as resolve:
+                with self.assertNumQueries(0):
+                    response = self.client.get(page_url)
+            process_request.assert_not_called()
+            resolve.assert_not_called()
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, "Cached body")
+            self.assertIn("max-age", response["Cache-Control"])
+
+    def test_authenticated_requests_are_not_served_from_cache(self):
+        with self.settings(MIDDLEWARE=self.middleware):
+            page = create_page("cached page", "nav_playground.html", "en")
+            page_url = page.get_absolute_url()
+            self.client.get(page_url)
+
+            with self.login_user_context(self.get_superuser()):
+                with patch(
+                    "cms.middleware.toolbar.ToolbarMiddleware.process_request",
+                    return_value=None,
+                ) as process_request:
+                    self.client.get(page_url)
+            process_request.assert_called_once()
+
+    def test_cached_page_honours_vary_on(self):
+        try:
+            plugin_pool.register_plugin(VaryCacheOnPlugin)
+        except PluginAlreadyRegistered:
+            pass
+        self.addCleanup(plugin_pool.unregister_plugin, VaryCacheOnPlugin)
+
+        with self.settings(MIDDLEWARE=self.middleware):
+            page = create_page("vary page", "nav_playground.html", "en")
+            placeholder = page.get_placeholders("en").get(slot="body")
+            add_plugin(placeholder, "VaryCacheOnPlugin", "en")
+            url = page.get_absolute_url()
+
+            self.assertContains(self.client.get(url, headers={"country-code": "US"}), "$$$US$$$")
+            response_fr = self.client.get(url, headers={"country-code": "FR"})
+            self.assertContains(response_fr, "$$$FR$$$")
+            self.assertNotContains(response_fr, "$$$US$$$")
+
+            with self.assertNumQueries(0):
+                response_us = self.client.get(url, headers={"country-code": "US"})
+            self.assertContains(response_us, "$$$US$$$")
+
+    def test_cached_page_honours_xframe_options(self):
+        from cms import constants
+
+        with self.settings(MIDDLEWARE=self.middleware, X_FRAME_OPTIONS="DENY"):
+            inherit_page = create_page("inherit", "nav_playground.html", "en")
+            allow_page = create_page(
+                "allow", "nav_playground.html", "en", xframe_options=constants.X_FRAME_OPTIONS_ALLOW
+            )
+
+            for page, expected in ((inherit_page, "DENY"), (allow_page, None)):
+                url = page.get_absolute_url()
+                self.assertEqual(self.client.get(url).get("X-Frame-Options"), expected)
+
+                with self.assertNumQueries(0):
+                    response = self.client.get(url)
+                self.assertEqual(response.get("X-Frame-Options"), expected)
+
+
+class PageCacheStaleWhileRevalidateTestCase(CMSTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        super().setUp()
+        cache.clear()
+        exclude = [
+            "django.middleware.cache.UpdateCacheMiddleware",
+            "django.middleware.cache.FetchFromCacheMiddleware",
+        ]
+        self.overrides = {
+            "MIDDLEWARE": [mw for mw in settings.MIDDLEWARE if mw not in exclude],
+            "CMS_PAGE_CACHE_STALE_WHILE_REVALIDATE": True,
+        }
+
+    def tearDown(self):
+        from django.core.cache import cache
+
+        super().tearDown()
+        cache.clear()
+
+    def test_stale_page_is_served_while_another_request_renders(self):
+        with self.settings(**self.overrides):
+            page = create_page("swr page", "nav_playground.html", "en")
+            placeholder = page.get_placeholders("en").get(slot="body")
+            plugin = add_plugin(placeholder, "TextPlugin", "en", body="Old content")
+            page_url = page.get_absolute_url()
+
+            self.assertContains(self.client.get(page_url), "Old content")
+
+            plugin.body = "New content"
+            plugin.save()
+            placeholder.clear_cache("en")
+
+            # The first request after the invalidation gets to render the page
+            rendering_request = self.get_request(page_url, language="en")
+            self.assertIsNone(get_page_cache_response(rendering_request))
+            self.assertTrue(rendering_request._cms_page_cache_lock)
+
+            # Everybody else is served the previous version in the meantime
+            with self.assertNumQueries(0):
+                response = self.client.get(page_url)
+            self.assertContains(response, "Old content")
+
+            release_page_cache_lock(rendering_request)
+
+            response = self.client.get(page_url)
+            self.assertContains(response, "New content")
+
+            # The lock has been released after rendering, the fresh page is cached
+            request = self.get_request(page_url, language="en")
+            response = get_page_cache_response(request)
+            self.assertContains(response, "New content")
+            self.assertIsNone(getattr(request, "_cms_page_cache_lock", None))
+
+    def test_cold_page_waits_for_lock_holder(self):
+        with self.settings(**self.overrides):
+            page = create_page("swr page", "nav_playground.html", "en")
+            page_url = page.get_absolute_url()
+            self.client.get(page_url)
+            # Neither the current nor the previous version of the page is left
+            invalidate_cms_page_cache()
+            invalidate_cms_page_cache()
+
+            rendering_request = self.get_request(page_url, language="en")
+            self.assertIsNone(get_page_cache_response(rendering_request))
+
+            def finish_rendering(seconds):
+                # The lock holder gives up without caching the page
+                release_page_cache_lock(rendering_request)
+
+            with patch("cms.cache.page.time.sleep", side_effect=finish_rendering) as sleep:
+                request = self.get_request(page_url, language="en")
+                self.assertIsNone(get_page_cache_response(request))
+            # The waiting request stopped waiting as soon as the lock was gone
+            sleep.assert_called_once()
+            self.assertIsNone(getattr(request, "_cms_page_cache_lock", None))
+
+    def test_uncached_url_does_not_lock(self):
+        with self.settings(**self.overrides):
+            create_page("swr page", "nav_playground.html", "en")
+            first_request = self.get_request("/en/does-not-exist/", language="en")
+            second_request = self.get_request("/en/does-not-exist/", language="en")
+
+            with patch("cms.cache.page.time.sleep") as sleep:
+                # Both requests are in flight at the same time
+                self.assertIsNone(get_page_cache_response(first_request))
+                self.assertIsNone(get_page_cache_response(second_request))
+            sleep.assert_not_called()
+            self.assertIsNone(getattr(first_request, "_cms_page_cache_lock", None))
+            self.assertIsNone(getattr(second_request, "_cms_page_cache_lock", None))
+            self.assertEqual(self.client.get("/en/does-not-exist/").status_code, 404)
+
+
+class PageCacheTagsTestCase(CMSTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        super().setUp()
+        cache.clear()
+        exclude = [
+            "django.middleware.cache.UpdateCacheMiddleware",
+            "django.middleware.cache.FetchFromCacheMiddleware",
+        ]
+        self.overrides = {
+            "MIDDLEWARE": [mw for mw in settings.MIDDLEWARE if mw not in exclude],
+            "CMS_PAGE_CACHE_TAGS": True,
+        }
+        self.page_1 = create_page("page 1", "nav_playground.html", "en")
+        self.page_2 = create_page("page 2", "nav_playground.html", "en")
+        self.placeholder_1 = self.page_1.get_placeholders("en").get(slot="body")
+        add_plugin(self.placeholder_1, "TextPlugin", "en", body="Page 1 body")
+
+    def tearDown(self):
+        from django.core.cache import cache
+
+        super().tearDown()
+        cache.clear()
+
+    def _prime_cache(self):
+        for page in (self.page_1, self.page_2):
+            self.client.get(page.get_absolute_url())
+
+    def _is_cached(self, page):
+        return get_page_cache(self.get_request(page.get_absolute_url(), language="en")) is not None
+
+    def test_placeholder_change_invalidates_pages_rendering_it(self):
+        with self.settings(**self.overrides):
+            self._prime_cache()
+            self.assertTrue(self._is_cached(self.page_1))
+            self.assertTrue(self._is_cached(self.page_2))
+
+            self.placeholder_1.clear_cache("en")
+
+            self.assertFalse(self._is_cached(self.page_1))
+            self.assertTrue(self._is_cached(self.page_2))
+            with self.assertNumQueries(0):
+                self.client.get(self.page_2.get_absolute_url())
+
+    def test_page_change_invalidates_page(self):
+        with self.settings(**self.overrides):
+            self._prime_cache()
+            self.page_2.clear_cache()
+
+            self.assertTrue(self._is_cached(self.page_1))
+            self.assertFalse(self._is_cached(self.page_2))
+
+    def test_menu_change_invalidates_site(self):
+        with self.settings(**self.overrides):
+            self._prime_cache()
+            self.page_2.clear_cache(menu=True)
+
+            self.assertFalse(self._is_cached(self.page_1))
+            self.assertFalse(self._is_cached(self.page_2))
+
+    def test_toggle_in_navigation_invalidates_site(self):
+        with self.settings(**self.overrides):
+            self._prime_cache()
+            self.page_2.get_content_obj("en").toggle_in_navigation()
+
+            self.assertFalse(self._is_cached(self.page_1))
+            self.assertFalse(self._is_cached(self.page_2))
+
+    def test_global_invalidation_without_tags(self):
+        self.overrides["CMS_PAGE_CACHE_TAGS"] = False
+
+        with self.settings(**self.overrides):
+            self._prime_cache()
+            self.placeholder_1.clear_cache("en")
+
+            self.assertFalse(self._is_cached(self.page_1))
+            self.assertFalse(self._is_cached(self.page_2))
+
+
 class XFrameCacheTestCase(CMSTestCase):
     def setUp(self):
         from django.core.cache import cache
@@ -0,0 +1,253 @@
+"""
+Tests for the fractional-ordering tree backend.
+
+The order keys and the :class:`FractionalPath` driver are tested against the
+sample app's ``Category`` model, which has the tree columns in every backend,
+so they run in every job. ``FractionalPageTreeTests`` covers the page tree
+itself and only runs under the fractional backend::
+
+    CMS_TREE_BACKEND=fractional python manage.py test cms.tests.test_fractree
+"""
+import random
+from unittest import skipIf
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from cms.api import create_page
+from cms.models import Page
+from cms.models.permissionmodels import (
+    ACCESS_CHILDREN,
+    ACCESS_PAGE_AND_CHILDREN,
+    PermissionTuple,
+    PermissionTupleIndex,
+)
+from cms.test_utils.project.sampleapp.models import Category
+from cms.test_utils.testcases import CMSTestCase
+from cms.utils.fractree import (
+    INTEGER_ZERO,
+    SEPARATOR,
+    FractionalPath,
+    FractionalTreeMixin,
+    key_between,
+    sequential_keys,
+)
+from cms.utils.mptree import (
+    MaterializedPath,
+    TreePathOverflow,
+    get_path_depth,
+    get_path_prefixes,
+    get_tree_backend,
+    get_tree_base,
+)
+
+TEMPLATE = "nav_playground.html"
+
+fractional_only = skipIf(
+    get_tree_backend() != "fractional",
+    "fractional backend only -- run with CMS_TREE_BACKEND=fractional",
+)
+
+
+class KeyBetweenTests(SimpleTestCase):
+    def test_bounds(self):
+        self.assertEqual(key_between(None, None), INTEGER_ZERO)
+        self.assertEqual(key_between("I1", None), "I2")
+        self.assertEqual(key_between("IZ", None), "J11")
+        self.assertEqual(key_between(None, "I1"), "HZ")
+        self.assertEqual(key_between(None, "I1V"), "I1")
+        self.assertEqual(key_between("I1", "I3"), "I2")
+        self.assertEqual(key_between("I1", "I2"), "I1J")
+        self.assertEqual(key_between("I1", "I1J"), "I1A")
+
+    def test_invalid_keys(self):
+        for lower, upper in (("I2", "I1"), ("I1", "I1"), ("I11", None), ("I", None), (None, "I10"), ("i1", None)):
+            with self.subTest(lower=lower, upper=upper), self.assertRaises(ValueError):
+                key_between(lower, upper)
+
+    def test_random_inserts_keep_order(self):
+        rng = random.Random(0)
+        keys = [key_between(None, None)]
+
+        for _ in range(3000):
+            index = rng.randrange(len(keys) + 1)
+            lower = keys[index - 1] if index else None
+            upper = keys[index] if index < len(keys) else None
+            keys.insert(index, key_between(lower, upper))
+
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), len(keys))
+        # The separator keeps paths in the same order as the keys
+        paths = [key + SEPARATOR for key in keys]
+        self.assertEqual(paths, sorted(paths))
+        self.assertTrue(all(SEPARATOR not in key for key in keys))
+        self.assertLessEqual(max(len(key) for key in keys), 10)
+
+    def test_appending_and_prepending_keep_keys_short(self):
+        last = first = None
+
+        for _ in range(5000):
+            last = key_between(last, None)
+            first = key_between(None, first)
+        self.assertLessEqual(len(last), 4)
+        self.assertLessEqual(len(first), 4)
+
+    def test_sequential_keys(self):
+        keys = sequential_keys(1260)
+        self.assertEqual(keys[:3], ["I1", "I2", "I3"])
+        self.assertEqual(keys[35], "J11")
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(max(len(key) for key in keys), 3)
+        self.assertEqual(sequential_keys(1261)[-1], "K111")
+
+
+class PathHelperTests(SimpleTestCase):
+    def test_fixed_width_paths(self):
+        self.assertEqual(get_path_prefixes("000100020003"), ["0001", "00010002", "000100020003"])
+        self.assertEqual(get_path_depth("000100020003"), 3)
+
+    def test_fractional_paths(self):
+        self.assertEqual(get_path_prefixes("I10J110I1V0", None), ["I10", "I10J110", "I10J110I1V0"])
+        self.assertEqual(get_path_depth("I10J110I1V0", None), 3)
+
+    def test_permission_tuples(self):
+        self.assertTrue(PermissionTuple((ACCESS_CHILDREN, "I10")).contains("I10J110", steplen=None))
+        self.assertFalse(PermissionTuple((ACCESS_CHILDREN, "I10")).contains("I10J110I1V0", steplen=None))
+        self.assertFalse(PermissionTuple((ACCESS_PAGE_AND_CHILDREN, "I10")).contains("I1V0", steplen=None))
+
+        index = PermissionTupleIndex([(ACCESS_PAGE_AND_CHILDREN, "I10")], steplen=None)
+        self.assertTrue(index.contains("I10"))
+        self.assertTrue(index.contains("I10J110"))
+        self.assertFalse(index.contains("I10J110I1V0"))
+
+
+class FractionalPathTests(TestCase):
+    def setUp(self):
+        self.tree = FractionalPath(Category)
+
+    def names(self, parent=None):
+        queryset = self.tree.children(parent) if parent else self.tree.roots()
+        return list(queryset.values_list("name", flat=True))
+
+    def test_build(self):
+        root = self.tree.add_root(name="r")
+        a = self.tree.add_child(root, name="a")
+        b = self.tree.add_child(root, name="b")
+        self.tree.add_child(root, position="first-child", name="first")
+        self.tree.add_sibling(a, position="right", name="a_right")
+        self.tree.add_sibling(b, position="left", name="b_left")
+        self.tree.add_sibling(a, position="first-sibling", name="very_first")
+        self.tree.add_sibling(a, name="last")
+        grandchild = self.tree.add_child(a, name="g")
+        self.tree.add_sibling(root, position="left", name="r_left")
+
+        self.assertEqual(self.names(), ["r_left", "r"])
+        self.assertEqual(self.names(root), ["very_first", "first", "a", "a_right", "b_left", "b", "last"])
+        self.assertEqual(grandchild.path, a.path + "I10")
+        self.assertEqual(grandchild.depth, 3)
+        root.refresh_from_db()
+        self.assertEqual(root.numchild, 7)
+        self.assertEqual(self.tree.root_of(grandchild).pk, root.pk)
+        self.assertEqual(list(self.tree.ancestors(grandchild)), [root, a])
+        self.assertEqual(self.tree.descendants(root).count(), 8)
+
+    def test_insert_between_siblings_writes_a_single_row(self):
+        root = self.tree.add_root(name="r")
+        children = [self.tree.add_child(root, name=f"c{index}") for index in range(50)]
+        self.tree.add_child(children[10], name="g")
+        paths = dict(Category.objects.values_list("pk", "path"))
+
+        with CaptureQueriesContext(connection) as queries:
+            new = self.tree.add_sibling(children[10], position="left", name="new")
+
+        writes = [query["sql"] for query in queries if query["sql"].startswith(("INSERT", "UPDATE"))]
+        self.assertEqual(len(writes), 2)  # the new row and its parent's numchild
+        self.assertEqual(dict(Category.objects.exclude(pk=new.pk).values_list("pk", "path")), paths)
+        self.assertEqual(self.names(root).index("new"), 10)
+
+    def test_move(self):
+        root = self.tree.add_root(name="r")
+        a = self.tree.add_child(root, name="a")
+        b = self.tree.add_child(root, name="b")
+        c = self.tree.add_child(root, name="c")
+        a_child = self.tree.add_child(a, name="a_child")
+
+        self.tree.move(c, a, "left")
+        self.assertEqual(self.names(root), ["c", "a", "b"])
+        self.tree.move(c, b, "left")
+        self.assertEqual(self.names(root), ["a", "c", "b"])
+        self.tree.move(a, b, "first-child")
+        self.assertEqual(self.names(root), ["c", "b"])
+        self.assertEqual(self.names(b), ["a"])
+
+        a_child.refresh_from_db()
+        self.assertTrue(a_child.path.startswith(a.path))
+        self.assertEqual((a.depth, a_child.depth), (3, 4))
+        root.refresh_from_db()
+        b.refresh_from_db()
+        self.assertEqual((root.numchild, b.numchild), (2, 1))
+
+        # Out of its own parent, to the left of it
+        self.tree.move(a_child, root, "left")
+        self.assertEqual(self.names(), ["a_child", "r"])
+        with self.assertRaises(ValueError):
+            self.tree.move(root, b, "last-child")
+
+    def test_rebuild_converts_and_renormalises_paths(self):
+        fixed_width = MaterializedPath(Category)
+        root = fixed_width.add_root(name="r")
+        a = fixed_width.add_child(root, name="a")
+        fixed_width.add_child(root, name="b")
+        fixed_width.add_child(a, name="a_child")
+        fixed_width.move(a, root, "last-child")
+        names = list(fixed_width.tree().values_list("name", "depth"))
+
+        self.tree.rebuild()
+        self.assertEqual(
+            list(self.tree.tree().values_list("name", "path")),
+            [("r", "I10"), ("b", "I10I10"), ("a", "I10I20"), ("a_child", "I10I20I10")],
+        )
+
+        # Grown keys are shortened again
+        b = Category.objects.get(name="b")
+        for index in range(20):
+            self.tree.add_sibling(b, position="right", name=f"n{index}")
+        self.assertGreater(max(len(path) for path in Category.objects.values_list("path", flat=True)), 9)
+        self.tree.rebuild()
+        self.assertEqual(max(len(path) for path in Category.objects.values_list("path", flat=True)), 9)
+
+        # ...and back to treebeard's encoding, keeping the order
+        Category.objects.filter(name__startswith="n").delete()
+        fixed_width.rebuild()
+        self.assertEqual(list(fixed_width.tree().values_list("name", "depth")), names)
+        self.assertEqual(Category.objects.get(name="a_child").path, "000100020001")
+
+    def test_path_overflow(self):
+        node = self.tree.add_root(name="0")
+
+        with self.assertRaises(TreePathOverflow):
+            for depth in range(1, 100):
+                node = self.tree.add_child(node, name=str(depth))
+        self.assertEqual(Category.objects.count(), 85)
+
+
+@fractional_only
+class FractionalPageTreeTests(CMSTestCase):
+    def test_selector_matches_active_backend(self):
+        self.assertIs(get_tree_base(), FractionalTreeMixin)
+        self.assertIsNone(Page.steplen)
+
+    def test_page_tree(self):
+        home = create_page("home", TEMPLATE, "en")
+        alpha = create_page("alpha", TEMPLATE, "en", parent=home)
+        beta = create_page("beta", TEMPLATE, "en", parent=home)
+        gamma = create_page("gamma", TEMPLATE, "en", parent=beta)
+
+        gamma.move_page(alpha, position="left")
+        home.refresh_from_db()
+        gamma.refresh_from_db()
+        self.assertEqual(list(home.get_child_pages()), [gamma, alpha, beta])
+        self.assertEqual(gamma.get_root(), home)
+        self.assertEqual(gamma.get_ancestor_paths(), {home.path})
+        self.assertEqual(list(gamma.get_ancestor_pages()), [home])
@@ -1,4 +1,9 @@
 import copy
+import os
+import pickle
+import sys
+import time
+from unittest import skipIf
 
 from django.contrib.auth.models import AnonymousUser, Group, Permission
 from django.contrib.sites.models import Site
@@ -6,12 +11,13 @@ from django.core.cache import caches
 from django.db import connection
 from django.template import Template, TemplateSyntaxError
 from django.template.context import Context
+from django.test import SimpleTestCase
 from django.test.utils import CaptureQueriesContext, override_settings
 from django.utils.translation import activate, override as force_language
 
 from cms.api import create_page, create_page_content
 from cms.apphook_pool import apphook_pool
-from cms.cms_menus import CMSMenu, get_visible_page_contents
+from cms.cms_menus import CMSMenu, CMSNavigationNode, get_visible_page_contents
 from cms.models import ACCESS_PAGE_AND_DESCENDANTS, Page, PageContent
 from cms.models.permissionmodels import GlobalPagePermission, PagePermission
 from cms.test_utils.fixtures.menus import (
@@ -36,7 +42,13 @@ from cms.test_utils.util.mock import AttributeObject
 from cms.utils.conf import get_cms_setting
 from cms.utils.i18n import get_default_language_for_site
 from menus.base import NavigationNode
-from menus.menu_pool import _build_nodes_inner_for_one_menu, menu_pool
+from menus.menu_pool import (
+    _build_nodes_inner_for_one_menu,
+    _dump_nodes,
+    _get_selection_index,
+    _load_nodes,
+    menu_pool,
+)
 from menus.models import CacheKey
 from menus.utils import cut_levels, find_selected, mark_descendants
 
@@ -325,7 +337,7 @@ class FixturesMenuTests(MenusFixture, BaseMenuTest):
         renderer.draft_mode_active = True
         nodes_before = renderer.get_nodes()
         index_before = [i for i, s in enumerate(nodes_before) if s.title == page.get_title()]
-        self.assertEqual(CacheKey.objects.count(), 1)
+        cache_key_before = renderer.cache_key
 
         with self.login_user_context(self.get_superuser()):
             # Moves the page to the second position in the tree
@@ -333,7 +345,6 @@ class FixturesMenuTests(MenusFixture, BaseMenuTest):
             endpoint = self.get_admin_url(Page, "move_page", page.pk)
             response = self.client.post(endpoint, data)
             self.assertEqual(response.status_code, 200)
-            self.assertEqual(CacheKey.objects.count(), 0)
 
         request = self.get_request("/")
         renderer = menu_pool.get_renderer(request)
@@ -341,7 +352,7 @@ class FixturesMenuTests(MenusFixture, BaseMenuTest):
         nodes_after = renderer.get_nodes()
         index_after = [i for i, s in enumerate(nodes_after) if s.title == page.get_title()]
 
-        self.assertEqual(CacheKey.objects.count(), 1)
+        self.assertNotEqual(renderer.cache_key, cache_key_before)
         self.assertNotEqual(index_before, index_after, "Index should not be the same after move page in navigation")
 
     def test_cms_menu_public_with_multiple_languages(self):
@@ -427,14 +438,12 @@ class FixturesMenuTests(MenusFixture, BaseMenuTest):
     def test_show_menu_num_queries(self):
         context = self.get_context()
         # test standard show_menu
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(3):
             """
             The queries should be:
                 get all page contents
                 get all page permissions
                 get all page urls
-                get the menu cache key
-                set the menu cache key
             """
             tpl = Template("{% load menu_tags %}{% show_menu %}")
             tpl.render(context)
@@ -442,49 +451,93 @@ class FixturesMenuTests(MenusFixture, BaseMenuTest):
     def test_show__key_leak(self):
         context = self.get_context()
         tpl = Template("{% load menu_tags %}{% show_menu %}")
-        self.assertEqual(CacheKey.objects.count(), 0)
         tpl.render(context)
-        self.assertEqual(CacheKey.objects.count(), 1)
         tpl.render(context)
-        self.assertEqual(CacheKey.objects.count(), 1)
+        # Cache keys are no longer tracked in the database
+        self.assertEqual(CacheKey.objects.count(), 0)
 
-    def test_menu_cache_respects_database_keys(self):
+    def test_menu_cache_hit_does_not_query_database(self):
         cms_page = self.get_page(1)
         context = self.get_context(path=cms_page.get_absolute_url(), page=cms_page)
         context["request"].session["cms_edit"] = False
 
         # Prime the cache
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(3):
             # The queries should be:
             #     get all page contents
             #     get all page permissions
             #     get all page urls
-            #     get the menu cache key
-            #     set the menu cache key
             Template("{% load menu_tags %}{% show_menu %}").render(context)
 
-        # One new CacheKey should have been created
-        self.assertEqual(CacheKey.objects.count(), 1)
-
-        # Because its cached, only one query is made to the db
-        with self.assertNumQueries(1):
-            # The queries should be:
-            #     get the menu cache key
+        # Because its cached, no query is made to the db
+        with self.assertNumQueries(0):
             Template("{% load menu_tags %}{% show_menu %}").render(context)
 
-        # Delete the current cache key but don't touch the cache
-        CacheKey.objects.all().delete()
+        # Invalidate the menu for the current site
+        menu_pool.clear(site_id=1)
 
         # The menu should be recalculated
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(3):
             # The queries should be:
-            #     check if cache key exists
             #     get all page contents
             #     get all page permissions
             #     get all page url objects
-            #     set the menu cache key
             Template("{% load menu_tags %}{% show_menu %}").render(context)
 
+    def test_page_changes_patch_menu_index(self):
+        """
+        Saving, moving or deleting a page patches the cached menu index
+        instead of rebuilding it.
+        """
+
+        def get_nodes():
+            nodes = menu_pool.get_renderer(self.get_request("/")).get_nodes()
+            return [(node.id, node.parent_id, node.title, node.get_absolute_url()) for node in nodes]
+
+        def assert_index_is_up_to_date():
+            nodes = get_nodes()
+            menu_pool.clear(site_id=1)
+            self.assertEqual(nodes, get_nodes())
+
+        get_nodes()
+        page = self.get_page(2)
+        PageContent.objects.filter(page=page, language="en").update(menu_title="Changed")
+        page.clear_cache(menu=True)
+
+        with self.assertNumQueries(1):
+            # Only the page permissions of the anonymous user are queried
+            nodes = get_nodes()
+        self.assertIn((page.pk, page.parent_id, "Changed", page.get_absolute_url()), nodes)
+        assert_index_is_up_to_date()
+
+        self.get_page(3).move_page(self.get_page(4), position="left")
+        assert_index_is_up_to_date()
+
+        self.get_page(4).delete()
+        assert_index_is_up_to_date()
+
+    def test_language_clear_rebuilds_menu_index(self):
+        """
+        Clearing the menus of a language also drops the menu index, which is
+        shared by all languages.
+        """
+        page = self.get_page(2)
+
+        def get_title():
+            with force_language("de"):
+                nodes = menu_pool.get_renderer(self.get_request("/de/", language="de")).get_nodes()
+            return next(node.title for node in nodes if node.id == page.pk)
+
+        create_page_content("de", "Seite", page, slug="seite")
+        self.assertEqual(get_title(), "Seite")
+
+        for clear_kwargs in ({"site_id": 1, "language": "de"}, {"language": "de"}):
+            with self.subTest(**clear_kwargs):
+                title = f"Seite {len(clear_kwargs)}"
+                PageContent.objects.filter(page=page, language="de").update(menu_title=title)
+                menu_pool.clear(**clear_kwargs)
+                self.assertEqual(get_title(), title)
+
     def test_menu_cache_default_is_default_cache(self):
         from cms.utils.conf import get_menu_cache
 
@@ -514,16 +567,42 @@ class FixturesMenuTests(MenusFixture, BaseMenuTest):
 
         self.assertEqual(menu_cache, caches["secondary"], "Menu cache ignores CMS_MENU_CACHE_BACKEND setting")
 
-    def test_menu_keys_duplicate_clear(self):
+    def test_menu_clear_is_selective(self):
         """
-        Tests that the menu clears all keys, including duplicates.
+        Tests that clearing the menu only invalidates the requested site and language.
         """
-        CacheKey.objects.create(language="fr", site=1, key="a")
-        CacheKey.objects.create(language="fr", site=1, key="a")
+        en_renderer = menu_pool.get_renderer(self.get_request(path="/en/", language="en"))
+        fr_renderer = menu_pool.get_renderer(self.get_request(path="/fr/", language="fr"))
+        en_key, fr_key = en_renderer.cache_key, fr_renderer.cache_key
+
+        def get_cache_keys():
+            return (
+                menu_pool.get_renderer(self.get_request(path="/en/", language="en")).cache_key,
+                menu_pool.get_renderer(self.get_request(path="/fr/", language="fr")).cache_key,
+            )
+
+        menu_pool.clear(site_id=2)
+        self.assertEqual(get_cache_keys(), (en_key, fr_key))
 
-        self.assertEqual(CacheKey.objects.count(), 2)
         menu_pool.clear(site_id=1, language="fr")
-        self.assertEqual(CacheKey.objects.count(), 0)
+        new_en_key, new_fr_key = get_cache_keys()
+        self.assertEqual(new_en_key, en_key)
+        self.assertNotEqual(new_fr_key, fr_key)
+
+        menu_pool.clear(language="en")
+        self.assertNotEqual(get_cache_keys()[0], en_key)
+
+        en_key, fr_key = get_cache_keys()
+        menu_pool.clear(site_id=1)
+        new_en_key, new_fr_key = get_cache_keys()
+        self.assertNotEqual(new_en_key, en_key)
+        self.assertNotEqual(new_fr_key, fr_key)
+
+        en_key, fr_key = get_cache_keys()
+        menu_pool.clear(all=True)
+        new_en_key, new_fr_key = get_cache_keys()
+        self.assertNotEqual(new_en_key, en_key)
+        self.assertNotEqual(new_fr_key, fr_key)
 
     def test_only_active_tree(self):
         context = self.get_context(page=self.get_page(1))
@@ -1009,6 +1088,96 @@ class MenuTests(BaseMenuTest):
         self.assertEqual(node4.children, [node3])
         self.assertEqual(node5.children, [node4])
 
+    def test_dump_and_load_nodes(self):
+        """
+        The compact format of the menu cache keeps the tree structure, the
+        node classes and any extra node attributes.
+        """
+        root = CMSNavigationNode("Root", "/", 1, attr={"is_page": True})
+        child = CMSNavigationNode("Child", "/child/", 2, 1, language="de")
+        grandchild = NavigationNode("Grandchild", "/child/grandchild/", 3, 2, visible=False)
+        other = NavigationNode("Other", "/other/", 4)
+        nodes = _build_nodes_inner_for_one_menu([root, child, grandchild, other], "Test")
+        child.selected = True
+
+        loaded = _load_nodes(pickle.loads(pickle.dumps(_dump_nodes(nodes))))
+
+        self.assertEqual(
+            [(type(node), node.title, node.url, node.id, node.parent_id, node.namespace, node.visible) for node in loaded],
+            [(type(node), node.title, node.url, node.id, node.parent_id, node.namespace, node.visible) for node in nodes],
+        )
+        loaded_root, loaded_child, loaded_grandchild, loaded_other = loaded
+        self.assertIsNone(loaded_root.parent)
+        self.assertEqual(loaded_root.children, [loaded_child])
+        self.assertIs(loaded_child.parent, loaded_root)
+        self.assertEqual(loaded_child.children, [loaded_grandchild])
+        self.assertIs(loaded_grandchild.parent, loaded_child)
+        self.assertEqual(loaded_other.children, [])
+        self.assertEqual(loaded_root.attr, {"is_page": True})
+        self.assertEqual(loaded_child.language, "de")
+        self.assertTrue(loaded_child.selected)
+        self.assertFalse(loaded_root.selected)
+        self.assertFalse(hasattr(loaded_root, "_counter"))
+
+    def test_mark_selected_with_selection_index(self):
+        """
+        The selected node is looked up by its selection key, but is still
+        the first node in the menu whose is_selected() returns True.
+        """
+
+        class CustomNode(NavigationNode):
+            def is_selected(self, request):
+                return True
+
+        def build_nodes():
+            return _build_nodes_inner_for_one_menu(
+                [
+                    NavigationNode("Root", "/", 1),
+                    CMSNavigationNode("Page", "/page/", 3, 1),
+                    NavigationNode("Other", "/other/", 4, 1),
+                    CMSNavigationNode("Sub", "/page/sub/", 5, 3),
+                    CustomNode("Custom", "/custom/", 6),
+                ],
+                "Test",
+            )
+
+        request = self.get_request("/other/")
+        request.current_page = AttributeObject(pk=3, site_id=1)
+        renderer = menu_pool.get_renderer(request)
+        nodes = build_nodes()
+        renderer._selection_index = (nodes, _get_selection_index(nodes))
+        renderer._mark_selected(nodes)
+        # Without index
+        unindexed_nodes = renderer._mark_selected(build_nodes())
+
+        for node in (nodes, unindexed_nodes):
+            root, page, other, sub, custom = node
+            self.assertTrue(page.selected)
+            self.assertFalse(other.selected)
+            self.assertFalse(custom.selected)
+            self.assertTrue(root.ancestor)
+            self.assertTrue(other.sibling)
+            self.assertTrue(sub.descendant)
+
+        request.current_page = None
+        request.path = "/nowhere/"
+        nodes = build_nodes()
+        renderer._selection_index = (nodes, _get_selection_index(nodes))
+        renderer._mark_selected(nodes)
+        self.assertTrue(nodes[4].selected)
+        self.assertTrue(nodes[0].sibling)
+
+    def test_mark_descendants_of_deep_tree(self):
+        depth = sys.getrecursionlimit() + 100
+        nodes = _build_nodes_inner_for_one_menu(
+            [NavigationNode(f"Node {i}", f"/{i}/", i, i - 1 if i else None) for i in range(depth)],
+            "Test",
+        )
+        request = self.get_request("/0/")
+        menu_pool.get_renderer(request)._mark_selected(nodes)
+        self.assertTrue(nodes[0].selected)
+        self.assertTrue(all(node.descendant for node in nodes[1:]))
+
     def test_utils_mark_descendants(self):
         tree_nodes, flat_nodes = self._get_nodes()
         mark_descendants(tree_nodes)
@@ -1504,14 +1673,12 @@ class ShowSubMenuCheck(SubMenusFixture, BaseMenuTest):
         context = self.get_context(page.get_absolute_url(), page=page)
 
         # test standard show_menu
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(3):
             """
             The queries should be:
                 get all page contents
                 get all page permissions
                 get all page urls
-                get the menu cache key
-                set the menu cache key
             """
             tpl = Template("{% load menu_tags %}{% show_sub_menu %}")
             tpl.render(context)
@@ -1667,14 +1834,12 @@ class ShowMenuBelowIdTests(BaseMenuTest):
 
         with LanguageOverride("en"):
             context = self.get_context(a.get_absolute_url())
-            with self.assertNumQueries(5):
+            with self.assertNumQueries(3):
                 """
                 The queries should be:
                     get all page urls
                     get all page contents
                     get all page permissions
-                    get the menu cache key
-                    set the menu cache key
                 """
                 # Actually seems to run:
                 tpl = Template("{% load menu_tags %}{% show_menu_below_id 'a' 0 100 100 100 %}")
@@ -2214,3 +2379,55 @@ class SoftrootTests(CMSTestCase):
         self.assertEqual(len(cmsnode.children), 0)
         self.assertEqual(len(shopnode.children), 0)
         self.assertEqual(len(peoplenode.children), 0)
+
+
+@skipIf(
+    os.environ.get("GITHUB_ACTIONS") == "true",
+    "Benchmark is too slow for CI -- run locally instead.",
+)
+class MenuCacheFormatBenchmark(SimpleTestCase):
+    """Timing only -- prints the size and load time of both cache formats."""
+
+    def test_benchmark_node_formats(self):
+        n = int(os.environ.get("MENU_BENCH_N", "20000"))
+        fanout = 5
+        attr = {
+            "is_page": True,
+            "soft_root": False,
+            "redirect_url": None,
+            "auth_required": False,
+            "reverse_id": None,
+            "is_home": False,
+            "visible_for_authenticated": True,
+            "visible_for_anonymous": True,
+            "navigation_extenders": [],
+        }
+        nodes = [
+            CMSNavigationNode(
+                f"Page {pk}",
+                f"/en/page-{pk}/",
+                pk,
+                None if pk <= fanout else (pk - 1) // fanout,
+                attr=dict(attr),
+            )
+            for pk in range(1, n + 1)
+        ]
+        nodes = _build_nodes_inner_for_one_menu(nodes, "CMSMenu")
+
+        objects = pickle.dumps(nodes, pickle.HIGHEST_PROTOCOL)
+        compact = pickle.dumps(_dump_nodes(nodes), pickle.HIGHEST_PROTOCOL)
+
+        t0 = time.perf_counter()
+        pickle.loads(objects)
+        objects_load = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        _load_nodes(pickle.loads(compact))
+        compact_load = time.perf_counter() - t0
+
+        self.assertLess(len(compact), len(objects))
+        print(
+            f"\n[menu cache benchmark] n={n} nodes\n"
+            f"  size    nodes={len(objects) / 1024:8.1f} KiB   compact={len(compact) / 1024:8.1f} KiB\n"
+            f"  load    nodes={objects_load * 1000:8.1f} ms    compact={compact_load * 1000:8.1f} ms"
+        )
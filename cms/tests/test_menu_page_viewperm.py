@@ -527,6 +527,38 @@ class ViewPermissionComplexMenuAllNodesTests(ViewPermissionTests):
         self.assertViewAllowed(urls["/en/page_d/"], user)
         self.assertViewAllowed(urls["/en/page_d/page_d_a/"], user)
 
+    @override_settings(CMS_MENU_CACHE_PER_USER=False)
+    def test_menu_cache_is_shared_by_users_with_same_restrictions(self):
+        """
+        Users who can see the same pages share the cached menu
+        """
+        self._setup_user_groups()
+        all_pages = self._setup_tree_pages()
+        self._setup_view_restrictions()
+        page_b = self.get_url_dict(all_pages)["/en/page_b/"]
+
+        def get_user(username):
+            if get_user_model().USERNAME_FIELD == "email":
+                username = username + "@django-cms.org"
+            return get_user_model().objects.get(**{get_user_model().USERNAME_FIELD: username})
+
+        def get_cache_key(user):
+            return menu_pool.get_renderer(self.get_request(user)).cache_key
+
+        user_1, user_1_nostaff, user_2 = get_user("user_1"), get_user("user_1_nostaff"), get_user("user_2")
+
+        # Same group, the staff status is irrelevant with CMS_PUBLIC_FOR="all"
+        self.assertEqual(get_cache_key(user_1), get_cache_key(user_1_nostaff))
+        self.assertNotEqual(get_cache_key(user_1), get_cache_key(user_2))
+        self.assertNotEqual(get_cache_key(user_1), get_cache_key(self.get_superuser()))
+
+        self.assertInMenu(page_b, user_1)
+        self.assertInMenu(page_b, user_1_nostaff)
+        self.assertNotInMenu(page_b, user_2)
+
+        with self.settings(CMS_MENU_CACHE_PER_USER=True):
+            self.assertNotEqual(get_cache_key(user_1), get_cache_key(user_1_nostaff))
+
     def test_non_view_permission_doesnt_hide(self):
         """
         PagePermissions with can_view=False shouldn't hide pages in the menu.
@@ -13,9 +13,10 @@ The whole module only runs under the mptree backend::
 
     CMS_TREE_BACKEND=mptree python manage.py test cms.tests.test_mptree_backend
 
-Under treebeard it is skipped: those code paths belong to treebeard, are covered
-by the rest of the suite, and holding treebeard to this module's expectations
-means asserting on upstream behaviour we cannot fix.
+Under the other backends it is skipped: treebeard's code paths are covered by
+the rest of the suite, holding treebeard to this module's expectations means
+asserting on upstream behaviour we cannot fix, and the fractional backend has
+its own tests in ``test_fractree``.
 """
 import os
 import time
@@ -40,7 +41,7 @@ from cms.utils.mptree import (
 TEMPLATE = "nav_playground.html"
 
 mptree_only = skipIf(
-    get_tree_backend() == "treebeard",
+    get_tree_backend() != "mptree",
     "mptree backend only -- run with CMS_TREE_BACKEND=mptree",
 )
 
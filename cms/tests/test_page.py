@@ -1,5 +1,6 @@
 import datetime
 import functools
+import json
 import os.path
 from unittest import skipIf
 
@@ -8,9 +9,10 @@ from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connection, models
 from django.db.utils import IntegrityError
 from django.http import HttpResponse, HttpResponseNotFound
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 from django.utils.timezone import now as tz_now
 from django.utils.translation import override as force_language
@@ -18,6 +20,7 @@ from django.utils.translation import override as force_language
 from cms import constants
 from cms.api import add_plugin, create_page, create_page_content
 from cms.cache.page import get_page_cache
+from cms.cache.page_url import clear_local_page_url_cache
 from cms.forms.validators import validate_url_uniqueness
 from cms.models import Page, PageContent
 from cms.models.placeholdermodel import Placeholder
@@ -53,6 +56,17 @@ class PagesTestCase(TransactionCMSTestCase):
     def tearDown(self):
         cache.clear()
 
+    def assertTreeOrder(self, pages):
+        # Paths differ between the tree backends, but sort in tree order on all of them
+        paths = [page.path for page in pages]
+        self.assertEqual(paths, sorted(paths))
+        self.assertEqual(len(set(paths)), len(paths))
+
+    def assertChildOf(self, page, parent):
+        self.assertEqual(page.parent_id, parent.pk)
+        self.assertEqual(page.depth, parent.depth + 1)
+        self.assertTrue(page.path.startswith(parent.path))
+
     def test_absolute_url(self):
         """
         Test correct content type is set for Page object
@@ -352,9 +366,10 @@ class PagesTestCase(TransactionCMSTestCase):
         beta.move_page(alpha, position="left")
 
         # Draft
-        self.assertEqual(home.path, "0001")
-        self.assertEqual(beta.path, "00010001")
-        self.assertEqual(alpha.path, "00010002")
+        self.assertTreeOrder([home, beta, alpha])
+        self.assertEqual(home.depth, 1)
+        self.assertChildOf(beta, home)
+        self.assertChildOf(alpha, home)
 
     def test_move_page_regression_right_to_left_5752(self):
         # ref: https://github.com/divio/django-cms/issues/5752
@@ -379,17 +394,19 @@ class PagesTestCase(TransactionCMSTestCase):
         beta.refresh_from_db()
 
         # Draft
-        self.assertEqual(home.path, "0001")
-        self.assertEqual(beta.path, "00010001")
-        self.assertEqual(alpha.path, "00010002")
+        self.assertTreeOrder([home, beta, alpha])
+        self.assertEqual(home.depth, 1)
+        self.assertChildOf(beta, home)
+        self.assertChildOf(alpha, home)
 
     def test_move_page_regression_5640(self):
         # ref: https://github.com/divio/django-cms/issues/5640
         alpha = create_page("Alpha", "nav_playground.html", "en")
         beta = create_page("Beta", "nav_playground.html", "en")
         alpha.move_page(beta, position="right")
-        self.assertEqual(beta.path, "0002")
-        self.assertEqual(alpha.path, "0003")
+        self.assertTreeOrder([beta, alpha])
+        self.assertEqual(beta.depth, 1)
+        self.assertEqual(alpha.depth, 1)
 
     def test_move_page_regression_nested_5640(self):
         # ref: https://github.com/divio/django-cms/issues/5640
@@ -404,16 +421,11 @@ class PagesTestCase(TransactionCMSTestCase):
         delta.move_page(gamma, position="last-child")
         theta.move_page(delta, position="last-child")
 
-        tree = [
-            (alpha, "0001"),
-            (beta, "00010001"),
-            (gamma, "000100010001"),
-            (delta, "0001000100010001"),
-            (theta, "00010001000100010001"),
-        ]
-
-        for page, path in tree:
-            self.assertEqual(page.path, path)
+        self.assertEqual(alpha.depth, 1)
+        self.assertChildOf(beta, alpha)
+        self.assertChildOf(gamma, beta)
+        self.assertChildOf(delta, gamma)
+        self.assertChildOf(theta, delta)
 
     def test_move_page_inherit(self):
         parent = create_page("Parent", "col_three.html", "en")
@@ -574,6 +586,48 @@ class PagesTestCase(TransactionCMSTestCase):
         found_page = get_page_from_request(request)
         self.assertIsNotNone(found_page)
 
+    @override_settings(CMS_PAGE_URL_CACHE=True)
+    def test_get_page_from_request_url_cache(self):
+        root = create_page("root", "nav_playground.html", "en", slug="root")
+        page = create_page("page", "nav_playground.html", "en", slug="page", parent=root)
+        clear_local_page_url_cache()
+        self.assertEqual(get_page_from_request(self.get_request("/en/root/page/")), page)
+
+        # served by the process-local tier
+        with self.assertNumQueries(0):
+            found_page = get_page_from_request(self.get_request("/en/root/page/"))
+        self.assertEqual(found_page, page)
+        self.assertEqual(found_page.site, page.site)
+        self.assertEqual(found_page.urls_cache["en"].path, "root/page")
+
+        # served by the shared tier
+        clear_local_page_url_cache()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_page_from_request(self.get_request("/en/root/page/")), page)
+
+        # changing the urls of the site invalidates both tiers
+        root = Page.objects.get(pk=root.pk)
+        root.update_urls("en", slug="moved", path="moved")
+        root._update_url_path_recursive("en")
+        self.assertIsNone(get_page_from_request(self.get_request("/en/root/page/")))
+        self.assertEqual(get_page_from_request(self.get_request("/en/moved/page/")), page)
+
+        # as do changes to the page
+        page.update(login_required=True)
+        self.assertTrue(get_page_from_request(self.get_request("/en/moved/page/")).login_required)
+
+    @override_settings(CMS_PAGE_URL_CACHE=False)
+    def test_page_url_cache_disabled_is_not_invalidated(self):
+        from unittest.mock import patch
+
+        page = create_page("page", "nav_playground.html", "en")
+
+        with patch.object(cache, "set", wraps=cache.set) as cache_set:
+            page.update(login_required=True)
+        self.assertFalse(
+            [call for call in cache_set.call_args_list if "_PAGE_URL_CACHE_VERSION" in call.args[0]]
+        )
+
     def test_page_urls(self):
         page1 = self.create_homepage("test page 1", "nav_playground.html", "en")
         page2 = create_page("test page 2", "nav_playground.html", "en", parent=page1)
@@ -1075,6 +1129,138 @@ class PageTreeTests(CMSTestCase):
         child.refresh_from_db()
         self.assertEqual(child.get_absolute_url(language="en"), "/en/parent/child/")
 
+    def _create_tree(self, children=2, slug="root"):
+        root = create_page("root", "nav_playground.html", "en", slug=slug)
+        pages = [root]
+
+        for index in range(children):
+            child = create_page(f"child {index}", "nav_playground.html", "en", parent=root)
+            create_page_content("de", f"Kind {index}", child)
+            grandchild = create_page(
+                f"grandchild {index}", "nav_playground.html", "en", parent=child, overwrite_url=f"custom/{index}"
+            )
+            placeholder = child.get_placeholders("en").get(slot="body")
+            grid = add_plugin(placeholder, "MultiColumnPlugin", "en")
+            column = add_plugin(placeholder, "ColumnPlugin", "en", target=grid)
+            add_plugin(placeholder, "LinkPlugin", "en", target=column, name=f"Link {index}", external_link="/")
+            pages += [child, grandchild]
+        return root, pages
+
+    def _get_tree_snapshot(self, root):
+        snapshot = []
+
+        for page in Page.objects.filter(path__startswith=root.path).order_by("path"):
+            urls = sorted(page.urls.values_list("language", "slug", "path", "managed"))
+            contents = sorted(
+                PageContent.admin_manager.filter(page=page).values_list("language", "title", "template")
+            )
+            plugins = sorted(
+                CMSPlugin.objects.filter(placeholder__object_id__in=page.pagecontent_set.values("pk"))
+                .exclude(placeholder__content_type__model="pagecontent", placeholder__object_id=None)
+                .values_list("placeholder__slot", "language", "plugin_type", "position", "parent__position")
+            )
+            snapshot.append((page.path[len(root.path):], page.depth - root.depth, page.numchild, urls, contents, plugins))
+        return snapshot
+
+    def test_copy_with_descendants(self):
+        from unittest.mock import patch
+
+        root, pages = self._create_tree()
+        target = create_page("target", "nav_playground.html", "en", slug="target")
+        expected = self._get_tree_snapshot(root)
+
+        new_root = root.copy_with_descendants(target, position="last-child", user=self.get_superuser())
+        snapshot = self._get_tree_snapshot(new_root)
+        self.assertEqual(len(snapshot), len(pages))
+        self.assertEqual(
+            [(path, depth, numchild, contents, plugins) for path, depth, numchild, _, contents, plugins in snapshot[1:]],
+            [(path, depth, numchild, contents, plugins) for path, depth, numchild, _, contents, plugins in expected[1:]],
+        )
+        self.assertEqual(
+            snapshot[1][3],
+            [("de", "kind-0", "target/root/kind-0", True), ("en", "child-0", "target/root/child-0", True)],
+        )
+        self.assertEqual(snapshot[2][3], [("en", "grandchild-0", "target/root/child-0/grandchild-0", False)])
+        link = CMSPlugin.objects.filter(plugin_type="LinkPlugin").order_by("pk").last().get_bound_plugin()
+        self.assertEqual(link.name, "Link 1")
+
+        # The bulk copy gives the same result as copying the pages one by one
+        with patch("cms.utils.page._can_bulk_copy_pages", return_value=False):
+            new_root_2 = root.copy_with_descendants(target, position="last-child", user=self.get_superuser())
+        snapshot_2 = self._get_tree_snapshot(new_root_2)
+        self.assertEqual(
+            [entry[:3] + entry[4:] for entry in snapshot_2],
+            [entry[:3] + entry[4:] for entry in snapshot],
+        )
+        self.assertEqual(
+            [[(language, slug, managed) for language, slug, _, managed in entry[3]] for entry in snapshot_2[1:]],
+            [[(language, slug, managed) for language, slug, _, managed in entry[3]] for entry in snapshot[1:]],
+        )
+
+    def test_copy_with_descendants_query_count(self):
+        from unittest.mock import patch
+
+        from cms.extensions import extension_pool
+
+        @patch.object(extension_pool, "page_extensions", set())
+        @patch.object(extension_pool, "page_content_extensions", set())
+        def count_queries(children):
+            root, _ = self._create_tree(children, slug=f"root-{children}")
+            target = create_page(f"target {children}", "nav_playground.html", "en")
+            user = self.get_superuser()
+
+            with CaptureQueriesContext(connection) as queries:
+                root.copy_with_descendants(target, position="last-child", user=user)
+            root.delete()
+            return len(queries)
+
+        self.assertEqual(count_queries(2), count_queries(6))
+
+    def test_page_tree_copy_from_state(self):
+        from cms.utils.page import PageTreeCopy
+
+        root, pages = self._create_tree()
+        new_root = root.copy(root.site, user=self.get_superuser())
+        tree_copy = PageTreeCopy(root, new_root, self.get_superuser())
+        self.assertTrue(tree_copy.step())
+        self.assertEqual(Page.objects.filter(parent=new_root).count(), 2)
+
+        tree_copy = PageTreeCopy.from_state(json.loads(json.dumps(tree_copy.state)))
+        tree_copy.run()
+        self.assertTrue(tree_copy.done)
+        self.assertEqual(Page.objects.filter(path__startswith=new_root.path).count(), len(pages))
+
+    def test_with_hierarchy(self):
+        root = create_page("root", "nav_playground.html", "en")
+        pages = [root]
+
+        for depth in range(4):
+            pages.append(create_page(f"page {depth}", "nav_playground.html", "en", parent=pages[-1]))
+        sibling = create_page("sibling", "nav_playground.html", "en", parent=pages[2])
+
+        with self.assertNumQueries(2):
+            deepest, loaded_sibling = Page.objects.with_hierarchy().filter(pk__in=[pages[-1].pk, sibling.pk])
+            self.assertEqual(deepest.get_cached_ancestors(), pages[-2::-1])
+            self.assertEqual(loaded_sibling.get_cached_ancestors(), pages[2::-1])
+
+            page, ancestors = deepest, []
+            while page.parent:
+                page = page.parent
+                ancestors.append(page)
+            self.assertEqual(ancestors, pages[-2::-1])
+            self.assertIs(deepest.parent.parent.parent, loaded_sibling.parent.parent)
+
+        with self.assertNumQueries(1):
+            page = Page.objects.with_hierarchy().get(pk=root.pk)
+            self.assertEqual(page.get_cached_ancestors(), [])
+            self.assertIsNone(page.parent)
+
+        # Without with_hierarchy() the pages are loaded as usual
+        page = Page.objects.filter(pk=pages[-1].pk).order_by("pk").get()
+        self.assertEqual(page.get_cached_ancestors(), [])
+        self.assertEqual(list(Page.objects.with_hierarchy().values_list("pk", flat=True).order_by("pk")),
+                         [page.pk for page in pages + [sibling]])
+
 
 class PageContentTests(CMSTestCase):
     def setUp(self):
@@ -8,7 +8,11 @@ from django.test.utils import override_settings
 from cms.admin.permissionadmin import GlobalPagePermissionAdmin, PagePermissionInlineAdmin
 from cms.api import add_plugin, assign_user_to_page, create_page
 from cms.cache.permissions import (
+    clear_permission_cache,
     clear_user_permission_cache,
+    get_cache_key,
+    get_cache_permission_version,
+    get_cache_permission_version_key,
     get_permission_cache,
     set_permission_cache,
 )
@@ -22,14 +26,24 @@ from cms.models.permissionmodels import (
     GlobalPagePermission,
     PagePermission,
     PermissionTuple,
+    PermissionTupleIndex,
 )
 from cms.test_utils.testcases import CMSTestCase
+from cms.test_utils.util.fuzzy_int import FuzzyInt
+from cms.utils.compat.warnings import RemovedInDjangoCMS60Warning
 from cms.utils.page_permissions import (
+    get_allowed_page_actions,
     get_change_perm_tuples,
     has_generic_permission,
+    user_can_add_subpage,
+    user_can_change_page,
+    user_can_change_page_advanced_settings,
+    user_can_change_page_permissions,
     user_can_delete_page,
+    user_can_move_page,
     user_can_publish_page,
 )
+from cms.utils.permissions import clear_permission_lru_caches
 
 
 @override_settings(
@@ -106,6 +120,72 @@ class PermissionCacheTests(CMSTestCase):
         )
         self.assertTrue(can_publish)
 
+    def test_permission_snapshot_round_trips(self):
+        from django.core.cache import cache
+
+        page_b = create_page("page_b", "nav_playground.html", "en", created_by=self.user_super)
+        assign_user_to_page(page_b, self.user_normal, can_view=True, can_change=True)
+        site = Site.objects.get_current()
+        get_change_perm_tuples(self.user_normal, site)
+        clear_permission_lru_caches(self.user_normal)
+
+        with patch.object(cache, "get_many", wraps=cache.get_many) as get_many, self.assertNumQueries(0):
+            change_perms = get_change_perm_tuples(self.user_normal, site, check_global=False)
+            publish_perms = get_permission_cache(self.user_normal, "publish_page")
+        self.assertEqual(change_perms, [(ACCESS_PAGE_AND_DESCENDANTS, page_b.path)])
+        self.assertEqual(publish_perms, [])
+        # One round trip each
+        self.assertEqual(get_many.call_count, 2)
+
+        # Snapshots are kept per site
+        set_permission_cache(self.user_normal, "change_page", [], site_id=site.pk + 1)
+        self.assertEqual(get_permission_cache(self.user_normal, "change_page", site_id=site.pk + 1), [])
+        self.assertEqual(get_permission_cache(self.user_normal, "change_page"), change_perms)
+
+        # Clearing the cache of all users or of another user invalidates accordingly
+        clear_user_permission_cache(self.user_super)
+        self.assertEqual(get_permission_cache(self.user_normal, "change_page"), change_perms)
+        clear_permission_cache()
+        self.assertIsNone(get_permission_cache(self.user_normal, "change_page"))
+
+    def test_permission_snapshot_survives_evicted_versions(self):
+        from django.core.cache import cache
+
+        version_keys = [get_cache_permission_version_key(), get_cache_permission_version_key(self.user_normal)]
+        cache.delete_many(version_keys)
+        set_permission_cache(self.user_normal, "change_page", [self.home_page.id])
+
+        # Revoking the permissions sets a new version. If it gets evicted,
+        # the snapshot computed before must not come back.
+        clear_user_permission_cache(self.user_normal)
+        cache.delete_many(version_keys)
+        self.assertIsNone(get_permission_cache(self.user_normal, "change_page"))
+
+    def test_deprecated_cache_helpers(self):
+        with self.assertWarns(RemovedInDjangoCMS60Warning):
+            key = get_cache_key(self.user_normal, "change_page")
+        self.assertTrue(key.endswith(f":permission:{self.user_normal.pk}:change_page"))
+
+        with self.assertWarns(RemovedInDjangoCMS60Warning):
+            version = get_cache_permission_version()
+        clear_permission_cache()
+        with self.assertWarns(RemovedInDjangoCMS60Warning):
+            self.assertNotEqual(get_cache_permission_version(), version)
+
+    @override_settings(CMS_PERMISSION_LOCAL_CACHE_DURATION=60)
+    def test_permission_snapshot_local_cache(self):
+        from django.core.cache import cache
+
+        set_permission_cache(self.user_normal, "change_page", [self.home_page.id])
+        self.addCleanup(clear_permission_cache)
+
+        with patch.object(cache, "get_many") as get_many:
+            self.assertEqual(get_permission_cache(self.user_normal, "change_page"), [self.home_page.id])
+        get_many.assert_not_called()
+
+        clear_user_permission_cache(self.user_normal)
+        self.assertIsNone(get_permission_cache(self.user_normal, "change_page"))
+
     def test_has_generic_permissions_compatibiltiy(self):
         page_b = create_page("page_b", "nav_playground.html", "en",
                              created_by=self.user_super)
@@ -115,6 +195,58 @@ class PermissionCacheTests(CMSTestCase):
         self.assertTrue(has_generic_permission(page_b, self.user_normal, "change_page"))
         self.assertFalse(has_generic_permission(page_b, self.user_normal, "publish_page"))
 
+    def test_has_generic_permission_compiles_index_once(self):
+        page_b = create_page("page_b", "nav_playground.html", "en", created_by=self.user_super)
+        page_c = create_page("page_c", "nav_playground.html", "en", created_by=self.user_super, parent=page_b)
+        page_d = create_page("page_d", "nav_playground.html", "en", created_by=self.user_super)
+        assign_user_to_page(page_b, self.user_normal, grant_on=ACCESS_CHILDREN, can_view=True, can_change=True)
+        site = Site.objects.get_current()
+        has_generic_permission(page_b, self.user_normal, "change_page", site=site)
+
+        with self.assertNumQueries(0), patch("cms.utils.page_permissions.get_or_set_permission_snapshot") as get_cache:
+            allowed = [
+                has_generic_permission(page, self.user_normal, "change_page", site=site)
+                for page in (page_b, page_c, page_d)
+            ]
+        get_cache.assert_not_called()
+        self.assertEqual(allowed, [False, True, False])
+        self.assertEqual(
+            allowed,
+            [
+                has_generic_permission(page, self.user_normal, "change_page", site=site, use_cache=False)
+                for page in (page_b, page_c, page_d)
+            ],
+        )
+
+    def test_get_allowed_page_actions(self):
+        page_b = create_page("page_b", "nav_playground.html", "en", created_by=self.user_super)
+        page_c = create_page("page_c", "nav_playground.html", "en", created_by=self.user_super, parent=page_b)
+        page_d = create_page("page_d", "nav_playground.html", "en", created_by=self.user_super)
+        assign_user_to_page(page_b, self.user_normal, grant_on=ACCESS_PAGE_AND_CHILDREN, can_change=True)
+        assign_user_to_page(page_c, self.user_normal, grant_on=ACCESS_PAGE, can_add=True, can_move_page=True)
+        site = Site.objects.get_current()
+        pages = [self.home_page, page_b, page_c, page_d]
+        helpers = {
+            "add_page": user_can_add_subpage,
+            "change_page": user_can_change_page,
+            "change_page_advanced_settings": user_can_change_page_advanced_settings,
+            "change_page_permissions": user_can_change_page_permissions,
+            "move_page": user_can_move_page,
+            "publish_page": user_can_publish_page,
+        }
+
+        for user in (self.user_normal, self.user_super):
+            # Django's auth permissions (2), the global and the page permissions
+            with self.subTest(user=user.username), self.assertNumQueries(FuzzyInt(0, 4)):
+                allowed_actions = get_allowed_page_actions(user, site, pages)
+            expected = {
+                page.pk: {action for action, helper in helpers.items() if helper(user, page, site)}
+                for page in pages
+            }
+            self.assertEqual(allowed_actions, expected)
+        self.assertEqual(allowed_actions[page_d.pk], set(helpers))
+        self.assertRaises(ValueError, get_allowed_page_actions, self.user_normal, site, pages, actions=["view_page"])
+
 
 @override_settings(CMS_PERMISSION=True, CMS_RAW_ID_USERS=1)
 class PermissionAdminMigrationSafetyTests(CMSTestCase):
@@ -196,6 +328,32 @@ class PermissionTupleTests(CMSTestCase):
                 allowed = Page.objects.filter(perm.allow_list()).values_list("pk", flat=True)
                 self.assertEqual(set(allowed), expected)
 
+    def test_index_matches_contains(self):
+        pages = list(Page.objects.all())
+        grants = (ACCESS_PAGE, ACCESS_CHILDREN, ACCESS_PAGE_AND_CHILDREN,
+                  ACCESS_DESCENDANTS, ACCESS_PAGE_AND_DESCENDANTS)
+        for grant_on in grants:
+            for page in (self.root, self.child):
+                with self.subTest(grant_on=grant_on, page=page.path):
+                    perm = PermissionTuple((grant_on, page.path))
+                    index = PermissionTupleIndex([perm])
+                    for other in pages:
+                        self.assertEqual(index.contains(other.path), perm.contains(other.path))
+                        self.assertEqual(index.get_values(other.path), [None] if perm.contains(other.path) else [])
+
+    def test_index_values(self):
+        index = PermissionTupleIndex()
+        index.add((ACCESS_PAGE, self.root.path), "root")
+        index.add((ACCESS_DESCENDANTS, self.root.path), "below root")
+        index.add((ACCESS_PAGE_AND_CHILDREN, self.child.path), "child")
+        index.add((ACCESS_PAGE, self.sibling.path), "sibling")
+
+        self.assertEqual(index.get_values(self.root.path), ["root"])
+        self.assertEqual(index.get_values(self.child.path), ["below root", "child"])
+        self.assertEqual(index.get_values(self.grandchild.path), ["below root", "child"])
+        self.assertEqual(index.get_values(self.sibling.path), ["sibling"])
+        self.assertFalse(PermissionTupleIndex())
+
     def test_allow_list_with_related_field_prefix(self):
         user = self._create_user("perm-user", is_staff=True)
         for page in (self.root, self.child, self.grandchild, self.sibling):
@@ -9,8 +9,10 @@ from django.conf import settings
 from django.contrib import admin
 from django.contrib.admin.widgets import FilteredSelectMultiple, RelatedFieldWidgetWrapper
 from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
 from django.forms.widgets import Media
 from django.test.testcases import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import re_path, reverse
 from django.utils import timezone
 from django.utils.encoding import force_str
@@ -43,7 +45,7 @@ from cms.test_utils.testcases import CMSTestCase
 from cms.test_utils.util.context_managers import override_placeholder_conf
 from cms.toolbar.toolbar import CMSToolbar
 from cms.toolbar.utils import get_object_edit_url
-from cms.utils.plugins import copy_plugins_to_placeholder, get_plugins
+from cms.utils.plugins import copy_plugins_to_placeholder, downcast_plugins, get_plugins
 
 
 @contextmanager
@@ -483,6 +485,41 @@ class PluginsTestCase(PluginsTestBaseCase):
         for old_plugin, new_plugin in zip(old_plugins, new_plugins, strict=False):
             self.assertEqual(old_plugin.get_children().count(), new_plugin.get_children().count())
 
+    def test_copy_plugins_query_count_does_not_grow_with_plugins(self):
+        def copy_grids(count):
+            page_en = api.create_page(f"Copy {count} (EN)", "nav_playground.html", "en")
+            page_de = api.create_page(f"Copy {count} (DE)", "nav_playground.html", "de")
+            ph_en = page_en.get_placeholders("en").get(slot="body")
+            ph_de = page_de.get_placeholders("de").get(slot="body")
+
+            for _ in range(count):
+                grid = api.add_plugin(ph_en, "MultiColumnPlugin", "en")
+                for _ in range(2):
+                    column = api.add_plugin(ph_en, "ColumnPlugin", "en", target=grid)
+                    api.add_plugin(ph_en, "LinkPlugin", "en", target=column, name="A Link", external_link="/")
+            plugins = list(downcast_plugins(ph_en.get_plugins_list("en")))
+
+            with CaptureQueriesContext(connection) as queries:
+                new_plugins = copy_plugins_to_placeholder(plugins, ph_de, language="de", plugins_are_downcast=True)
+            return ph_de, plugins, new_plugins, len(queries)
+
+        ph_de, plugins, new_plugins, few_queries = copy_grids(2)
+        self.assertEqual(len(new_plugins), 10)
+        ph_de, plugins, new_plugins, many_queries = copy_grids(10)
+        self.assertEqual(few_queries, many_queries)
+
+        copied = list(downcast_plugins(ph_de.get_plugins_list("de")))
+        self.assertEqual(
+            [(plugin.plugin_type, plugin.position) for plugin in copied],
+            [(plugin.plugin_type, plugin.position) for plugin in plugins],
+        )
+        positions = {plugin.pk: plugin.position for plugin in copied}
+        self.assertEqual(
+            [positions.get(plugin.parent_id) for plugin in copied],
+            [plugin.parent.position if plugin.parent_id else None for plugin in plugins],
+        )
+        self.assertEqual({plugin.name for plugin in copied if plugin.plugin_type == "LinkPlugin"}, {"A Link"})
+
     def test_copy_plugin_without_custom_model(self):
         page_en = api.create_page("CopyPluginTestPage (EN)", "nav_playground.html", "en")
         page_de = api.create_page("CopyPluginTestPage (DE)", "nav_playground.html", "de")
@@ -1220,6 +1257,53 @@ class PluginsTestCase(PluginsTestBaseCase):
             self.assertIn("ChildPlugin", child_classes)
             self.assertIn("ParentPlugin", child_classes)
 
+    @override_settings(CMS_PLUGIN_RENDER_PAYLOAD=True)
+    def test_downcast_plugins_from_render_payload(self):
+        page = api.create_page("Payload", "nav_playground.html", "en")
+        placeholder = page.get_placeholders("en").get(slot="body")
+        link = api.add_plugin(placeholder, "LinkPlugin", "en", name="A Link", external_link="https://example.com/")
+        text = api.add_plugin(placeholder, "TextPlugin", "en", body="<p>Text</p>")
+        text.json = {"type": "doc"}
+        text.save()
+
+        def get_plugins(placeholder):
+            return list(CMSPlugin.objects.filter(placeholder=placeholder).order_by("position"))
+
+        # the plugin models' tables are not queried
+        base_plugins = get_plugins(placeholder)
+        with self.assertNumQueries(0):
+            plugins = list(downcast_plugins(base_plugins, use_render_payload=True))
+        self.assertEqual([plugin.__class__ for plugin in plugins], [link.__class__, Text])
+        self.assertEqual((plugins[0].pk, plugins[0].name, plugins[0].external_link), (link.pk, link.name, link.external_link))
+        self.assertEqual((plugins[1].body, plugins[1].json), ("<p>Text</p>", {"type": "doc"}))
+        self.assertEqual(plugins[1].placeholder_id, placeholder.pk)
+
+        # copies get the payload of their source
+        target = api.create_page("Copy", "nav_playground.html", "en").get_placeholders("en").get(slot="body")
+        copy_plugins_to_placeholder(plugins, target, language="en", plugins_are_downcast=True)
+        base_plugins = get_plugins(target)
+        with self.assertNumQueries(0):
+            copies = list(downcast_plugins(base_plugins, use_render_payload=True))
+        self.assertEqual([plugin.name for plugin in copies[:1]], ["A Link"])
+
+        # payloads not matching the plugin model are ignored
+        CMSPlugin.objects.filter(pk=link.pk).update(render_payload={"name": "A Link"})
+        base_plugins = get_plugins(placeholder)
+        with self.assertNumQueries(1):
+            plugins = list(downcast_plugins(base_plugins, use_render_payload=True))
+        self.assertEqual(plugins[0].name, "A Link")
+
+        # only plugins to be rendered are built from a (possibly stale) payload
+        CMSPlugin.objects.filter(pk=link.pk).update(render_payload={"name": "Stale", "external_link": ""})
+        base_plugins = get_plugins(placeholder)
+        with self.assertNumQueries(2):
+            plugins = list(downcast_plugins(base_plugins))
+        self.assertEqual(plugins[0].name, "A Link")
+
+        with self.settings(CMS_PLUGIN_RENDER_PAYLOAD=False):
+            text.save()
+        self.assertIsNone(CMSPlugin.objects.get(pk=text.pk).render_payload)
+
     def test_plugin_pool_register_returns_plugin_class(self):
         @plugin_pool.register_plugin
         class DecoratorTestPlugin(CMSPluginBase):
@@ -1641,6 +1725,19 @@ class MTIPluginsTestCase(PluginsTestBaseCase):
         self.assertEqual("ALPHA", plugin_model.alpha)
         self.assertEqual("BETA", plugin_model.beta)
 
+    def test_copy_plugin(self):
+        from cms.test_utils.project.mti_pluginapp.models import TestPluginBetaModel
+
+        page = create_page("Test", "nav_playground.html", "en")
+        placeholder = page.get_placeholders("en").get(slot="body")
+        api.add_plugin(placeholder, "TestPluginBeta", "en", alpha="ALPHA", beta="BETA")
+
+        copy_plugins_to_placeholder(placeholder.get_plugins_list("en"), placeholder, language="de")
+
+        plugin = TestPluginBetaModel.objects.get(language="de")
+        self.assertEqual((plugin.alpha, plugin.beta, plugin.placeholder_id), ("ALPHA", "BETA", placeholder.pk))
+        self.assertEqual(CMSPlugin.objects.count(), 2)
+
     def test_related_name(self):
         from cms.test_utils.project.mti_pluginapp.models import (
             AbstractPluginParent,
@@ -1,3 +1,5 @@
+from unittest import mock
+
 from django.core.cache import cache
 from django.http.response import Http404
 from django.test.utils import override_settings
@@ -27,6 +29,13 @@ def sample_plugin_processor(instance, placeholder, rendered_content, original_co
     return f'{rendered_content}|test_plugin_processor_ok|{instance.body}|{placeholder.slot}|{original_context_var}'
 
 
+def sample_link_plugin_processor(instance, placeholder, rendered_content, original_context):
+    return f'{rendered_content}|test_link_plugin_processor_ok'
+
+
+sample_link_plugin_processor.plugin_types = ["Link*"]
+
+
 def sample_plugin_context_processor(instance, placeholder, original_context):
     content = 'test_plugin_context_processor_ok|' + instance.body + '|' + \
         placeholder.slot + '|' + original_context['original_context_var']
@@ -355,6 +364,28 @@ class RenderingTestCase(CMSTestCase):
         self.assertEqual(r, expected)
         plugin_rendering._standard_processors = {}
 
+    def test_processors_plugin_types(self):
+        from cms.plugin_pool import plugin_pool
+
+        processors = (
+            'cms.tests.test_rendering.sample_plugin_processor',
+            'cms.tests.test_rendering.sample_link_plugin_processor',
+        )
+        with self.settings(CMS_PLUGIN_PROCESSORS=processors):
+            self.assertEqual(plugin_pool.get_plugin_processors("TextPlugin"), (sample_plugin_processor,))
+            self.assertEqual(
+                plugin_pool.get_plugin_processors("LinkPlugin"),
+                (sample_plugin_processor, sample_link_plugin_processor),
+            )
+            self.assertEqual(plugin_pool.get_plugin_context_processors("LinkPlugin"), ())
+
+            with mock.patch("cms.plugin_pool.import_string") as import_string:
+                plugin_pool.get_plugin_processors("LinkPlugin")
+            import_string.assert_not_called()
+
+        # a change of the setting takes effect right away
+        self.assertEqual(plugin_pool.get_plugin_processors("LinkPlugin"), ())
+
     def test_placeholder(self):
         """
         Tests the {% placeholder %} templatetag.
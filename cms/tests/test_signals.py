@@ -1,4 +1,5 @@
 import warnings
+from unittest.mock import patch
 
 from django.conf import settings
 from django.test.utils import override_settings
@@ -9,6 +10,7 @@ from cms.signals import move_page, urls_need_reloading
 from cms.test_utils.project.sampleapp.cms_apps import SampleApp
 from cms.test_utils.testcases import CMSTestCase
 from cms.test_utils.util.context_managers import apphooks, signal_tester
+from cms.utils import apphook_reload
 from cms.utils.compat.warnings import RemovedInDjangoCMS60Warning
 
 overrides = {
@@ -109,3 +111,54 @@ class SignalTests(CMSTestCase):
                     self.assertEqual(env.call_count, 1)
                     new_revision, _ = UrlconfRevision.get_or_create_revision()
                     self.assertNotEqual(current_revision, new_revision)
+
+
+class ApphookReloadTests(CMSTestCase):
+    def setUp(self):
+        super().setUp()
+        apphook_reload.set_local_revision(None)
+        self.addCleanup(apphook_reload.set_local_revision, None)
+
+    def test_revision_is_read_from_cache(self):
+        apphook_reload.ensure_urlconf_is_up_to_date()
+
+        with self.assertNumQueries(0), patch.object(apphook_reload, "reload_urlconf") as reload_urlconf:
+            apphook_reload.ensure_urlconf_is_up_to_date()
+        reload_urlconf.assert_not_called()
+
+        new_revision = apphook_reload.mark_urlconf_as_changed()
+        self.assertEqual(UrlconfRevision.get_or_create_revision()[0], new_revision)
+
+        with self.assertNumQueries(0), patch.object(apphook_reload, "reload_urlconf") as reload_urlconf:
+            apphook_reload.ensure_urlconf_is_up_to_date()
+        reload_urlconf.assert_called_once_with(new_revision=new_revision)
+
+    def test_cached_revision_expires(self):
+        with patch.object(apphook_reload.cache, "set", wraps=apphook_reload.cache.set) as cache_set:
+            revision = apphook_reload.get_global_revision()
+        cache_set.assert_called_once_with(
+            apphook_reload._get_revision_cache_key(), revision, apphook_reload.URLCONF_REVISION_CACHE_TIMEOUT
+        )
+
+        # Another process, with a cache of its own, changed the revision
+        UrlconfRevision.update_revision("changed")
+        self.assertEqual(apphook_reload.get_global_revision(), revision)
+        # Once the cached revision expired, the database is asked again
+        apphook_reload.cache.delete(apphook_reload._get_revision_cache_key())
+        self.assertEqual(apphook_reload.get_global_revision(), "changed")
+
+    @override_settings(CMS_APPHOOK_RELOAD_CHECK_INTERVAL=60)
+    def test_revision_check_interval(self):
+        apphook_reload.ensure_urlconf_is_up_to_date()
+        apphook_reload.set_global_revision()
+
+        with patch.object(apphook_reload, "get_global_revision") as get_global_revision:
+            apphook_reload.ensure_urlconf_is_up_to_date()
+        get_global_revision.assert_not_called()
+
+        # A change made by this process is picked up right away
+        new_revision = apphook_reload.mark_urlconf_as_changed()
+
+        with patch.object(apphook_reload, "reload_urlconf") as reload_urlconf:
+            apphook_reload.ensure_urlconf_is_up_to_date()
+        reload_urlconf.assert_called_once_with(new_revision=new_revision)
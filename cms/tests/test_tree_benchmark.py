@@ -0,0 +1,54 @@
+from django.contrib.sites.models import Site
+
+from cms.models import Page
+from cms.test_utils import tree_benchmark
+from cms.test_utils.testcases import CMSTestCase
+
+
+class TreeBenchmarkTests(CMSTestCase):
+    def test_shapes(self):
+        for shape in tree_benchmark.SHAPES:
+            with self.subTest(shape=shape):
+                parents, subject, target = tree_benchmark.get_shape(shape, 100)
+                self.assertTrue(all(parent is None or parent < index for index, parent in enumerate(parents)))
+                self.assertIsNotNone(parents[subject])
+                self.assertIsNotNone(parents[target])
+                self.assertNotEqual(subject, target)
+
+    def test_build_tree(self):
+        parents, _, _ = tree_benchmark.get_shape("mixed", 40)
+        pages = tree_benchmark.build_tree(parents, Site.objects.get_current())
+        tree = list(Page.get_tree())
+
+        self.assertEqual(len(tree), 40)
+        self.assertEqual(tree[0].pk, pages[0].pk)
+        self.assertEqual(
+            [page.numchild for page in tree],
+            [page.get_children().count() for page in tree],
+        )
+        self.assertEqual(
+            [page.parent_id for page in pages[1:]],
+            [pages[parent].pk for parent in parents[1:]],
+        )
+
+    def test_benchmark_shape(self):
+        results = tree_benchmark.benchmark_shape("deep", 80, 1, self.get_superuser())
+
+        self.assertEqual(
+            [(result["operation"], result["position"]) for result in results],
+            [
+                ("add", "first-child"),
+                ("add", "last-child"),
+                ("move", "first-child"),
+                ("move", "last-child"),
+                ("move", "left"),
+                ("move", "right"),
+                ("copy", "last-child"),
+                ("delete", None),
+                ("rebuild", None),
+            ],
+        )
+        self.assertTrue(all(len(result["seconds"]) == 1 and result["queries"] for result in results))
+        self.assertEqual(results[0]["subtree"], 20)
+        # Every run is rolled back
+        self.assertFalse(Page.objects.exists())
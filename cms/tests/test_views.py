@@ -16,7 +16,7 @@ from django.utils.translation import override as force_language
 
 from cms.api import create_page, create_page_content
 from cms.middleware.toolbar import ToolbarMiddleware
-from cms.models import PageContent, PagePermission, Placeholder, UserSettings
+from cms.models import Page, PageContent, PagePermission, Placeholder, UserSettings
 from cms.page_rendering import _handle_no_page
 from cms.test_utils.testcases import CMSTestCase
 from cms.test_utils.util.fuzzy_int import FuzzyInt
@@ -26,7 +26,7 @@ from cms.toolbar.utils import (
     get_object_structure_url,
 )
 from cms.utils.conf import get_cms_setting
-from cms.utils.page import get_page_from_request
+from cms.utils.page import get_page_from_request, prefetch_page_contents
 from cms.utils.urlutils import admin_reverse
 from cms.views import details, login, render_object_structure
 from menus.menu_pool import menu_pool
@@ -420,14 +420,57 @@ class ViewTests(CMSTestCase):
         create_page("home", "simple.html", "en")
         cms_page = create_page("dreinhardt", "simple.html", "en")
         url = cms_page.get_absolute_url()
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(4):
             # 1. get_page_from_request: checks PageUrl
-            # 2. get page contents: PageContent
+            # 2. get page contents along with their placeholders
             # 3. Check permissions
-            # 4. Get placeholders
-            # 5. Get plugins
+            # 4. Get plugins
             self.client.get(url)
 
+    def test_prefetch_page_contents(self):
+        page = create_page("page", "nav_playground.html", "en")
+        create_page_content("de", "Seite", page)
+        # A content without placeholders
+        Placeholder.objects.get_for_obj(create_page_content("fr", "page", page)).delete()
+
+        for content in PageContent.objects.filter(page=page, language__in=["en", "de"]):
+            content.rescan_placeholders()
+        expected = {
+            content.language: list(Placeholder.objects.get_for_obj(content).order_by("pk"))
+            for content in PageContent.objects.filter(page=page)
+        }
+        page = Page.objects.get(pk=page.pk)
+
+        with self.assertNumQueries(1):
+            prefetch_page_contents(page)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(sorted(page.page_content_cache), ["de", "en", "fr"])
+
+            for language in ("en", "de", "fr"):
+                content = page.get_content_obj(language)
+                placeholders = Placeholder.objects.get_for_obj(content)
+                self.assertEqual(list(placeholders), expected[language])
+                self.assertTrue(all(placeholder.source is content for placeholder in placeholders))
+                self.assertIs(content.page, page)
+        self.assertTrue(expected["en"])
+        self.assertEqual(expected["fr"], [])
+
+        # Querying the placeholders further still hits the database
+        with self.assertNumQueries(1):
+            self.assertTrue(Placeholder.objects.get_for_obj(page.get_content_obj("en")).filter(slot="body").exists())
+
+        # Rescanning after prefetching creates missing placeholders only once
+        Placeholder.objects.get_for_obj(page.get_content_obj("en")).filter(slot="body").delete()
+        page = Page.objects.get(pk=page.pk)
+        prefetch_page_contents(page)
+        content = page.get_content_obj("en")
+        content.rescan_placeholders()
+        content.rescan_placeholders()
+        slots = list(Placeholder.objects.get_for_obj(content).values_list("slot", flat=True))
+        self.assertEqual(sorted(slots), sorted(set(slots)))
+        self.assertIn("body", slots)
+
 
 @override_settings(ROOT_URLCONF="cms.test_utils.project.urls")
 class ContextTests(CMSTestCase):
@@ -1,5 +1,6 @@
 import logging
 import sys
+import time
 import uuid
 
 # Py2 and Py3 compatible reload
@@ -7,17 +8,40 @@ from importlib import reload
 from threading import local
 
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import clear_url_caches
 
+from cms.utils.conf import get_cms_setting
+
 logger = logging.getLogger("cms")
 
 _urlconf_revision = {}
 _urlconf_revision_threadlocal = local()
+_urlconf_revision_checked_at = {}
 
 use_threadlocal = False
 
+# How long (in seconds) the urlconf revision is cached. The database stays the
+# source of truth, so with a cache that is not shared between processes, e.g.
+# Django's local-memory cache, other processes see a change after this delay.
+URLCONF_REVISION_CACHE_TIMEOUT = 5
+
+
+def _get_revision_cache_key():
+    return f"{get_cms_setting('CACHE_PREFIX')}urlconf_revision"
+
 
 def ensure_urlconf_is_up_to_date():
+    interval = get_cms_setting('APPHOOK_RELOAD_CHECK_INTERVAL')
+
+    if interval:
+        now = time.monotonic()
+        checked_at = _urlconf_revision_checked_at.get('checked_at')
+
+        if checked_at is not None and now - checked_at < interval and get_local_revision():
+            return
+        _urlconf_revision_checked_at['checked_at'] = now
+
     global_revision = get_global_revision()
     local_revision = get_local_revision()
 
@@ -51,9 +75,19 @@ def set_local_revision(revision):
 
 
 def get_global_revision():
+    """
+    Returns the current urlconf revision. It is read from the cache, which
+    set_global_revision() keeps up to date, so the database is only queried
+    once every URLCONF_REVISION_CACHE_TIMEOUT seconds.
+    """
     from ..models import UrlconfRevision
-    revision, _ = UrlconfRevision.get_or_create_revision(
-        revision=str(uuid.uuid4()))
+
+    revision = cache.get(_get_revision_cache_key())
+
+    if revision is None:
+        revision, _ = UrlconfRevision.get_or_create_revision(
+            revision=str(uuid.uuid4()))
+        cache.set(_get_revision_cache_key(), revision, URLCONF_REVISION_CACHE_TIMEOUT)
     return revision
 
 
@@ -62,11 +96,14 @@ def set_global_revision(new_revision=None):
     if new_revision is None:
         new_revision = str(uuid.uuid4())
     UrlconfRevision.update_revision(new_revision)
+    cache.set(_get_revision_cache_key(), new_revision, URLCONF_REVISION_CACHE_TIMEOUT)
 
 
 def mark_urlconf_as_changed():
     new_revision = str(uuid.uuid4())
     set_global_revision(new_revision=new_revision)
+    # Make this process pick the change up on its next request
+    _urlconf_revision_checked_at.clear()
     return new_revision
 
 
@@ -64,9 +64,19 @@ DEFAULTS = {
     'PAGE_MEDIA_PATH': 'cms_page_media/',
     'TITLE_CHARACTER': '+',
     'PAGE_CACHE': True,
+    'PAGE_CACHE_TAGS': False,
+    'PAGE_CACHE_STALE_WHILE_REVALIDATE': False,
+    'PAGE_CACHE_LOCK_TIMEOUT': 10,
+    'PAGE_CACHE_LOCK_WAIT': 1,
+    'PAGE_URL_CACHE': False,
+    'PAGE_URL_CACHE_SIZE': 1000,
+    'PERMISSION_LOCAL_CACHE_DURATION': 0,
+    'APPHOOK_RELOAD_CHECK_INTERVAL': 0,
     'PLACEHOLDER_CACHE': True,
     'PLUGIN_CACHE': True,
+    'PLUGIN_RENDER_PAYLOAD': False,
     'MENU_CACHE_BACKEND': 'default',
+    'MENU_CACHE_PER_USER': True,
     'CACHE_PREFIX': f'cms_{__version__}_',
     'PLUGIN_PROCESSORS': [],
     'PLUGIN_CONTEXT_PROCESSORS': [],
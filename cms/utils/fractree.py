@@ -0,0 +1,342 @@
+"""
+Fractional-ordering tree backend
+
+Selected with ``CMS_TREE_BACKEND = "fractional"``. The materialized-path
+backend (:mod:`cms.utils.mptree`) stores sibling order as contiguous steps in
+``path``, so inserting or moving a node into the middle of a sibling group
+renumbers every following sibling's subtree, and the fixed ``steplen=4`` caps
+the tree at about 63 levels and 36^4 siblings per node.
+
+This backend orders siblings by a *fractional key* instead: for any two keys
+``a < b`` there is always a key strictly between them (see
+:func:`key_between`). A node is inserted or moved between two siblings by
+writing only that node -- and, for a move, the paths of its own subtree in the
+same single statement as before. Siblings are never renumbered, and the depth
+and width ceilings are gone; only the length of the ``path`` column remains.
+
+A node's key is the last segment of its ``path``: the keys of the node's
+ancestors and of the node itself, each followed by :data:`SEPARATOR`::
+
+    I10         root with the key "I1"
+    I10I10      its first child
+    I10I20      its second child
+    I10I1I0     a child inserted between the two
+
+Keys are written with the digits and upper-case letters, except for the
+separator ``0``. The separator sorts before every key character, in Python and
+in any database collation treebeard's own alphabet works with, so ordering by
+``path`` still yields depth-first order and ``path__startswith=node.path``
+still selects exactly the node's subtree. All reads are unchanged.
+
+``(parent_id, key)`` is the source of truth; ``path``, ``depth`` and
+``numchild`` can be recomputed from it. Keeping the key in ``path`` instead of
+a separate column means this backend declares the same fields as the other
+two, so switching backends needs no schema migration, only rewritten paths:
+
+* To switch to this backend, set ``CMS_TREE_BACKEND = "fractional"`` and run
+  ``manage.py cms rebuild-tree``. Migration ``0046`` does this if the backend
+  is active while migrating.
+* To switch back, run ``CMS_TREE_BACKEND=mptree manage.py cms rebuild-tree``
+  first, which writes treebeard-compatible paths, and then change the setting.
+
+Keys grow when nodes are repeatedly inserted at the same spot. ``rebuild-tree``
+renormalises them to the shortest keys; a path that no longer fits the ``path``
+column raises :class:`~cms.utils.mptree.TreePathOverflow` instead of being
+truncated.
+"""
+
+from cms.utils.mptree import (
+    MaterializedPath,
+    MaterializedPathMixin,
+    _atomic_on_alias,
+    get_path_prefixes,
+)
+
+DIGITS = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+SEPARATOR = "0"
+
+# A key is an integer part followed by an optional fraction. The first
+# character of the integer part encodes its length: "I" to "Z" start
+# non-negative integers of 1 to 18 digits, "H" down to "1" negative ones of 1 to
+# 17 digits. Longer positive integers thus sort after shorter ones and longer
+# negative integers before, so keys compare like the numbers they encode.
+_ZERO_HEAD = DIGITS.index("I")
+INTEGER_ZERO = DIGITS[_ZERO_HEAD] + DIGITS[0]
+SMALLEST_INTEGER = DIGITS[0] * (_ZERO_HEAD + 1)
+
+
+def _integer_length(head):
+    index = DIGITS.find(head)
+    if index < 0:
+        raise ValueError(f"Invalid order key head {head!r}.")
+    if index >= _ZERO_HEAD:
+        return index - _ZERO_HEAD + 2
+    return _ZERO_HEAD - index + 1
+
+
+def _split_key(key):
+    if not key or any(char not in DIGITS for char in key):
+        raise ValueError(f"Invalid order key {key!r}.")
+    length = _integer_length(key[0])
+    if len(key) < length or key == SMALLEST_INTEGER or key[length:].endswith(DIGITS[0]):
+        raise ValueError(f"Invalid order key {key!r}.")
+    return key[:length], key[length:]
+
+
+def _increment_integer(integer):
+    head, digits = integer[0], list(integer[1:])
+    for pos in reversed(range(len(digits))):
+        index = DIGITS.index(digits[pos]) + 1
+        if index < len(DIGITS):
+            digits[pos] = DIGITS[index]
+            return head + "".join(digits)
+        digits[pos] = DIGITS[0]
+    # Carried over: the integer needs one more digit (or one less, if negative)
+    if head == DIGITS[_ZERO_HEAD - 1]:
+        return INTEGER_ZERO
+    if head == DIGITS[-1]:
+        return None
+    head_index = DIGITS.index(head) + 1
+    if head_index > _ZERO_HEAD:
+        digits.append(DIGITS[0])
+    else:
+        digits.pop()
+    return DIGITS[head_index] + "".join(digits)
+
+
+def _decrement_integer(integer):
+    head, digits = integer[0], list(integer[1:])
+    for pos in reversed(range(len(digits))):
+        index = DIGITS.index(digits[pos]) - 1
+        if index >= 0:
+            digits[pos] = DIGITS[index]
+            return head + "".join(digits)
+        digits[pos] = DIGITS[-1]
+    if head == DIGITS[_ZERO_HEAD]:
+        return DIGITS[_ZERO_HEAD - 1] + DIGITS[-1]
+    if head == DIGITS[0]:
+        return None
+    head_index = DIGITS.index(head) - 1
+    if head_index < _ZERO_HEAD - 1:
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return DIGITS[head_index] + "".join(digits)
+
+
+def _midpoint(lower, upper):
+    """
+    A fraction strictly between the fractions ``lower`` and ``upper``, where
+    ``upper=None`` stands for 1. Neither may end with the zero digit, which is
+    what keeps a fraction below every other one available.
+    """
+    if upper is not None:
+        # Skip the common prefix; missing digits of «lower» count as zeros.
+        common = 0
+        while (lower[common] if common < len(lower) else DIGITS[0]) == upper[common]:
+            common += 1
+        if common:
+            return upper[:common] + _midpoint(lower[common:], upper[common:])
+
+    lower_digit = DIGITS.index(lower[0]) if lower else 0
+    upper_digit = DIGITS.index(upper[0]) if upper is not None else len(DIGITS)
+    if upper_digit - lower_digit > 1:
+        return DIGITS[(lower_digit + upper_digit + 1) // 2]
+    # Adjacent digits: keep «lower»'s digit and continue on the next one
+    if upper is not None and len(upper) > 1:
+        return upper[0]
+    return DIGITS[lower_digit] + _midpoint(lower[1:], None)
+
+
+def key_between(lower, upper):
+    """
+    Return an order key that sorts strictly between ``lower`` and ``upper``.
+    Either bound may be ``None`` for "before the first" or "after the last"
+    key. Appending and prepending step the integer part, so a long run of
+    them yields short keys. Inserting between two keys extends the fraction.
+    """
+    if lower is not None:
+        _split_key(lower)
+    if upper is not None:
+        _split_key(upper)
+    if lower is not None and upper is not None and lower >= upper:
+        raise ValueError(f"Order key {lower!r} is not below {upper!r}.")
+
+    if lower is None:
+        if upper is None:
+            return INTEGER_ZERO
+        integer, fraction = _split_key(upper)
+        if integer == SMALLEST_INTEGER:
+            return integer + _midpoint("", fraction)
+        if integer < upper:
+            return integer
+        key = _decrement_integer(integer)
+        if key is None:
+            raise ValueError("Cannot generate an order key below the smallest one.")
+        return key
+
+    integer, fraction = _split_key(lower)
+    if upper is None:
+        key = _increment_integer(integer)
+        return key if key is not None else integer + _midpoint(fraction, None)
+
+    upper_integer, upper_fraction = _split_key(upper)
+    if integer == upper_integer:
+        return integer + _midpoint(fraction, upper_fraction)
+    key = _increment_integer(integer)
+    if key is not None and key < upper:
+        return key
+    return integer + _midpoint(fraction, None)
+
+
+def sequential_keys(count):
+    """The ``count`` shortest ascending order keys, as ``rebuild()`` assigns them."""
+    keys = []
+    key = None
+    for _ in range(count):
+        key = key_between(key, None)
+        keys.append(key)
+    return keys
+
+
+class FractionalPath(MaterializedPath):
+    """
+    The driver of the fractional backend. Reads, locking, the set-based
+    subtree rewrite and the two-pass rebuild are inherited from
+    :class:`~cms.utils.mptree.MaterializedPath`; what differs is how a node's
+    own path segment is chosen: a new key between its future neighbours
+    instead of a step that shifts them.
+    """
+
+    def key_of(self, path):
+        """The order key of the node at ``path``, i.e. its last segment."""
+        return path[:-1].rpartition(SEPARATOR)[2]
+
+    # -- read queries ----------------------------------------------------
+
+    def ancestors(self, node):
+        paths = get_path_prefixes(node.path, None)[:-1]
+        if not paths:
+            return self.model._default_manager.using(self.db_alias).none()
+        return self._scoped().filter(path__in=paths).order_by("path")
+
+    def root_of(self, node):
+        return self._scoped().get(path=get_path_prefixes(node.path, None)[0])
+
+    # -- keys --------------------------------------------------------------
+
+    def _new_path(self, parent_path, parent_depth, position, sibling=None, exclude_pk=None):
+        """
+        The path for a new child of the node at ``parent_path``: ``"first"``
+        or ``"last"`` among its children, or directly ``"left"`` or
+        ``"right"`` of the child ``sibling``. ``exclude_pk`` is the node being
+        moved, whose current slot is about to be vacated.
+        """
+        siblings = self._scoped().filter(path__startswith=parent_path, depth=parent_depth + 1)
+        if exclude_pk is not None:
+            siblings = siblings.exclude(pk=exclude_pk)
+        paths = siblings.order_by("path").values_list("path", flat=True)
+
+        if position == "first":
+            lower, upper = None, paths.first()
+        elif position == "left":
+            lower, upper = paths.filter(path__lt=sibling.path).last(), sibling.path
+        elif position == "right":
+            lower, upper = sibling.path, paths.filter(path__gt=sibling.path).first()
+        else:
+            lower, upper = paths.last(), None
+        key = key_between(
+            self.key_of(lower) if lower is not None else None,
+            self.key_of(upper) if upper is not None else None,
+        )
+        path = parent_path + key + SEPARATOR
+        self._ensure_path_fits(path)
+        return path
+
+    # -- build -------------------------------------------------------------
+
+    @_atomic_on_alias
+    def add_root(self, instance=None, **attrs):
+        self._lock_rows(*self.roots().values_list("pk", flat=True))
+        return self._materialise(
+            instance, attrs, path=self._new_path("", 0, "last"), depth=1, parent=None
+        )
+
+    @_atomic_on_alias
+    def add_child(self, parent, position="last-child", instance=None, **attrs):
+        self._lock_rows(parent.pk)
+        self._refresh(parent)
+        path = self._new_path(
+            parent.path, parent.depth, "first" if position == "first-child" else "last"
+        )
+        node = self._materialise(
+            instance, attrs, path=path, depth=parent.depth + 1, parent=parent
+        )
+        self._bump_numchild(parent.pk, +1)
+        parent.numchild = (parent.numchild or 0) + 1  # keep caller's instance honest
+        return node
+
+    @_atomic_on_alias
+    def add_sibling(self, node, position="last-sibling", instance=None, **attrs):
+        self._lock_rows(node.pk)
+        self._refresh(node)
+        parent = node.parent
+        if parent is not None:
+            self._lock_rows(parent.pk)
+            self._refresh(parent)
+        parent_path = parent.path if parent else ""
+        parent_depth = parent.depth if parent else 0
+        position = {"first-sibling": "first", "left": "left", "right": "right"}.get(position, "last")
+        new = self._materialise(
+            instance,
+            attrs,
+            path=self._new_path(parent_path, parent_depth, position, sibling=node),
+            depth=parent_depth + 1,
+            parent=parent,
+        )
+        if parent is not None:
+            self._bump_numchild(parent.pk, +1)
+            parent.numchild = (parent.numchild or 0) + 1
+        return new
+
+    # -- move --------------------------------------------------------------
+
+    def _place(self, node, target, pos, new_parent):
+        # One set-based rewrite of the node's subtree, whatever the position.
+        # The new key is unused among the new siblings, so no path of the
+        # subtree can collide with an existing one, and no parking is needed.
+        parent_path = new_parent.path if new_parent else ""
+        parent_depth = new_parent.depth if new_parent else 0
+        position = {"first-child": "first", "left": "left", "right": "right"}.get(pos, "last")
+        new_prefix = self._new_path(
+            parent_path, parent_depth, position, sibling=target, exclude_pk=node.pk
+        )
+        self._reprefix(
+            old_prefix=node.path, new_prefix=new_prefix, depth_delta=(parent_depth + 1) - node.depth
+        )
+
+    # -- rebuild (renormalise keys) ----------------------------------------
+
+    def _sibling_segments(self, count):
+        # rebuild() keeps the sibling order read from the current paths, in
+        # either encoding, and assigns the shortest keys: converting a tree to
+        # this backend and renormalising grown keys are the same operation.
+        return [key + SEPARATOR for key in sequential_keys(count)]
+
+
+class FractionalTreeMixin(MaterializedPathMixin):
+    """
+    Base for ``Page`` under the fractional backend: the API of
+    :class:`~cms.utils.mptree.MaterializedPathMixin` with the same fields,
+    delegating to :class:`FractionalPath`.
+    """
+
+    # Path segments have no fixed length, see get_path_prefixes()
+    steplen = None
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def _tree(cls, using=None):
+        return FractionalPath(cls, using=using)
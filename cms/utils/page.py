@@ -104,14 +104,18 @@ def get_page_from_request(request, use_path=None, clean_path=None):
             pass
 
     site = get_current_site(request)
-    page_urls = (
-        PageUrl
-        .objects
-        .get_for_site(site)
-        .filter(path=path)
-        .select_related("page", "page__site")
-    )
-    page_urls = list(page_urls)  # force queryset evaluation to save 1 query
+
+    if get_cms_setting("PAGE_URL_CACHE"):
+        page_urls = _get_cached_page_urls(site, path)
+    else:
+        page_urls = (
+            PageUrl
+            .objects
+            .get_for_site(site)
+            .filter(path=path)
+            .select_related("page", "page__site")
+        )
+        page_urls = list(page_urls)  # force queryset evaluation to save 1 query
     try:
         page = page_urls[0].page
         if page_urls[0].language == get_language_from_request(request):
@@ -121,6 +125,94 @@ def get_page_from_request(request, use_path=None, clean_path=None):
     return page
 
 
+def _get_cached_page_urls(site, path):
+    """
+    Returns the urls matching «path» on «site» like get_page_from_request(),
+    but served from the page url cache (see cms.cache.page_url) when possible.
+    The urls share a single page instance with «site» as its site.
+    """
+    from cms.cache.page_url import get_cached_page_urls
+    from cms.models import Page, PageUrl
+
+    page_fields = [field.attname for field in Page._meta.concrete_fields]
+    url_fields = [field.attname for field in PageUrl._meta.concrete_fields]
+
+    def load():
+        page_urls = list(PageUrl.objects.get_for_site(site).filter(path=path).select_related("page"))
+        if not page_urls:
+            return None
+        page = page_urls[0].page
+        return (
+            tuple(getattr(page, field) for field in page_fields),
+            [tuple(getattr(url, field) for field in url_fields) for url in page_urls],
+        )
+
+    rows = get_cached_page_urls(site.pk, path, load)
+
+    if rows is None:
+        return []
+
+    page_row, url_rows = rows
+    db = PageUrl.objects.db
+    page = Page.from_db(db, page_fields, page_row)
+    page._state.fields_cache["site"] = site
+    page_urls = [PageUrl.from_db(db, url_fields, url_row) for url_row in url_rows]
+
+    for url in page_urls:
+        url._state.fields_cache["page"] = page
+    return page_urls
+
+
+def prefetch_page_contents(page):
+    """
+    Loads the public contents of «page» in all languages together with their
+    placeholders, in a single query.
+
+    The contents are put into the content cache of the page and the
+    placeholders into the prefetch cache of their content, which is where
+    ``Placeholder.objects.get_for_obj()`` looks for them first. Rendering the
+    page then needs no further query for either.
+    """
+    from cms.models import PageContent, Placeholder
+
+    content_fields = PageContent._meta.concrete_fields
+    placeholder_fields = Placeholder._meta.concrete_fields
+    queryset = page.pagecontent_set.all()
+    # The placeholders are joined through their generic relation, one row per
+    # placeholder, or a single row without one for contents that have none.
+    rows = queryset.order_by("pk", "placeholders__pk").values_list(
+        *(field.name for field in content_fields),
+        *(f"placeholders__{field.name}" for field in placeholder_fields),
+    )
+    content_pk_index = content_fields.index(PageContent._meta.pk)
+    placeholder_pk_index = len(content_fields) + placeholder_fields.index(Placeholder._meta.pk)
+    contents = {}
+    placeholders = {}
+
+    for row in rows:
+        content_pk = row[content_pk_index]
+
+        if content_pk not in contents:
+            content = PageContent.from_db(queryset.db, None, row[:len(content_fields)])
+            PageContent.page.field.set_cached_value(content, page)
+            contents[content_pk] = content
+            placeholders[content_pk] = []
+
+        if row[placeholder_pk_index] is not None:
+            placeholder = Placeholder.from_db(queryset.db, None, row[len(content_fields):])
+            placeholder._state.fields_cache["source"] = contents[content_pk]
+            placeholders[content_pk].append(placeholder)
+
+    for content in contents.values():
+        # The same as prefetch_related("placeholders") would do
+        content_placeholders = content.placeholders.all()
+        content_placeholders._result_cache = placeholders[content.pk]
+        content_placeholders._prefetch_done = True
+        content._prefetched_objects_cache = {"placeholders": content_placeholders}
+        page.page_content_cache[content.language] = content
+    return page
+
+
 def get_available_slug(site, path, language, suffix='copy', modified=False):
     """
     Generates slug for path.
@@ -144,3 +236,290 @@ def get_available_slug(site, path, language, suffix='copy', modified=False):
         path = f'{base}/{slug}' if base else slug
         return get_available_slug(site, path, language, suffix, modified=True)
     return slug
+
+
+def _can_bulk_copy_pages():
+    """
+    Returns True if pages can be copied with bulk inserts, i.e., no versioning
+    package replaced the page content managers and no save signal receivers
+    other than the ones of django CMS itself, whose effects PageTreeCopy
+    replays, are connected to the models involved.
+    """
+    from django.db import connections, router
+    from django.db.models import signals
+
+    from cms.models import Page, PageContent, PageUrl, Placeholder
+    from cms.models.managers import ContentAdminManager, PageContentManager
+
+    if not connections[router.db_for_write(Page)].features.can_return_rows_from_bulk_insert:
+        return False
+    if type(PageContent.objects) is not PageContentManager or type(PageContent.admin_manager) is not ContentAdminManager:
+        return False
+
+    replayed = set(_get_replayed_save_receivers())
+
+    for signal in (signals.pre_save, signals.post_save):
+        for model in (Page, PageContent, PageUrl, Placeholder):
+            if not signal.has_listeners(model):
+                continue
+            sync_receivers, async_receivers = signal._live_receivers(model)
+
+            if set(sync_receivers).union(async_receivers) - replayed:
+                return False
+    return True
+
+
+def _get_replayed_save_receivers():
+    from cms.cache.choices import clean_page_choices_cache
+    from cms.signals.pagecontent import handle_pagecontent_post_save
+
+    return clean_page_choices_cache, handle_pagecontent_post_save
+
+
+class PageTreeCopy:
+    """
+    Copies the descendants of a page below an existing copy of the page, see
+    :meth:`cms.models.pagemodel.Page.copy_with_descendants`.
+
+    Each :meth:`step` copies one level of the subtree in a transaction. The
+    pages, their contents, urls, placeholders and permissions are created with
+    one bulk insert per model and the plugins of all placeholders with
+    :func:`cms.utils.plugins.copy_plugins_to_placeholders`. If a versioning
+    package or save signal receivers have to see each object being saved, the
+    pages are copied one by one with :meth:`cms.models.pagemodel.Page.copy`
+    instead.
+
+    The progress is kept in :attr:`state`, a JSON serializable dict. A copy
+    can run in the background, e.g., in a task queue, and continue after an
+    interruption with :meth:`from_state`, since a failed step is rolled back.
+    """
+
+    def __init__(self, source, new_page, user, copy_permissions=True, site=None):
+        from cms.utils.permissions import get_current_user_name
+
+        self.source_id = source.pk
+        self.new_page_id = new_page.pk
+        self.site_id = site.pk if site else new_page.site_id
+        self.user_id = user.pk
+        self.copy_permissions = copy_permissions
+        self.changed_by = get_current_user_name()
+        # Source page pk: copy pk of the pages whose children are copied next
+        self.parents = {source.pk: new_page.pk}
+
+    @property
+    def state(self):
+        return {
+            "source": self.source_id,
+            "new_page": self.new_page_id,
+            "site": self.site_id,
+            "user": self.user_id,
+            "copy_permissions": self.copy_permissions,
+            "changed_by": self.changed_by,
+            "parents": list(self.parents.items()),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        instance = cls.__new__(cls)
+        instance.source_id = state["source"]
+        instance.new_page_id = state["new_page"]
+        instance.site_id = state["site"]
+        instance.user_id = state["user"]
+        instance.copy_permissions = state["copy_permissions"]
+        instance.changed_by = state["changed_by"]
+        instance.parents = dict(state["parents"])
+        return instance
+
+    @property
+    def done(self):
+        return not self.parents
+
+    def run(self):
+        while self.step():
+            pass
+
+    def step(self):
+        """
+        Copies the next level of pages. Returns False once all descendants
+        have been copied.
+        """
+        from django.db import transaction
+
+        from cms.models import Page
+
+        if self.done:
+            return False
+
+        with transaction.atomic():
+            sources = list(
+                Page.objects.filter(parent_id__in=self.parents)
+                # The copy itself might be a child of a source page
+                .exclude(pk=self.new_page_id)
+                .order_by("path")
+            )
+            new_parents = Page.objects.prefetch_related("urls").in_bulk(self.parents.values())
+
+            if _can_bulk_copy_pages():
+                new_pages = self._bulk_copy(sources, new_parents)
+            else:
+                new_pages = self._copy(sources, new_parents)
+        self.parents = {source.pk: new_page.pk for source, new_page in zip(sources, new_pages, strict=True)
+                        if source.numchild}
+        return not self.done
+
+    def _copy(self, sources, new_parents):
+        from django.contrib.auth import get_user_model
+        from django.contrib.sites.models import Site
+
+        site = Site.objects.get(pk=self.site_id)
+        user = get_user_model().objects.get(pk=self.user_id)
+        return [
+            source.copy(
+                site,
+                parent_page=new_parents[self.parents[source.parent_id]],
+                translations=True,
+                permissions=self.copy_permissions,
+                user=user,
+            )
+            for source in sources
+        ]
+
+    def _bulk_copy(self, sources, new_parents):
+        from collections import Counter
+
+        from django.contrib.contenttypes.models import ContentType
+        from django.forms import model_to_dict
+
+        from cms.extensions import extension_pool
+        from cms.models import Page, PageContent, PagePermission, PageUrl, Placeholder
+        from cms.utils.i18n import get_fallback_languages
+        from cms.utils.mptree import TreePathOverflow, get_path_prefixes
+        from cms.utils.plugins import copy_plugins_to_placeholders
+
+        path_max_length = Page._meta.get_field("path").max_length
+        new_pages = []
+
+        for source in sources:
+            parent = new_parents[self.parents[source.parent_id]]
+            # The last path segment is the page's position among its siblings
+            path = parent.path + source.path[len(get_path_prefixes(source.path, source.steplen)[-2]):]
+
+            if len(path) > path_max_length:
+                raise TreePathOverflow(f"Path requires {len(path)} characters but Page.path allows {path_max_length}.")
+            new_pages.append(
+                Page(
+                    site_id=self.site_id,
+                    parent=parent,
+                    path=path,
+                    depth=parent.depth + 1,
+                    numchild=source.numchild,
+                    login_required=source.login_required,
+                    created_by=self.changed_by,
+                    changed_by=self.changed_by,
+                )
+            )
+        Page.objects.bulk_create(new_pages)
+
+        for parent_id, count in Counter(page.parent_id for page in new_pages).items():
+            if new_parents[parent_id].numchild != count:
+                # The copy of the subtree's root was created without children
+                Page.objects.filter(pk=parent_id).update(numchild=count)
+
+        new_pages_by_source = {source.pk: new_page for source, new_page in zip(sources, new_pages, strict=True)}
+        contents = list(PageContent.admin_manager.current_content(page__in=sources).order_by("pk"))
+        new_contents = []
+        new_urls = []
+        candidates = {}
+
+        def get_base_path(parent, language):
+            paths = {url.language: url.path for url in parent.urls.all()}
+
+            for lang in [language, *get_fallback_languages(language, site_id=self.site_id)]:
+                if lang in paths:
+                    return paths[lang]
+            return None
+
+        for content in contents:
+            parent = new_pages_by_source[content.page_id].parent
+            base = get_base_path(parent, content.language)
+            candidates[content.pk] = f"{base}/{content.slug}" if base else content.slug
+
+        taken = set(
+            PageUrl.objects.filter(site_id=self.site_id, path__in=set(candidates.values()))
+            .values_list("language", "path")
+        )
+
+        for content in contents:
+            new_page = new_pages_by_source[content.page_id]
+            base = get_base_path(new_page.parent, content.language)
+            slug = content.slug
+
+            if (content.language, candidates[content.pk]) in taken:
+                slug = get_available_slug(self.site_id, candidates[content.pk], content.language)
+
+            new_content = model_to_dict(content)
+            new_content.pop("id", None)
+            new_content.update(page=new_page, slug=slug)
+
+            if new_page.parent.is_home:
+                # Children of the home page live directly at the root
+                path = slug
+            else:
+                path = f"{base}/{slug}" if base else None
+
+            if content.overwrite_url:
+                new_content["overwrite_url"] = f"{base}/{slug}" if base else slug
+                path = new_content["overwrite_url"].strip("/")
+            new_contents.append(PageContent(**new_content))
+            new_urls.append(
+                PageUrl(
+                    page=new_page,
+                    site_id=self.site_id,
+                    language=content.language,
+                    slug=slug,
+                    path=path,
+                    managed=not content.overwrite_url,
+                )
+            )
+        PageContent.objects.bulk_create(new_contents)
+        PageUrl.objects.bulk_create(new_urls)
+
+        content_type = ContentType.objects.get_for_model(PageContent)
+        new_contents_by_source = {content.pk: new for content, new in zip(contents, new_contents, strict=True)}
+        placeholders = list(
+            Placeholder.objects.filter(content_type=content_type, object_id__in=new_contents_by_source)
+        )
+        new_placeholders = [
+            Placeholder(
+                slot=placeholder.slot,
+                default_width=placeholder.default_width,
+                content_type=content_type,
+                object_id=new_contents_by_source[placeholder.object_id].pk,
+            )
+            for placeholder in placeholders
+        ]
+        Placeholder.objects.bulk_create(new_placeholders)
+        copy_plugins_to_placeholders([
+            (placeholder, new_placeholder, new_contents_by_source[placeholder.object_id].language)
+            for placeholder, new_placeholder in zip(placeholders, new_placeholders, strict=True)
+        ])
+
+        if extension_pool.page_extensions or extension_pool.page_content_extensions:
+            for source in sources:
+                extension_pool.copy_extensions(source, new_pages_by_source[source.pk])
+
+        if self.copy_permissions and get_cms_setting("PERMISSION"):
+            permissions = list(PagePermission.objects.filter(page__in=sources))
+
+            for permission in permissions:
+                permission.pk = None
+                permission.page = new_pages_by_source[permission.page_id]
+            PagePermission.objects.bulk_create(permissions)
+
+        # Replay the post_save receivers of django CMS, see _can_bulk_copy_pages()
+        clean_page_choices_cache, handle_pagecontent_post_save = _get_replayed_save_receivers()
+        clean_page_choices_cache(sender=Page)
+
+        for new_content in new_contents:
+            handle_pagecontent_post_save(sender=PageContent, instance=new_content, created=True)
+        return new_pages
@@ -1,8 +1,15 @@
+import hashlib
 from functools import wraps
 
-from cms.cache.permissions import get_permission_cache, set_permission_cache
+from django.db.models import Q
+
+from cms.cache.permissions import (
+    PERMISSION_KEYS,
+    get_or_set_permission_snapshot,
+    set_permission_snapshot,
+)
 from cms.constants import GRANT_ALL_PERMISSIONS
-from cms.models import Page, PermissionTuple
+from cms.models import Page, PagePermission, PermissionTupleIndex
 from cms.utils.compat.dj import available_attrs
 from cms.utils.conf import get_cms_setting
 from cms.utils.permissions import (
@@ -31,6 +38,16 @@ _django_permissions_by_action = {
     'publish_page': [PAGE_CHANGE_CODENAME, PAGE_PUBLISH_CODENAME],
 }
 
+# The actions get_allowed_page_actions() evaluates, see there
+BULK_PAGE_ACTIONS = (
+    'add_page',
+    'change_page',
+    'change_page_advanced_settings',
+    'change_page_permissions',
+    'move_page',
+    'publish_page',
+)
+
 
 def _get_all_placeholders(page, language=None):
     from django.contrib.contenttypes.models import ContentType
@@ -60,22 +77,85 @@ def _get_page_permission_tuples_for_action(user, site, action, check_global=True
     if check_global and has_global_permission(user, site, action=action, use_cache=use_cache):
         return GRANT_ALL_PERMISSIONS
 
-    if use_cache:
-        # read from cache if possible
-        cached = get_permission_cache(user, action)
-        get_page_actions = get_page_actions_for_user
-    else:
-        cached = None
-        get_page_actions = get_page_actions_for_user.without_cache
+    if not use_cache:
+        return get_page_actions_for_user.without_cache(user, site)[action]
+
+    # All actions of the user on the site are cached as one snapshot
+    snapshot = get_or_set_permission_snapshot(
+        user,
+        lambda: _get_page_actions_snapshot(user, site),
+        site_id=site,
+    )
+    cached = snapshot.get(action)
 
     if cached is not None:
         return cached
 
-    page_actions = get_page_actions(user, site)
-    # Set cache for all actions calculated
-    for act, page_paths in page_actions.items():
-        set_permission_cache(user, act, list(page_paths))
-    return page_actions[action]
+    # The snapshot was stored without this action (see set_permission_cache())
+    snapshot = _get_page_actions_snapshot(user, site)
+    set_permission_snapshot(user, snapshot, site_id=site)
+    return snapshot.get(action, [])
+
+
+def _get_page_actions_snapshot(user, site):
+    page_actions = get_page_actions_for_user(user, site)
+    actions = set(PERMISSION_KEYS).union(page_actions)
+    return {action: list(page_actions[action]) for action in actions}
+
+
+@cached_func
+def get_page_permission_index(user, site, action, check_global=True):
+    """
+    Returns the page permissions of the user for the given action compiled
+    into a :class:`~cms.models.permissionmodels.PermissionTupleIndex`, or
+    GRANT_ALL_PERMISSIONS if the user has the permission on all pages.
+
+    The index is built once per user object, so checking many pages (like
+    the rows of the page tree) costs a lookup proportional to the depth of
+    each page instead of one pass over all permissions per page.
+    """
+    perm_tuples = _get_page_permission_tuples_for_action(user, site, action, check_global=check_global)
+
+    if perm_tuples == GRANT_ALL_PERMISSIONS:
+        return GRANT_ALL_PERMISSIONS
+    return PermissionTupleIndex(perm_tuples)
+
+
+def get_allowed_page_actions(user, site, pages, actions=BULK_PAGE_ACTIONS):
+    """
+    Returns a dictionary mapping the id of each of the given pages of «site»
+    to the set of the given actions the user may perform on it.
+
+    The result for each action matches the corresponding helper, i.e.,
+    user_can_add_subpage() for ``add_page``, user_can_change_page() for
+    ``change_page`` and so on, but all pages are checked in one pass with at
+    most one query for the user's page permissions (see
+    get_page_permission_index()). Only the actions in BULK_PAGE_ACTIONS are
+    supported.
+    """
+    unsupported = set(actions).difference(BULK_PAGE_ACTIONS)
+
+    if unsupported:
+        raise ValueError(f"Unsupported page actions: {', '.join(sorted(unsupported))}")
+
+    pages = list(pages)
+    allowed_actions = {page.pk: set() for page in pages}
+
+    if not user.is_authenticated:
+        return allowed_actions
+
+    grant_all = user.is_superuser or not get_cms_setting('PERMISSION')
+
+    for action in actions:
+        if not user.has_perms(_django_permissions_by_action[action]):
+            continue
+
+        index = GRANT_ALL_PERMISSIONS if grant_all else get_page_permission_index(user, site, action)
+
+        for page in pages:
+            if index == GRANT_ALL_PERMISSIONS or index.contains(page.path):
+                allowed_actions[page.pk].add(action)
+    return allowed_actions
 
 
 def auth_permission_required(action):
@@ -364,6 +444,36 @@ def user_can_view_all_pages(user, site):
     return has_global_permission(user, site, action='view_page')
 
 
+def get_view_restrictions_fingerprint(user, site):
+    """
+    Returns a string identifying the pages of «site» «user» can see. Users
+    with the same fingerprint see the same pages, see
+    cms.cms_menus.get_visible_page_contents.
+    """
+    if user_can_view_all_pages(user, site):
+        return "all"
+
+    public_for = get_cms_setting('PUBLIC_FOR')
+    can_see_unrestricted = public_for == 'all' or (public_for == 'staff' and user.is_staff)
+
+    if not get_cms_setting('PERMISSION') or not user.is_authenticated:
+        # Without permission management, user_can_view_all_pages() already
+        # covers users who can see unrestricted pages. Anonymous users can
+        # never see restricted pages.
+        return "unrestricted" if can_see_unrestricted else "none"
+
+    # The view restrictions granted to the user or their groups
+    restrictions = (
+        PagePermission.objects.filter(page__site=site, can_view=True)
+        .filter(Q(user=user) | Q(group__user=user))
+        .values_list('pk', flat=True)
+        .distinct()
+        .order_by('pk')
+    )
+    digest = hashlib.sha1(",".join(str(pk) for pk in restrictions).encode("utf-8")).hexdigest()
+    return "{}_{}".format("unrestricted" if can_see_unrestricted else "restricted", digest)
+
+
 def get_add_perm_tuples(user, site, check_global=True, use_cache=True):
     """
     Give a list of page where the user has add page rights or the string
@@ -495,22 +605,14 @@ def has_generic_permission(page, user, action, site=None, check_global=True, use
     elif site is None:
         site = Site.objects._get_site_by_id(page.site_id)
 
-    page_path = page.path
-    actions_map = {
-        'add_page': get_add_perm_tuples,
-        'change_page': get_change_perm_tuples,
-        'change_page_advanced_settings': get_change_advanced_settings_perm_tuples,
-        'change_page_permissions': get_change_permissions_perm_tuples,
-        'delete_page': get_delete_perm_tuples,
-        'delete_page_translation': get_delete_perm_tuples,
-        'publish_page': get_publish_perm_tuples,
-        'move_page': get_move_page_perm_tuples,
-        'view_page': get_view_perm_tuples,
-    }
-
-    func = actions_map[action]
-
-    page_perms = func(user, site, check_global=check_global, use_cache=use_cache)
-    return page_perms == GRANT_ALL_PERMISSIONS or any(
-        PermissionTuple(perm).contains(page_path) for perm in page_perms
-    )
+    if action == 'delete_page_translation':
+        action = 'delete_page'
+
+    if use_cache:
+        index = get_page_permission_index(user, site, action, check_global=check_global)
+    else:
+        perm_tuples = _get_page_permission_tuples_for_action(
+            user, site, action, check_global=check_global, use_cache=False,
+        )
+        index = perm_tuples if perm_tuples == GRANT_ALL_PERMISSIONS else PermissionTupleIndex(perm_tuples)
+    return index == GRANT_ALL_PERMISSIONS or index.contains(page.path)
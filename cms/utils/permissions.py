@@ -200,6 +200,9 @@ def clear_permission_lru_caches(user):
     """
     Clear all python lru caches used by the permission system
     """
+    from cms.utils.page_permissions import get_page_permission_index
+
+    clear_func_cache(user, get_page_permission_index)
     clear_func_cache(user, get_global_actions_for_user)
     clear_func_cache(user, get_page_actions_for_user)
 
@@ -396,6 +396,10 @@ def rescan_placeholders_for_obj(obj: models.Model) -> dict[str, Placeholder]:
                 # No plugins in newly created placeholder yet
                 placeholder._prefetched_objects_cache = {"cmsplugin_set": CMSPlugin.objects.none()}
                 placeholders[placeholder.slot] = placeholder
+        # Like related managers do when adding objects, drop the prefetched
+        # placeholders (see cms.utils.page.prefetch_page_contents()) so they
+        # are not served without the new ones.
+        getattr(obj, "_prefetched_objects_cache", {}).pop("placeholders", None)
 
     return placeholders
 
@@ -6,16 +6,18 @@ from copy import deepcopy
 from itertools import starmap
 from operator import itemgetter
 
-from django.db import models, transaction
+from django.db import connections, models, router, transaction
+from django.db.models import signals
 from django.http import HttpRequest
 from django.utils.translation import gettext as _
 
 from cms.constants import PLUGIN_ITERATOR_CHUNK_SIZE
 from cms.exceptions import PluginLimitReached
-from cms.models.pluginmodel import CMSPlugin
+from cms.models.pluginmodel import CMSPlugin, get_plugin_from_render_payload, get_render_payload
 from cms.plugin_base import CMSPluginBase
 from cms.plugin_pool import plugin_pool
 from cms.utils import get_language_from_request
+from cms.utils.conf import get_cms_setting
 from cms.utils.permissions import has_plugin_permission
 from cms.utils.placeholder import get_placeholder_conf
 
@@ -94,7 +96,8 @@ def assign_plugins(request, placeholders, template=None, lang=None):
         # Create default plugins if enabled
         plugins = create_default_plugins(request, placeholders, template, lang)
     else:
-        plugins = downcast_plugins(plugins, placeholders, request=request)
+        # The plugins are only rendered, so their render payload can be used
+        plugins = downcast_plugins(plugins, placeholders, request=request, use_render_payload=True)
 
     # split the plugins up by placeholder
     plugins_by_placeholder = defaultdict(list)
@@ -229,21 +232,182 @@ def get_plugin_restrictions(plugin, page=None, restrictions_cache=None):
     return child_classes, parent_classes
 
 
-def _reunite_orphaned_placeholder_plugin_children(root_plugin, orphaned_plugin_list, plugins_by_id):
+def _can_bulk_create(model, connection):
     """
-    Handle plugins where the parent hasn't yet been copied (child seen before the parent)
+    Returns True if plugins of «model» can be inserted without calling their
+    save() method, i.e., neither the model nor a signal receiver hooks into it.
+    """
+    return (
+        connection.features.can_return_rows_from_bulk_insert
+        and model.save is CMSPlugin.save
+        and not signals.pre_save.has_listeners(model)
+        and not signals.post_save.has_listeners(model)
+    )
+
+
+def _get_plugin_table_models(plugin_model):
+    """
+    Returns the concrete models between CMSPlugin (excluded) and the concrete
+    «plugin_model» (included), starting with the one closest to CMSPlugin.
+    """
+    return [*reversed(plugin_model._meta.get_parent_list()), plugin_model][1:]
+
+
+def _bulk_save_plugins(new_plugins):
+    """
+    Inserts the unsaved «new_plugins» into the database. Their parents have to be
+    saved already or be part of «new_plugins».
+
+    The CMSPlugin rows are created with one bulk insert per tree level, since
+    children need the primary keys of their parents. The rows of the plugin
+    models' tables are created afterwards with one bulk insert per table. Plugins
+    whose model overrides save() or has save signal receivers are saved one by one.
+    """
+    using = router.db_for_write(CMSPlugin)
+    connection = connections[using]
+    base_fields = CMSPlugin._meta.concrete_fields
+    new_plugin_set = {id(plugin) for plugin in new_plugins}
+    depths = {}
+    levels = defaultdict(list)
+    plugins_by_model = defaultdict(list)
+
+    def get_depth(plugin):
+        key = id(plugin)
+        if key not in depths:
+            parent = plugin.parent
+            depths[key] = get_depth(parent) + 1 if id(parent) in new_plugin_set else 0
+        return depths[key]
+
+    for plugin in new_plugins:
+        levels[get_depth(plugin)].append(plugin)
+
+    for depth in sorted(levels):
+        base_plugins = []
+
+        for plugin in levels[depth]:
+            plugin_model = plugin.__class__
+
+            if plugin.parent_id is None and plugin.parent is not None:
+                # The parent was unsaved when it was assigned.
+                plugin.parent = plugin.parent
+
+            if not _can_bulk_create(plugin_model, connection):
+                plugin.save()
+            elif plugin_model._meta.concrete_model is CMSPlugin:
+                # CMSPlugin or a proxy of it
+                base_plugins.append((plugin, plugin))
+            else:
+                plugin.render_payload = get_render_payload(plugin)
+                base_plugin = CMSPlugin(**{field.attname: getattr(plugin, field.attname) for field in base_fields})
+                base_plugins.append((base_plugin, plugin))
+
+        CMSPlugin._base_manager.using(using).bulk_create([base_plugin for base_plugin, _ in base_plugins])
+
+        for base_plugin, plugin in base_plugins:
+            if base_plugin is not plugin:
+                for field in base_fields:
+                    setattr(plugin, field.attname, getattr(base_plugin, field.attname))
+                for table_model in _get_plugin_table_models(plugin._meta.concrete_model):
+                    # The primary key of each table is the link to its parent table
+                    setattr(plugin, table_model._meta.pk.attname, base_plugin.pk)
+                plugins_by_model[plugin._meta.concrete_model].append(plugin)
+
+    for plugin_model, plugins in plugins_by_model.items():
+        # Django's bulk_create() refuses multi-table inheritance models, so
+        # the rows of each table are inserted directly.
+        for table_model in _get_plugin_table_models(plugin_model):
+            fields = table_model._meta.local_concrete_fields
+            batch_size = max(connection.ops.bulk_batch_size(fields, plugins), 1)
+
+            for start in range(0, len(plugins), batch_size):
+                table_model._base_manager.using(using)._insert(
+                    plugins[start:start + batch_size],
+                    fields=fields,
+                    using=using,
+                )
+
+        for plugin in plugins:
+            plugin._state.adding = False
+            plugin._state.db = using
+
+
+def _copy_plugin(source_plugin, placeholder, language):
+    """
+    Returns an unsaved copy of the (downcasted) «source_plugin» in «placeholder».
+    """
+    if source_plugin.__class__ is CMSPlugin:
+        return CMSPlugin(language=language, plugin_type=source_plugin.plugin_type, placeholder=placeholder)
 
-    CAVEAT: The only reason this exists is because the plugin position is not
-           sequential through children when the user nests plugins.
-           It's now too late as content already has this issue, it would be a very expensive
-           calculation to recalculate every placeholders positions, needs to be handled gracefully
-           so that it doesn't actually matter :-).
+    new_plugin = deepcopy(source_plugin)
+    new_plugin.pk = None
+    new_plugin.id = None
+    new_plugin.language = language
+    new_plugin.placeholder = placeholder
+    return new_plugin
+
+
+def _copy_plugin_relations(plugin_pair_groups):
     """
-    for old_plugin_parent_id, new_plugin in orphaned_plugin_list:
-        new_parent = plugins_by_id.get(old_plugin_parent_id, root_plugin)
-        if new_parent:
-            new_plugin.parent = new_parent
-            new_plugin.save()
+    Copies the relations of the copied plugins. «plugin_pair_groups» is a list
+    of lists of (new plugin, source plugin) pairs, one list per placeholder.
+    """
+    plugin_pairs_by_model = defaultdict(list)
+
+    for plugin_pairs in plugin_pair_groups:
+        for new_plugin, old_plugin in plugin_pairs:
+            plugin_pairs_by_model[new_plugin.__class__].append((new_plugin, old_plugin))
+
+    for plugin_model, pairs in plugin_pairs_by_model.items():
+        plugin_model.bulk_copy_relations(pairs)
+
+    # Backwards compatibility
+    # This magic is needed for advanced plugins like Text Plugins that can have
+    # nested plugins and need to update their content based on the new plugins.
+    for plugin_pairs in plugin_pair_groups:
+        for new_plugin, old_plugin in plugin_pairs:
+            new_plugin.post_copy(old_plugin, plugin_pairs)
+
+
+@transaction.atomic
+def copy_plugins_to_placeholders(placeholders):
+    """Copies the plugins of several placeholders to new, empty placeholders at once
+
+    :param placeholders: List of (source placeholder, target placeholder, language) tuples.
+        Only the plugins in the given language are copied.
+    :return: List of the new plugins
+
+    Unlike calling :func:`copy_plugins_to_placeholder` for each placeholder, the
+    number of queries does not depend on the number of placeholders.
+    """
+    targets = {(source.pk, language): target for source, target, language in placeholders}
+    plugins = (
+        CMSPlugin.objects.filter(placeholder__in=[source.pk for source, _, _ in placeholders])
+        .order_by("placeholder_id", "language", "position")
+    )
+    source_plugins = list(
+        get_bound_plugins([plugin for plugin in plugins if (plugin.placeholder_id, plugin.language) in targets])
+    )
+    plugins_by_id = OrderedDict()
+    plugin_pairs = defaultdict(list)
+    positions = defaultdict(int)
+
+    for source_plugin in source_plugins:
+        target = targets[(source_plugin.placeholder_id, source_plugin.language)]
+        new_plugin = _copy_plugin(source_plugin, target, source_plugin.language)
+        # The target placeholders are empty
+        positions[target.pk] += 1
+        new_plugin.position = positions[target.pk]
+
+        if source_plugin.__class__ is not CMSPlugin:
+            plugin_pairs[target.pk].append((new_plugin, source_plugin))
+        plugins_by_id[source_plugin.pk] = new_plugin
+
+    for source_plugin in source_plugins:
+        plugins_by_id[source_plugin.pk].parent = plugins_by_id.get(source_plugin.parent_id)
+
+    _bulk_save_plugins(list(plugins_by_id.values()))
+    _copy_plugin_relations(list(plugin_pairs.values()))
+    return list(plugins_by_id.values())
 
 
 @transaction.atomic
@@ -269,21 +433,17 @@ def copy_plugins_to_placeholder(
     The logic of this method is the following:
 
     #. Get bound plugins for each source plugin
-    #. Get the parent plugin (if it exists)
-    #. then get a copy of the source plugin instance
-    #. Set the id/pk to None to it the id of the generic plugin instance above;
-       this will effectively change the generic plugin created above
-       into a concrete one
+    #. then get an unsaved copy of each source plugin instance
     #. find the position in the new placeholder
-    #. save the concrete plugin (which creates a new plugin in the database)
-    #. trigger the copy relations
-    #. return the plugin ids
+    #. set the parent plugin (if it exists), which might itself be a copy
+    #. save all copies at once, see :func:`_bulk_save_plugins`
+    #. trigger the copy relations, once per plugin model
+    #. return the plugins
     """
     plugin_pairs = []
     plugins_by_id = OrderedDict()
     # Keeps track of the next available position per language.
     positions_by_language = {}
-    orphaned_plugin_list = []
 
     if start_positions:
         positions_by_language.update(start_positions)
@@ -291,25 +451,10 @@ def copy_plugins_to_placeholder(
     if root_plugin:
         language = root_plugin.language
 
-    source_plugins = plugins if plugins_are_downcast else get_bound_plugins(plugins)
+    source_plugins = list(plugins if plugins_are_downcast else get_bound_plugins(plugins))
     for source_plugin in source_plugins:
         parent = plugins_by_id.get(source_plugin.parent_id, root_plugin)
-        plugin_model = source_plugin.__class__  # get_plugin_model(source_plugin.plugin_type)
-
-        if plugin_model is not CMSPlugin:
-            new_plugin = deepcopy(source_plugin)
-            new_plugin.pk = None
-            new_plugin.id = None
-            new_plugin.language = language or new_plugin.language
-            new_plugin.placeholder = placeholder
-            new_plugin.parent = parent
-        else:
-            new_plugin = CMSPlugin(
-                language=(language or source_plugin.language),
-                parent=parent,
-                plugin_type=source_plugin.plugin_type,
-                placeholder=placeholder,
-            )
+        new_plugin = _copy_plugin(source_plugin, placeholder, language or source_plugin.language)
 
         try:
             position = positions_by_language[new_plugin.language]
@@ -318,7 +463,7 @@ def copy_plugins_to_placeholder(
             # The position is relative to language.
             position = placeholder.get_next_plugin_position(
                 language=new_plugin.language,
-                parent=new_plugin.parent,
+                parent=parent if parent is None or parent.pk else root_plugin,
                 insert_order="last",
             )
             # Because it is the first time this language is processed,
@@ -330,27 +475,20 @@ def copy_plugins_to_placeholder(
             )
 
         new_plugin.position = position
-        new_plugin.save()
         positions_by_language[new_plugin.language] = position + 1
 
-        if plugin_model != CMSPlugin:
-            new_plugin.copy_relations(source_plugin)
+        if source_plugin.__class__ is not CMSPlugin:
             plugin_pairs.append((new_plugin, source_plugin))
         plugins_by_id[source_plugin.pk] = new_plugin
 
-        # Rescue any orphaned plugins
-        if not parent and source_plugin.parent_id:
-            orphaned_plugin_list.append((source_plugin.parent_id, new_plugin))
-
-    # Reunite any orphaned plugins with the parent
-    if orphaned_plugin_list:
-        _reunite_orphaned_placeholder_plugin_children(root_plugin, orphaned_plugin_list, plugins_by_id)
+    # Parents are assigned once all plugins are known, since the plugin
+    # positions are not sequential through children for some legacy content.
+    # Plugins whose parent isn't copied are attached to the root plugin.
+    for source_plugin in source_plugins:
+        plugins_by_id[source_plugin.pk].parent = plugins_by_id.get(source_plugin.parent_id, root_plugin)
 
-    # Backwards compatibility
-    # This magic is needed for advanced plugins like Text Plugins that can have
-    # nested plugins and need to update their content based on the new plugins.
-    for new_plugin, old_plugin in plugin_pairs:
-        new_plugin.post_copy(old_plugin, plugin_pairs)
+    _bulk_save_plugins(list(plugins_by_id.values()))
+    _copy_plugin_relations([plugin_pairs])
 
     for language in positions_by_language:
         placeholder._recalculate_plugin_positions(language)
@@ -419,11 +557,17 @@ def downcast_plugins(
     placeholders: Sequence | None = None,
     select_placeholder: bool = False,
     request: HttpRequest | None = None,
+    use_render_payload: bool = False,
 ) -> Iterable[CMSPlugin]:
     """
     Downcasts the given list of plugins to their respective classes. Ignores any plugins
     that are not available.
 
+    With «use_render_payload» set and :setting:`CMS_PLUGIN_RENDER_PAYLOAD` enabled, plugins
+    are built from their render payload if possible, and only the others are fetched from
+    their plugin model's table. The payload may be outdated, so only pass it for plugins
+    that are rendered, never for plugins that are copied or changed.
+
     :param plugins: List of plugins to downcast.
     :type plugins: List[CMSPlugin]
     :param placeholders: List of placeholders associated with the plugins.
@@ -432,12 +576,15 @@ def downcast_plugins(
     :type select_placeholder: bool
     :param request: The current request.
     :type request: Optional[HttpRequest]
+    :param use_render_payload: If True, build plugins from their render payload if possible.
+    :type use_render_payload: bool
     :return: Generator that yields the downcasted plugins.
     :rtype: Generator[CMSPlugin, None, None]
     """
     plugin_types_map = defaultdict(list)
     plugin_lookup = {}
     plugin_ids = []
+    use_render_payload = use_render_payload and get_cms_setting("PLUGIN_RENDER_PAYLOAD")
 
     # make a map of plugin types, needed later for downcasting
     for plugin in plugins:
@@ -453,8 +600,16 @@ def downcast_plugins(
         if base_model is CMSPlugin:
             plugin.__class__ = plugin_model  # In case it is a proxy model
             plugin_lookup[plugin.pk] = plugin  # otherwise, no downcast needed
-        else:
+            continue
+
+        instance = None
+        if use_render_payload and (not select_placeholder or "placeholder" in plugin._state.fields_cache):
+            instance = get_plugin_from_render_payload(plugin, plugin_model)
+
+        if instance is None:
             plugin_types_map[base_model].append(plugin.pk)
+        else:
+            plugin_lookup[plugin.pk] = instance
 
     placeholders = placeholders or []
     placeholders_by_id = {placeholder.pk: placeholder for placeholder in placeholders}
@@ -1,3 +1,4 @@
+from functools import wraps
 from urllib.parse import quote, urlsplit, urlunsplit
 
 from django.apps import apps
@@ -14,7 +15,7 @@ from django.http import (
 )
 from django.shortcuts import render
 from django.template.defaultfilters import title
-from django.template.response import TemplateResponse
+from django.template.response import SimpleTemplateResponse, TemplateResponse
 from django.urls import (
     NoReverseMatch,
     Resolver404,
@@ -31,7 +32,7 @@ from django.views.decorators.http import require_POST
 
 from cms.apphook_pool import apphook_pool
 from cms.appresolver import applications_page_check
-from cms.cache.page import get_page_cache
+from cms.cache.page import get_page_cache_response, release_page_cache_lock
 from cms.exceptions import LanguageError
 from cms.forms.login import CMSToolbarLoginForm
 from cms.models import Page, PageContent
@@ -53,7 +54,7 @@ from cms.utils.i18n import (
     get_redirect_on_fallback,
     is_language_prefix_patterns_used,
 )
-from cms.utils.page import get_page_from_request
+from cms.utils.page import get_page_from_request, prefetch_page_contents
 from cms.utils.page_permissions import user_can_view_page
 from cms.utils.permissions import user_can_view_placeholder_source
 from cms.utils.placeholder import get_declared_placeholders_for_obj, get_placeholder_conf
@@ -68,6 +69,30 @@ def _clean_redirect_url(redirect_url, language):
     return redirect_url
 
 
+def _release_page_cache_lock(view):
+    """
+    Releases the page render lock a request may have acquired on a page
+    cache miss (see CMS_PAGE_CACHE_STALE_WHILE_REVALIDATE) once the response
+    has been rendered and, where possible, cached.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            response = view(request, *args, **kwargs)
+        except Exception:
+            release_page_cache_lock(request)
+            raise
+
+        if isinstance(response, SimpleTemplateResponse) and not response.is_rendered:
+            # Runs after set_page_cache() which has been registered first
+            response.add_post_render_callback(lambda response: release_page_cache_lock(request))
+        else:
+            release_page_cache_lock(request)
+        return response
+    return wrapper
+
+
+@_release_page_cache_lock
 def details(request, slug):
     """
     The main view of the Django-CMS! Takes a request and a slug, renders the
@@ -80,23 +105,8 @@ def details(request, slug):
             not request.toolbar.edit_mode_active and not request.toolbar.show_toolbar and not is_authenticated
         )
     ):
-        cache_content = get_page_cache(request)
-        if cache_content is not None:
-            # ``xframe_options_exempt`` is absent on cache entries written before
-            # this field was added; default to True to preserve their behaviour
-            # until they expire.
-            content, headers, expires_datetime, *rest = cache_content
-            xframe_options_exempt = rest[0] if rest else True
-            response = HttpResponse(content)
-            # Replay the page's clickjacking decision. For "Inherit" pages this
-            # is False, so Django's XFrameOptionsMiddleware still adds the site
-            # default X-Frame-Options header to the cached response.
-            response.xframe_options_exempt = xframe_options_exempt
-            response.headers = headers
-            # Recalculate the max-age header for this cached response
-            max_age = int(
-                (expires_datetime - response_timestamp).total_seconds() + 0.5)
-            patch_cache_control(response, max_age=max_age)
+        response = get_page_cache_response(request, timestamp=response_timestamp)
+        if response is not None:
             return response
 
     # Get a Page model object from the request
@@ -148,9 +158,10 @@ def details(request, slug):
         # this means we need to correctly redirect that request.
         return _handle_no_page(request)
 
-    # we use the _get_page_content_cache method to populate the cache with all public languages
-    # The languages are then filtered out by the user allowed languages
-    page._get_page_content_cache(None, fallback=True, force_reload=True)
+    # Populate the content cache with all public languages, along with the
+    # placeholders to render. The languages are then filtered out by the user
+    # allowed languages
+    prefetch_page_contents(page)
     pagecontent_languages = list(page.page_content_cache.keys())
     available_languages = [
         language for language in user_languages
@@ -175,6 +175,29 @@ class NavigationNode:
         node_abs_url = self.get_absolute_url()
         return node_abs_url == request.path
 
+    def get_selection_key(self) -> Any:
+        """
+        Returns a key the menu renderer indexes the node by to find the
+        selected node without calling :meth:`is_selected` for every node.
+        The node must be selected exactly if the key equals
+        :meth:`get_request_selection_key` of the request.
+
+        Subclasses which override :meth:`is_selected` should override both
+        methods, too. Otherwise, their nodes are checked one by one.
+        """
+        return self.get_absolute_url()
+
+    @classmethod
+    def get_request_selection_key(cls, request) -> Any:
+        """
+        Returns the key of the nodes selected for the request (see
+        :meth:`get_selection_key`), or None if no node is selected.
+
+        Args:
+            request: The request object.
+        """
+        return request.path
+
     @property
     def is_leaf_node(self) -> bool:
         """
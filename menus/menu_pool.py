@@ -1,4 +1,7 @@
-from functools import partial
+import pickle
+import time
+from collections import defaultdict
+from functools import cache as cache_function, partial
 from logging import getLogger
 
 from django.contrib import messages
@@ -18,12 +21,51 @@ from cms.utils.i18n import (
 )
 from menus.base import Menu
 from menus.exceptions import NamespaceAlreadyRegistered
-from menus.models import CacheKey
 
 logger = getLogger('menus')
 cache = get_menu_cache()
 
 
+def _get_menu_cache_version_keys(site_id=None, language=None):
+    """
+    Returns the cache keys of the version counters a menu for the given
+    «site_id» and «language» depends on: a global one, one per site, one per
+    language and one per (site x language).
+
+    Invalidation bumps exactly one of these counters (see MenuPool.clear),
+    which makes every menu cache entry built against the old value
+    unreachable. The entries themselves are left to expire naturally.
+    """
+    prefix = get_cms_setting('CACHE_PREFIX')
+    return [
+        f"{prefix}menu_cache_version",
+        f"{prefix}menu_cache_version_site_{site_id}",
+        f"{prefix}menu_cache_version_lang_{language}",
+        f"{prefix}menu_cache_version_site_{site_id}_lang_{language}",
+    ]
+
+
+def _get_menu_index_version_keys(site_id=None):
+    """
+    Returns the cache keys of the version counters that only drop the
+    language independent menu index (see cms.cache.menu): a global one and
+    one per site. MenuPool.clear() bumps them when it invalidates the menus
+    of a single language, which the index is shared by.
+    """
+    prefix = get_cms_setting('CACHE_PREFIX')
+    return [
+        f"{prefix}menu_index_version",
+        f"{prefix}menu_index_version_site_{site_id}",
+    ]
+
+
+def _new_menu_cache_version():
+    # Like the placeholder cache, use a timestamp instead of a counter so
+    # a version key that got evicted from the cache never comes back with
+    # a value that was used before.
+    return int(time.time() * 1000000)
+
+
 def _build_nodes_inner_for_one_menu(nodes, menu_class_name):
     """
     This is an easier to test "inner loop" building the menu tree structure
@@ -79,6 +121,152 @@ def _build_nodes_inner_for_one_menu(nodes, menu_class_name):
     return final_nodes
 
 
+# The attributes of a navigation node which get a column of their own in the
+# cached menu. Any other instance attributes (like the language of a
+# CMSNavigationNode) are stored in a dict per node.
+_NODE_FIELDS = ('title', 'url', 'id', 'parent_id', 'parent_namespace', 'namespace', 'visible')
+# Tree links (rebuilt from the parent indexes) and build-time state
+_NODE_SKIPPED_FIELDS = frozenset(('children', 'parent', 'attr', '_counter'))
+
+
+def _get_shared_index(value, shared, shared_indexes):
+    # The dicts may hold unhashable values, compare them by their pickle
+    key = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    if key not in shared_indexes:
+        shared_indexes[key] = len(shared)
+        shared.append(value)
+    return shared_indexes[key]
+
+
+def _dump_nodes(nodes):
+    """
+    Converts a flat list of navigation nodes into the compact, columnar
+    format of the menu cache: the node classes, and per node the index of
+    its class, the index of its parent in «nodes», the values of
+    _NODE_FIELDS, and the indexes of its attr dict and of a dict of any
+    other attributes in a list of distinct dicts.
+
+    Unlike pickling the nodes themselves this neither stores the parent and
+    children references nor the attribute names of every node, and stores
+    equal dicts (most nodes of the CMS menu have the same attr) only once.
+    """
+    classes = []
+    class_indexes = {}
+    node_indexes = {id(node): index for index, node in enumerate(nodes)}
+    shared = []
+    shared_indexes = {}
+    columns = {field: [] for field in ('class', 'parent', *_NODE_FIELDS, 'attr', 'extra')}
+
+    for node in nodes:
+        cls = type(node)
+
+        if cls not in class_indexes:
+            class_indexes[cls] = len(classes)
+            classes.append(cls)
+
+        data = node.__dict__
+        parent = data.get('parent')
+        columns['class'].append(class_indexes[cls])
+        columns['parent'].append(-1 if parent is None else node_indexes.get(id(parent), -1))
+
+        for field in _NODE_FIELDS:
+            columns[field].append(data.get(field))
+        columns['attr'].append(_get_shared_index(data.get('attr') or {}, shared, shared_indexes))
+        extra = {
+            key: value for key, value in data.items()
+            if key not in _NODE_SKIPPED_FIELDS and key not in _NODE_FIELDS
+        }
+        columns['extra'].append(_get_shared_index(extra, shared, shared_indexes) if extra else -1)
+    return classes, shared, tuple(columns.values())
+
+
+def _load_nodes(dumped):
+    """
+    Rebuilds the list of navigation nodes, including their parent and
+    children references, from the output of _dump_nodes().
+    """
+    classes, shared, columns = dumped
+    nodes = []
+    append = nodes.append
+
+    rows = zip(*columns, strict=True)
+
+    for class_index, parent_index, title, url, id, parent_id, parent_namespace, namespace, visible, attr, extra in rows:
+        cls = classes[class_index]
+        node = cls.__new__(cls)
+        parent = nodes[parent_index] if parent_index >= 0 else None
+        node.__dict__ = data = {
+            'children': [],
+            'parent': parent,
+            'title': title,
+            'url': url,
+            'id': id,
+            'parent_id': parent_id,
+            'parent_namespace': parent_namespace,
+            'namespace': namespace,
+            'visible': visible,
+            # Nodes must not share their attr dict
+            'attr': shared[attr].copy(),
+        }
+        if extra >= 0:
+            data.update(shared[extra])
+        if parent is not None:
+            parent.children.append(node)
+        append(node)
+    return nodes
+
+
+@cache_function
+def _get_selection_key_class(node_class):
+    """
+    Returns the class whose get_request_selection_key() returns the selection
+    key of the selected nodes of «node_class», or None if the nodes must be
+    checked by calling their is_selected().
+    """
+    def get_defining_class(name):
+        return next((cls for cls in node_class.__mro__ if name in vars(cls)), None)
+
+    key_class = get_defining_class('is_selected')
+
+    if (
+        key_class is None
+        or get_defining_class('get_selection_key') is not key_class
+        or get_defining_class('get_request_selection_key') is not key_class
+    ):
+        # is_selected() has been overridden on its own
+        return None
+    return key_class
+
+
+def _get_selection_index(nodes):
+    """
+    Returns the index MenuRenderer._mark_selected() finds the selected node
+    of «nodes» with: a dict of key class: {selection key: position of the
+    first node with that key}, the positions of the nodes which have to be
+    checked one by one and the positions of the root nodes.
+    """
+    keys = defaultdict(dict)
+    others = []
+    roots = []
+
+    for position, node in enumerate(nodes):
+        if not node.parent:
+            roots.append(position)
+
+        key_class = _get_selection_key_class(type(node))
+
+        if key_class is not None:
+            try:
+                keys[key_class].setdefault(node.get_selection_key(), position)
+                continue
+            except TypeError:
+                # Unhashable selection key
+                pass
+        others.append(position)
+    return dict(keys), others, roots
+
+
 def _get_menu_class_for_instance(menu_class, instance):
     """
     Returns a new menu class that subclasses
@@ -119,15 +307,59 @@ class MenuRenderer:
             self.request_language = get_default_language_for_site(self.site.pk)
         toolbar = getattr(request, "toolbar", None)
         self.edit_or_preview = toolbar.edit_mode_active or toolbar.preview_mode_active if toolbar else False
+        # The nodes last returned by _build_nodes() and their selection index
+        self._selection_index = (None, None)
+
+    @cached_property
+    def cache_version(self):
+        """
+        Returns the combined version of all counters the menu for the current
+        site and language depends on. All counters are read in one cache round
+        trip; missing counters are (re-)initialized.
+        """
+        keys = _get_menu_cache_version_keys(self.site.pk, self.request_language)
+        versions = cache.get_many(keys)
+        missing = {key: _new_menu_cache_version() for key in keys if key not in versions}
+
+        if missing:
+            cache.set_many(missing, timeout=None)
+            versions.update(missing)
+        return ".".join(str(versions[key]) for key in keys)
+
+    @cached_property
+    def user_cache_key(self):
+        """
+        Returns the part of the cache key which identifies the authenticated
+        user. With CMS_MENU_CACHE_PER_USER disabled, users who can see the same
+        pages share the cached menu.
+
+        The fingerprint itself is cached per user, against the current menu
+        cache version, because computing it needs database queries.
+        """
+        from cms.utils.page_permissions import get_view_restrictions_fingerprint
+
+        user = self.request.user
+
+        if get_cms_setting('MENU_CACHE_PER_USER'):
+            return f"{user.pk}_user"
+
+        prefix = get_cms_setting('CACHE_PREFIX')
+        key = f"{prefix}menu_user_fingerprint_{self.site.pk}_{user.pk}_{self.cache_version}"
+        fingerprint = cache.get(key)
+
+        if fingerprint is None:
+            fingerprint = get_view_restrictions_fingerprint(user, self.site)
+            cache.set(key, fingerprint, get_cms_setting('CACHE_DURATIONS')['menus'])
+        return f"{fingerprint}_users"
 
     @property
     def cache_key(self):
         prefix = get_cms_setting('CACHE_PREFIX')
 
-        key = f"{prefix}menu_nodes_{self.request_language}_{self.site.pk}"
+        key = f"{prefix}menu_nodes_{self.request_language}_{self.site.pk}_{self.cache_version}"
 
         if self.request.user.is_authenticated:
-            key += f"_{self.request.user.pk}_user"
+            key += f"_{self.user_cache_key}"
 
         if self.edit_or_preview:
             key += ':edit'
@@ -135,15 +367,6 @@ class MenuRenderer:
             key += ':public'
         return key
 
-    @cached_property
-    def is_cached(self):
-        db_cache_key_lookup = CacheKey.objects.filter(
-            key=self.cache_key,
-            language=self.request_language,
-            site=self.site.pk,
-        )
-        return db_cache_key_lookup.exists()
-
     def _build_nodes(self):
         """
         This is slow. Caching must be used.
@@ -165,11 +388,14 @@ class MenuRenderer:
 
         cached_nodes = cache.get(key, None)
 
-        if cached_nodes and self.is_cached:
-            # Only use the cache if the key is present in the database.
-            # This prevents a condition where keys which have been removed
-            # from the database due to a change in content, are still used.
-            return cached_nodes
+        if cached_nodes:
+            # The key contains the current cache versions, so entries
+            # which have been invalidated by a change in content are
+            # never found here.
+            dumped_nodes, selection_index = cached_nodes
+            nodes = _load_nodes(dumped_nodes)
+            self._selection_index = (nodes, selection_index)
+            return nodes
 
         final_nodes = []
         toolbar = getattr(self.request, 'toolbar', None)
@@ -193,31 +419,47 @@ class MenuRenderer:
             # nodes is a list of navigation nodes (page tree in cms + others)
             final_nodes += _build_nodes_inner_for_one_menu(nodes, menu_class_name)
 
-        cache.set(key, final_nodes, get_cms_setting('CACHE_DURATIONS')['menus'])
-
-        if not self.is_cached:
-            # No need to invalidate the internal lookup cache,
-            # just set the value directly.
-            self.__dict__['is_cached'] = True
-            # We need to have a list of the cache keys for languages and sites that
-            # span several processes - so we follow the Django way and share through
-            # the database. It's still cheaper than recomputing every time!
-            # This way we can selectively invalidate per-site and per-language,
-            # since the cache is shared but the keys aren't
-            CacheKey.objects.create(key=key, language=self.request_language, site=self.site.pk)
+        selection_index = _get_selection_index(final_nodes)
+        cache.set(key, (_dump_nodes(final_nodes), selection_index), get_cms_setting('CACHE_DURATIONS')['menus'])
+        self._selection_index = (final_nodes, selection_index)
         return final_nodes
 
     def _mark_selected(self, nodes):
         """Mark the selected node and its ancestors, descendants and siblings."""
-        selected = next((node for node in nodes if node.is_selected(self.request)), None)
+        indexed_nodes, selection_index = self._selection_index
+
+        if indexed_nodes is nodes:
+            # The nodes as returned by _build_nodes()
+            selected = self._find_selected(nodes, selection_index)
+            root_nodes = (nodes[position] for position in selection_index[2])
+        else:
+            selected = next((node for node in nodes if node.is_selected(self.request)), None)
+            root_nodes = (node for node in nodes if not node.parent)
+
         if selected:
             selected.selected = True
             self._mark_ancestors(selected)
             self._mark_descendants(selected)
-            root_nodes = (node for node in nodes if not node.parent)
             self._mark_siblings(selected, root_nodes)
         return nodes
 
+    def _find_selected(self, nodes, selection_index):
+        """
+        Returns the first selected node in «nodes», only checking the nodes
+        whose selection key matches the request's (see _get_selection_index).
+        """
+        keys, positions, _roots = selection_index
+        positions = list(positions)
+
+        for key_class, positions_by_key in keys.items():
+            key = key_class.get_request_selection_key(self.request)
+
+            if key is not None and key in positions_by_key:
+                positions.append(positions_by_key[key])
+
+        positions.sort()
+        return next((nodes[position] for position in positions if nodes[position].is_selected(self.request)), None)
+
     def _mark_ancestors(self, node):
         """Marks the ancestors of the selected node."""
         while node.parent:
@@ -226,9 +468,13 @@ class MenuRenderer:
 
     def _mark_descendants(self, node):
         """Marks the descendants of the selected node."""
-        for child in node.children:
+        # Iterative, deep trees must not hit the recursion limit
+        stack = list(node.children)
+
+        while stack:
+            child = stack.pop()
             child.descendant = True
-            self._mark_descendants(child)
+            stack.extend(child.children)
 
     def _mark_siblings(self, node, root_nodes):
         """Marks the siblings of the selected node. All root nodes are siblings of a root node."""
@@ -345,17 +591,25 @@ class MenuPool:
     def clear(self, site_id=None, language=None, all=False):
         """
         This invalidates the cache for a given menu (site_id and language)
+
+        The version counters live in the (shared) cache backend, so
+        invalidation is selective per-site and per-language and spans
+        all processes without any database access.
         """
-        if all:
-            cache_keys = CacheKey.objects.get_keys()
+        keys = _get_menu_cache_version_keys(site_id, language)
+        index_keys = _get_menu_index_version_keys(site_id)
+
+        if all or (not site_id and not language):
+            # Both site and language are None - invalidate everything
+            changed = [keys[0]]
+        elif not language:
+            changed = [keys[1]]
+        elif not site_id:
+            changed = [keys[2], index_keys[0]]
         else:
-            cache_keys = CacheKey.objects.get_keys(site_id, language)
-
-        to_be_deleted = cache_keys.distinct().values_list('key', flat=True)
-
-        if to_be_deleted:
-            cache.delete_many(to_be_deleted)
-            cache_keys.delete()
+            changed = [keys[3], index_keys[1]]
+        version = _new_menu_cache_version()
+        cache.set_many(dict.fromkeys(changed, version), timeout=None)
 
     def register_menu(self, menu_cls):
         from menus.base import Menu
@@ -31,6 +31,10 @@ class CacheKey(models.Model):
     This model stores a set of cache keys accessible by multiple processes/machines.
     Multiple Django instances will then share the keys, allowing selective invalidation
     of menu trees (per site, per language) in the cache.
+
+    The menu pool no longer reads or writes these rows, menu cache entries are
+    invalidated through version counters kept in the cache backend instead.
+    The model is kept for backwards compatibility.
     """
     language = models.CharField(max_length=255)
     site = models.PositiveIntegerField()